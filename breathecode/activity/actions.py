@@ -662,3 +662,35 @@ def get_current_worker_number() -> int:
 
     # If the process is not found, return None or raise an exception based on your requirements
     return 0
+
+
+def group_user_ids_by_day(activities: list[dict]) -> dict[int, list[int]]:
+    """Index the user ids of some activities by their day, the day can be saved as a string."""
+
+    result = {}
+    for activity in activities:
+        result.setdefault(int(activity["day"]), []).append(activity["user_id"])
+
+    return result
+
+
+def get_cohort_user_history_log(cohort_history_log: dict, user_id: int, user_history_log: Optional[dict]) -> dict:
+    """Get the history log of a student from the history log of its cohort."""
+
+    user_history_log = user_history_log or {}
+    user_history_log["attendance"] = {}
+    user_history_log["unattendance"] = {}
+
+    for day, day_log in (cohort_history_log or {}).items():
+        log = {
+            "updated_at": day_log["updated_at"],
+            "current_module": day_log["current_module"],
+        }
+
+        if user_id in (day_log["attendance_ids"] or []):
+            user_history_log["attendance"][day] = log
+
+        else:
+            user_history_log["unattendance"][day] = log
+
+    return user_history_log
@@ -10,6 +10,7 @@ from typing import Optional
 import zstandard
 from celery import shared_task
 from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from django_redis import get_redis_connection
 from google.cloud import bigquery
@@ -20,6 +21,7 @@ from task_manager.django.decorators import task
 from breathecode.activity import actions
 from breathecode.admissions.models import Cohort, CohortUser
 from breathecode.admissions.utils.cohort_log import CohortDayLog
+from breathecode.commons.signals import update_cache
 from breathecode.services.google_cloud.big_query import BigQuery
 from breathecode.utils import NDB
 from breathecode.utils.decorators import TaskPriority
@@ -38,6 +40,7 @@ def get_activity_sampling_rate():
 
 
 IS_DJANGO_REDIS = hasattr(cache, "delete_pattern")
+HISTORY_LOG_BATCH_SIZE = 500
 
 API_URL = os.getenv("API_URL", "")
 
@@ -79,12 +82,21 @@ def get_attendancy_log(self, cohort_id: int):
         logger.error(f"Cohort {cohort.slug} have syllabus with bad format")
         return
 
+    # only the fields used to build the log are fetched
+    projection = [StudentActivity.user_id, StudentActivity.day]
+
     client = NDB(StudentActivity)
-    attendance = client.fetch([StudentActivity.cohort == cohort.slug, StudentActivity.slug == "classroom_attendance"])
+    attendance = client.fetch(
+        [StudentActivity.cohort == cohort.slug, StudentActivity.slug == "classroom_attendance"], projection=projection
+    )
     unattendance = client.fetch(
-        [StudentActivity.cohort == cohort.slug, StudentActivity.slug == "classroom_unattendance"]
+        [StudentActivity.cohort == cohort.slug, StudentActivity.slug == "classroom_unattendance"],
+        projection=projection,
     )
 
+    attendance_by_day = actions.group_user_ids_by_day(attendance)
+    unattendance_by_day = actions.group_user_ids_by_day(unattendance)
+
     days = {}
 
     offset = 0
@@ -98,8 +110,8 @@ def get_attendancy_log(self, cohort_id: int):
             if current_day > cohort.current_day:
                 break
 
-            attendance_ids = list([x["user_id"] for x in attendance if int(x["day"]) == current_day])
-            unattendance_ids = list([x["user_id"] for x in unattendance if int(x["day"]) == current_day])
+            attendance_ids = attendance_by_day.get(current_day, [])
+            unattendance_ids = unattendance_by_day.get(current_day, [])
             has_attendance = bool(attendance_ids or unattendance_ids)
 
             days[day["label"]] = CohortDayLog(
@@ -120,8 +132,26 @@ def get_attendancy_log(self, cohort_id: int):
 
     logger.info("History log saved")
 
-    for cohort_user in CohortUser.objects.filter(cohort=cohort).exclude(educational_status="DROPPED"):
-        get_attendancy_log_per_cohort_user.delay(cohort_user.id)
+    # the logs of the students are built in the same pass instead of one task per student
+    cohort_user_ids = list(
+        CohortUser.objects.filter(cohort=cohort).exclude(educational_status="DROPPED").values_list("id", flat=True)
+    )
+
+    for i in range(0, len(cohort_user_ids), HISTORY_LOG_BATCH_SIZE):
+        # the attendance is merged into the locked history log, so the keys written meanwhile are kept
+        with transaction.atomic():
+            cohort_users = CohortUser.objects.filter(id__in=cohort_user_ids[i : i + HISTORY_LOG_BATCH_SIZE])
+            cohort_users = list(cohort_users.select_for_update().only("id", "user_id", "history_log"))
+
+            for cohort_user in cohort_users:
+                cohort_user.history_log = actions.get_cohort_user_history_log(
+                    cohort.history_log, cohort_user.user_id, cohort_user.history_log
+                )
+
+            CohortUser.objects.bulk_update(cohort_users, ["history_log"])
+
+    if cohort_user_ids:
+        update_cache.send_robust(sender=CohortUser)
 
 
 @shared_task(bind=False, priority=TaskPriority.ACADEMY.value)
@@ -140,28 +170,7 @@ def get_attendancy_log_per_cohort_user(cohort_user_id: int):
         logger.error(f"Cohort {cohort.slug} has no log yet")
         return
 
-    cohort_history_log = cohort.history_log or {}
-    user_history_log = cohort_user.history_log or {}
-
-    user_history_log["attendance"] = {}
-    user_history_log["unattendance"] = {}
-
-    for day in cohort_history_log:
-        updated_at = cohort_history_log[day]["updated_at"]
-        current_module = cohort_history_log[day]["current_module"]
-
-        log = {
-            "updated_at": updated_at,
-            "current_module": current_module,
-        }
-
-        if user.id in cohort_history_log[day]["attendance_ids"]:
-            user_history_log["attendance"][day] = log
-
-        else:
-            user_history_log["unattendance"][day] = log
-
-    cohort_user.history_log = user_history_log
+    cohort_user.history_log = actions.get_cohort_user_history_log(cohort.history_log, user.id, cohort_user.history_log)
     cohort_user.save()
 
     logger.info("History log saved")
@@ -265,22 +274,11 @@ def upload_activities(self, task_manager_id: int, **_):
         raise e
 
 
-@task(priority=TaskPriority.BACKGROUND.value)
-def add_activity(
-    user_id: int,
-    kind: str,
+def validate_activity(
     related_type: Optional[str] = None,
     related_id: Optional[str | int] = None,
     related_slug: Optional[str] = None,
-    timestamp: Optional[str] = None,
-    **_,
-):
-
-    logger.info(f"Executing add_activity related to {str(kind)}")
-
-    if timestamp is None:
-        timestamp = timezone.now().isoformat()
-
+) -> None:
     if related_type and not (bool(related_id) ^ bool(related_slug)):
         raise AbortTask(
             "If related_type is provided, either related_id or related_slug must be provided, but not both."
@@ -289,6 +287,83 @@ def add_activity(
     if not related_type and (related_id or related_slug):
         raise AbortTask("If related_type is not provided, both related_id and related_slug must also be absent.")
 
+
+def serialize_activity(
+    user_id: int,
+    kind: str,
+    related_type: Optional[str] = None,
+    related_id: Optional[str | int] = None,
+    related_slug: Optional[str] = None,
+    timestamp: Optional[str] = None,
+) -> dict:
+    res = {
+        "schema": [
+            bigquery.SchemaField("user_id", bigquery.enums.SqlTypeNames.INT64, "NULLABLE"),
+            bigquery.SchemaField("kind", bigquery.enums.SqlTypeNames.STRING, "NULLABLE"),
+            bigquery.SchemaField("timestamp", bigquery.enums.SqlTypeNames.TIMESTAMP, "NULLABLE"),
+            bigquery.SchemaField(
+                "related",
+                bigquery.enums.SqlTypeNames.STRUCT,
+                "NULLABLE",
+                fields=[
+                    bigquery.SchemaField("type", bigquery.enums.SqlTypeNames.STRING, "NULLABLE"),
+                    bigquery.SchemaField("id", bigquery.enums.SqlTypeNames.INT64, "NULLABLE"),
+                    bigquery.SchemaField("slug", bigquery.enums.SqlTypeNames.STRING, "NULLABLE"),
+                ],
+            ),
+        ],
+        "data": {
+            "id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "kind": kind,
+            "timestamp": timestamp,
+            "related": {
+                "type": related_type,
+                "id": related_id,
+                "slug": related_slug,
+            },
+            "meta": {},
+        },
+    }
+
+    fields = []
+
+    meta = actions.get_activity_meta(kind, related_type, related_id, related_slug)
+
+    for key in meta:
+        t = bigquery.enums.SqlTypeNames.STRING
+
+        # keep it adobe than the date conditional
+        if isinstance(meta[key], datetime) or (isinstance(meta[key], str) and ISO_STRING_PATTERN.match(meta[key])):
+            t = bigquery.enums.SqlTypeNames.TIMESTAMP
+        elif isinstance(meta[key], date):
+            t = bigquery.enums.SqlTypeNames.DATE
+        elif isinstance(meta[key], str):
+            pass
+        elif isinstance(meta[key], bool):
+            t = bigquery.enums.SqlTypeNames.BOOL
+        elif isinstance(meta[key], int):
+            t = bigquery.enums.SqlTypeNames.INT64
+        elif isinstance(meta[key], float):
+            t = bigquery.enums.SqlTypeNames.FLOAT64
+
+        # res['data'].append(serialize_field(key, meta[key], t))
+        # res.append(serialize_field(key, meta[key], t, struct='meta'))
+
+        fields.append(bigquery.SchemaField(key, t))
+        res["data"]["meta"][key] = meta[key]
+
+    meta_field = bigquery.SchemaField("meta", bigquery.enums.SqlTypeNames.STRUCT, "NULLABLE", fields=fields)
+    # meta_field = bigquery.SchemaField('meta', 'STRUCT', 'NULLABLE', fields=fields)
+    res["schema"].append(meta_field)
+    # res['schema']['meta'] = meta_field
+
+    return res
+
+
+def store_activities(activities: list[dict]) -> None:
+    """Append the activities to the storage of the current worker, the storage is locked once for all of them."""
+
     client = None
     if IS_DJANGO_REDIS:
         client = get_redis_connection("default")
@@ -307,71 +382,9 @@ def add_activity(
             else:
                 data = []
 
-            res = {
-                "schema": [
-                    bigquery.SchemaField("user_id", bigquery.enums.SqlTypeNames.INT64, "NULLABLE"),
-                    bigquery.SchemaField("kind", bigquery.enums.SqlTypeNames.STRING, "NULLABLE"),
-                    bigquery.SchemaField("timestamp", bigquery.enums.SqlTypeNames.TIMESTAMP, "NULLABLE"),
-                    bigquery.SchemaField(
-                        "related",
-                        bigquery.enums.SqlTypeNames.STRUCT,
-                        "NULLABLE",
-                        fields=[
-                            bigquery.SchemaField("type", bigquery.enums.SqlTypeNames.STRING, "NULLABLE"),
-                            bigquery.SchemaField("id", bigquery.enums.SqlTypeNames.INT64, "NULLABLE"),
-                            bigquery.SchemaField("slug", bigquery.enums.SqlTypeNames.STRING, "NULLABLE"),
-                        ],
-                    ),
-                ],
-                "data": {
-                    "id": uuid.uuid4().hex,
-                    "user_id": user_id,
-                    "kind": kind,
-                    "timestamp": timestamp,
-                    "related": {
-                        "type": related_type,
-                        "id": related_id,
-                        "slug": related_slug,
-                    },
-                    "meta": {},
-                },
-            }
+            for activity in activities:
+                data.append(serialize_activity(**activity))
 
-            fields = []
-
-            meta = actions.get_activity_meta(kind, related_type, related_id, related_slug)
-
-            for key in meta:
-                t = bigquery.enums.SqlTypeNames.STRING
-
-                # keep it adobe than the date conditional
-                if isinstance(meta[key], datetime) or (
-                    isinstance(meta[key], str) and ISO_STRING_PATTERN.match(meta[key])
-                ):
-                    t = bigquery.enums.SqlTypeNames.TIMESTAMP
-                elif isinstance(meta[key], date):
-                    t = bigquery.enums.SqlTypeNames.DATE
-                elif isinstance(meta[key], str):
-                    pass
-                elif isinstance(meta[key], bool):
-                    t = bigquery.enums.SqlTypeNames.BOOL
-                elif isinstance(meta[key], int):
-                    t = bigquery.enums.SqlTypeNames.INT64
-                elif isinstance(meta[key], float):
-                    t = bigquery.enums.SqlTypeNames.FLOAT64
-
-                # res['data'].append(serialize_field(key, meta[key], t))
-                # res.append(serialize_field(key, meta[key], t, struct='meta'))
-
-                fields.append(bigquery.SchemaField(key, t))
-                res["data"]["meta"][key] = meta[key]
-
-            meta_field = bigquery.SchemaField("meta", bigquery.enums.SqlTypeNames.STRUCT, "NULLABLE", fields=fields)
-            # meta_field = bigquery.SchemaField('meta', 'STRUCT', 'NULLABLE', fields=fields)
-            res["schema"].append(meta_field)
-            # res['schema']['meta'] = meta_field
-
-            data.append(res)
             data = pickle.dumps(data)
             data = zstandard.compress(data)
 
@@ -379,3 +392,54 @@ def add_activity(
 
     except LockError:
         raise RetryTask("Could not acquire lock for activity, operation timed out.")
+
+
+@task(priority=TaskPriority.BACKGROUND.value)
+def add_activity(
+    user_id: int,
+    kind: str,
+    related_type: Optional[str] = None,
+    related_id: Optional[str | int] = None,
+    related_slug: Optional[str] = None,
+    timestamp: Optional[str] = None,
+    **_,
+):
+
+    logger.info(f"Executing add_activity related to {str(kind)}")
+
+    if timestamp is None:
+        timestamp = timezone.now().isoformat()
+
+    validate_activity(related_type, related_id, related_slug)
+
+    store_activities(
+        [
+            {
+                "user_id": user_id,
+                "kind": kind,
+                "related_type": related_type,
+                "related_id": related_id,
+                "related_slug": related_slug,
+                "timestamp": timestamp,
+            }
+        ]
+    )
+
+
+@task(priority=TaskPriority.BACKGROUND.value)
+def add_activities(activities: list[dict], **_):
+    """
+    Add many activities at once, each activity has the arguments of `add_activity`.
+
+    It is used by the bulk operations to schedule one task instead of one per activity.
+    """
+
+    logger.info(f"Executing add_activities with {len(activities)} activities")
+
+    timestamp = timezone.now().isoformat()
+    activities = [{"timestamp": timestamp, **x} for x in activities]
+
+    for activity in activities:
+        validate_activity(activity.get("related_type"), activity.get("related_id"), activity.get("related_slug"))
+
+    store_activities(activities)
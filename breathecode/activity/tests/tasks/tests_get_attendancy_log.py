@@ -216,13 +216,15 @@ class MediaTestSuite(MediaTestCase):
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_attendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                         call(
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_unattendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                     ],
                 )
@@ -557,13 +559,15 @@ class MediaTestSuite(MediaTestCase):
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_attendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                         call(
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_unattendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                     ],
                 )
@@ -899,13 +903,15 @@ class MediaTestSuite(MediaTestCase):
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_attendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                         call(
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_unattendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                     ],
                 )
@@ -1528,13 +1534,15 @@ class MediaTestSuite(MediaTestCase):
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_attendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                         call(
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_unattendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                     ],
                 )
@@ -2198,13 +2206,15 @@ class MediaTestSuite(MediaTestCase):
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_attendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                         call(
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_unattendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                     ],
                 )
@@ -2867,13 +2877,15 @@ class MediaTestSuite(MediaTestCase):
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_attendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                         call(
                             [
                                 StudentActivity.cohort == model.cohort.slug,
                                 StudentActivity.slug == "classroom_unattendance",
-                            ]
+                            ],
+                            projection=[StudentActivity.user_id, StudentActivity.day],
                         ),
                     ],
                 )
@@ -2957,3 +2969,42 @@ class MediaTestSuite(MediaTestCase):
 
             # teardown
             NDB.__init__.call_args_list = []
+
+    """
+    🔽🔽🔽 The logs of the students are saved in the same pass
+    """
+
+    @patch("logging.Logger.info", MagicMock())
+    @patch("logging.Logger.error", MagicMock())
+    @patch.object(NDB, "__init__", MagicMock(return_value=None))
+    @patch("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    @patch("breathecode.activity.tasks.get_attendancy_log_per_cohort_user.delay", MagicMock())
+    @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    def test_the_cohort_users_history_log(self):
+        attendance_seed = [get_datastore_seed(self.bc.fake.slug(), 1, {"slug": "classroom_attendance", "user_id": 1})]
+        unattendance_seed = [
+            get_datastore_seed(self.bc.fake.slug(), "1", {"slug": "classroom_unattendance", "user_id": 2})
+        ]
+        syllabus_version = {"json": {"days": [{"id": 1, "duration_in_days": 1, "label": self.bc.fake.slug()}]}}
+        cohort_users = [{"user_id": 1, "educational_status": "ACTIVE"}, {"user_id": 2, "educational_status": "ACTIVE"}]
+
+        with patch("breathecode.activity.tasks.get_attendancy_log.delay", MagicMock()):
+            model = self.bc.database.create(
+                user=2, cohort=1, cohort_user=cohort_users, syllabus_version=syllabus_version
+            )
+
+        with patch.object(NDB, "fetch", MagicMock(side_effect=[attendance_seed, unattendance_seed])):
+            get_attendancy_log.delay(model.cohort.id)
+
+        label = syllabus_version["json"]["days"][0]["label"]
+        log = {"updated_at": str(UTC_NOW), "current_module": "unknown"}
+
+        self.assertEqual(
+            [x["history_log"] for x in self.bc.database.list_of("admissions.CohortUser")],
+            [
+                {"attendance": {label: log}, "unattendance": {}},
+                {"attendance": {}, "unattendance": {label: log}},
+            ],
+        )
+        self.assertEqual(tasks.get_attendancy_log_per_cohort_user.delay.call_args_list, [])
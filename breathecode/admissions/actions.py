@@ -1,8 +1,10 @@
 import json
 import logging
-from math import asin, cos, radians, sin, sqrt
+from math import asin, cos, degrees, radians, sin, sqrt
 from typing import Optional
 
+from django.db.models import FloatField, Value
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
 from django.db.models.query_utils import Q
 
 from breathecode.authenticate.models import User
@@ -33,6 +35,62 @@ def haversine(lon1, lat1, lon2, lat2):
     return c * r
 
 
+def haversine_expression(latitude: float, longitude: float, prefix: str = "academy__"):
+    """
+    Build the haversine formula as a database expression, it gets the distance in kilometers between a point and
+    the `latitude` and `longitude` fields of a model, it returns NULL if any of those fields is NULL.
+    """
+
+    lon1 = Radians(Value(longitude, output_field=FloatField()))
+    lat1 = Radians(Value(latitude, output_field=FloatField()))
+    lon2 = Radians(Cast(f"{prefix}longitude", output_field=FloatField()))
+    lat2 = Radians(Cast(f"{prefix}latitude", output_field=FloatField()))
+
+    # it follows the same steps than `haversine` to get the same result
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = Power(Sin(dlat / 2), 2) + Cos(lat1) * Cos(lat2) * Power(Sin(dlon / 2), 2)
+    c = 2 * ASin(Sqrt(a))
+    return c * 6371
+
+
+def bounding_box(latitude: float, longitude: float, max_distance: float, prefix: str = "academy__") -> Q:
+    """
+    Get a filter with the box that contains the circle of radius `max_distance` in kilometers around a point.
+
+    It is a cheap prefilter that can use the indexes over `latitude` and `longitude`, the exact distance must be
+    checked later.
+    """
+
+    r = 6371
+    delta_latitude = degrees(max_distance / r)
+    min_latitude = latitude - delta_latitude
+    max_latitude = latitude + delta_latitude
+
+    query = Q(**{f"{prefix}latitude__gte": min_latitude, f"{prefix}latitude__lte": max_latitude})
+
+    # the box contains a pole, so it contains all the longitudes
+    if min_latitude <= -90 or max_latitude >= 90 or max_distance / r >= 1:
+        return query
+
+    delta_longitude = degrees(asin(min(sin(max_distance / r) / cos(radians(latitude)), 1)))
+    min_longitude = longitude - delta_longitude
+    max_longitude = longitude + delta_longitude
+
+    # the box crosses the antimeridian
+    if min_longitude < -180:
+        return query & (
+            Q(**{f"{prefix}longitude__gte": min_longitude + 360}) | Q(**{f"{prefix}longitude__lte": max_longitude})
+        )
+
+    if max_longitude > 180:
+        return query & (
+            Q(**{f"{prefix}longitude__gte": min_longitude}) | Q(**{f"{prefix}longitude__lte": max_longitude - 360})
+        )
+
+    return query & Q(**{f"{prefix}longitude__gte": min_longitude, f"{prefix}longitude__lte": max_longitude})
+
+
 def get_bucket_object(file_name):
     if not file_name:
         return False
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.7 on 2026-10-19 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("admissions", "0064_academy_legal_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="academy",
+            index=models.Index(fields=["latitude", "longitude"], name="academy_coordinates_idx"),
+        ),
+    ]
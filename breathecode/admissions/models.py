@@ -126,6 +126,10 @@ class Academy(models.Model):
 
     logistical_information = models.CharField(max_length=150, blank=True, null=True)
 
+    class Meta:
+        # it is used as a bounding box prefilter to look for the nearest academies
+        indexes = [models.Index(fields=["latitude", "longitude"], name="academy_coordinates_idx")]
+
     def default_ac_slug(self):
         return self.slug
 
@@ -4,15 +4,17 @@ import graphene
 from graphql import GraphQLError
 from graphql.type.definition import GraphQLResolveInfo
 from graphene_django import DjangoObjectType
-import graphene_django_optimizer as gql_optimizer
 
 from breathecode.admissions import models
-from breathecode.admissions.actions import haversine
-from django.db.models import FloatField, Q, Value
+from breathecode.admissions.actions import bounding_box, haversine_expression
+from breathecode.utils import RelationLoader
+from django.db.models import F, FloatField, Q, Value
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+MAX_LIMIT = 100
+
 
 def field_is_requested(info, field_name):
     """Check if a field is being requested in the current query."""
@@ -28,39 +30,22 @@ def to_snake_case(name):
     return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
 
 
-def optimize_queryset(queryset, to_one=None, to_many=None, custom=None, fields=None, info=None):
-
-    if to_one is None:
-        to_one = []
-
-    if to_many is None:
-        to_many = []
+def get_loader(info) -> RelationLoader:
+    """Get the relation loader of the current request."""
 
-    if custom is None:
-        custom = []
-
-    selected_related = []
-    prefetch_related = []
-    only = []
-
-    if not fields:
-        fields = fields_requested(info)
+    if not hasattr(info.context, "relation_loader"):
+        info.context.relation_loader = RelationLoader()
 
-    for field in fields:
-        field = to_snake_case(field)
+    return info.context.relation_loader
 
-        if field in to_many:
-            prefetch_related.append(field)
 
-        elif field in to_one:
-            selected_related.append(field)
+def resolve_relation(name):
+    """Build a resolver that batches the foreign key or reverse foreign key `name` of every sibling object."""
 
-        # it does not works
-        # elif field not in custom and field not in selected_related and field not in prefetch_related:
-        #     only.append(field)
+    def resolver(root, info, **kwargs):
+        return get_loader(info).load(root, name)
 
-    queryset = queryset.select_related(*selected_related).prefetch_related(*prefetch_related).only(*only)
-    return queryset
+    return resolver
 
 
 class CohortTimeSlot(DjangoObjectType):
@@ -69,6 +54,8 @@ class CohortTimeSlot(DjangoObjectType):
         model = models.CohortTimeSlot
         fields = "__all__"
 
+    resolve_cohort = resolve_relation("cohort")
+
 
 class City(DjangoObjectType):
 
@@ -76,6 +63,9 @@ class City(DjangoObjectType):
         model = models.City
         fields = "__all__"
 
+    resolve_country = resolve_relation("country")
+    resolve_academy_set = resolve_relation("academy_set")
+
 
 class Country(DjangoObjectType):
 
@@ -85,6 +75,9 @@ class Country(DjangoObjectType):
 
     city = graphene.Field(City)
 
+    resolve_city_set = resolve_relation("city_set")
+    resolve_academy_set = resolve_relation("academy_set")
+
 
 class Academy(DjangoObjectType):
 
@@ -95,6 +88,12 @@ class Academy(DjangoObjectType):
     country = graphene.Field(Country)
     city = graphene.Field(City)
 
+    resolve_country = resolve_relation("country")
+    resolve_city = resolve_relation("city")
+    resolve_syllabus_set = resolve_relation("syllabus_set")
+    resolve_syllabusschedule_set = resolve_relation("syllabusschedule_set")
+    resolve_cohort_set = resolve_relation("cohort_set")
+
 
 class Syllabus(DjangoObjectType):
 
@@ -102,6 +101,10 @@ class Syllabus(DjangoObjectType):
         model = models.Syllabus
         fields = "__all__"
 
+    resolve_academy_owner = resolve_relation("academy_owner")
+    resolve_syllabusversion_set = resolve_relation("syllabusversion_set")
+    resolve_syllabusschedule_set = resolve_relation("syllabusschedule_set")
+
 
 class SyllabusVersion(DjangoObjectType):
 
@@ -111,6 +114,9 @@ class SyllabusVersion(DjangoObjectType):
 
     syllabus = graphene.Field(Syllabus)
 
+    resolve_syllabus = resolve_relation("syllabus")
+    resolve_cohort_set = resolve_relation("cohort_set")
+
 
 class SyllabusSchedule(DjangoObjectType):
 
@@ -120,6 +126,10 @@ class SyllabusSchedule(DjangoObjectType):
 
     syllabus = graphene.Field(Syllabus)
 
+    resolve_syllabus = resolve_relation("syllabus")
+    resolve_academy = resolve_relation("academy")
+    resolve_cohort_set = resolve_relation("cohort_set")
+
 
 class Cohort(DjangoObjectType):
 
@@ -134,42 +144,44 @@ class Cohort(DjangoObjectType):
 
     timeslots = graphene.List(CohortTimeSlot)
 
+    resolve_academy = resolve_relation("academy")
+    resolve_syllabus_version = resolve_relation("syllabus_version")
+    resolve_schedule = resolve_relation("schedule")
+    resolve_cohorttimeslot_set = resolve_relation("cohorttimeslot_set")
+
     def resolve_timeslots(self, info, first=10):
-        return gql_optimizer.query(self.cohorttimeslot_set.all()[0:first], info)
+        return get_loader(info).load(self, "cohorttimeslot_set")[0:first]
 
     def resolve_distance(self, info):
-        if not hasattr(self, "latitude") or not hasattr(self, "longitude"):
-            return None
-
-        if not self.latitude or not self.longitude or not self.academy.latitude or not self.academy.longitude:
-            return None
-
-        return haversine(self.longitude, self.latitude, self.academy.longitude, self.academy.latitude)
+        # it is annotated by the database
+        return getattr(self, "distance", None)
 
 
 class Admissions(graphene.ObjectType):
     hello = graphene.String(default_value="Hi!")
     cohorts = graphene.List(
-        Cohort, page=graphene.Int(), limit=graphene.Int(), plan=graphene.String(), coordinates=graphene.String()
+        Cohort,
+        page=graphene.Int(),
+        limit=graphene.Int(),
+        plan=graphene.String(),
+        coordinates=graphene.String(),
+        max_distance=graphene.Float(),
     )
 
     def resolve_cohorts(self, info: GraphQLResolveInfo, page=1, limit=10, **kwargs):
         items = models.Cohort.objects.all()
+
+        # it bounds the complexity of the query
+        limit = min(limit, MAX_LIMIT)
         start = (page - 1) * limit
         end = start + limit
 
         fields = fields_requested(info)
 
-        items = optimize_queryset(
-            items, to_one=["academy", "schedule", "syllabusVersion"], to_many=[], custom=["distance"], fields=fields
-        )
-
         has_distance = "distance" in fields
 
         if has_distance:
-            items = items.annotate(
-                longitude=Value(None, output_field=FloatField()), latitude=Value(None, output_field=FloatField())
-            )
+            items = items.annotate(distance=Value(None, output_field=FloatField()))
 
         upcoming = kwargs.get("upcoming", None)
         if upcoming == "true":
@@ -202,21 +214,37 @@ class Admissions(graphene.ObjectType):
         else:
             items = items.exclude(stage="DELETED")
 
-        if has_distance and (coordinates := kwargs.get("coordinates", "")):
+        if coordinates := kwargs.get("coordinates", ""):
             try:
                 latitude, longitude = coordinates.split(",")
                 latitude = float(latitude)
                 longitude = float(longitude)
             except Exception:
-                raise GraphQLError("Bad coordinates, the format is latitude,longitude", slug="bad-coordinates")
+                raise GraphQLError(
+                    "Bad coordinates, the format is latitude,longitude", extensions={"slug": "bad-coordinates"}
+                )
 
             if latitude > 90 or latitude < -90:
-                raise GraphQLError("Bad latitude", slug="bad-latitude")
+                raise GraphQLError("Bad latitude", extensions={"slug": "bad-latitude"})
 
             if longitude > 180 or longitude < -180:
-                raise GraphQLError("Bad longitude", slug="bad-longitude")
+                raise GraphQLError("Bad longitude", extensions={"slug": "bad-longitude"})
+
+            if max_distance := kwargs.get("max_distance", None):
+                if max_distance <= 0:
+                    raise GraphQLError(
+                        "Bad max_distance, it must be greater than 0", extensions={"slug": "bad-max-distance"}
+                    )
+
+                items = items.filter(bounding_box(latitude, longitude, max_distance))
 
-            items = items.annotate(longitude=Value(longitude, FloatField()), latitude=Value(latitude, FloatField()))
+            # the cohorts are sorted by distance in the database, then the pagination is right across pages
+            items = items.annotate(distance=haversine_expression(latitude, longitude)).order_by(
+                F("distance").asc(nulls_last=True), "id"
+            )
+
+            if max_distance:
+                items = items.filter(distance__lte=max_distance)
 
         saas = kwargs.get("saas", "").lower()
         if saas == "true":
@@ -246,4 +274,8 @@ class Admissions(graphene.ObjectType):
 
             items = items.filter(**kwargs).distinct()
 
-        return items[start:end]
+        # the relations of the cohorts are batched by the loader
+        items = list(items[start:end])
+        get_loader(info).register(items)
+
+        return items
@@ -11,7 +11,7 @@ from breathecode.authenticate.models import CredentialsGithub, ProfileAcademy
 from breathecode.utils import localize_query, serializers, serpy
 from capyc.rest_framework.exceptions import ValidationException
 
-from .actions import haversine, test_syllabus
+from .actions import test_syllabus
 from .models import (
     COHORT_STAGE,
     Academy,
@@ -367,17 +367,11 @@ class PublicCohortSerializer(serpy.Serializer):
     remote_available = serpy.Field()
     syllabus_version = SyllabusVersionSmallSerializer(required=False)
     academy = GetAcademySerializer()
-    distance = serpy.MethodField()
+    distance = serpy.Field()
     timezone = serpy.Field()
     schedule = GetSmallSyllabusScheduleSerializer(required=False)
     timeslots = serpy.ManyToManyField(SmallCohortTimeSlotSerializer(attr="cohorttimeslot_set", many=True))
 
-    def get_distance(self, obj):
-        if not obj.latitude or not obj.longitude or not obj.academy.latitude or not obj.academy.longitude:
-            return None
-
-        return haversine(obj.longitude, obj.latitude, obj.academy.longitude, obj.academy.latitude)
-
 
 class GetSmallCohortSerializer(serpy.Serializer):
     """The serializer schema definition."""
@@ -0,0 +1,35 @@
+"""
+Test bounding_box
+"""
+
+from django.db.models import Q
+
+from breathecode.admissions.actions import bounding_box
+
+
+def test_bounding_box():
+    query = bounding_box(0, 0, 111.19492664455873)
+
+    assert query == Q(academy__latitude__gte=-1.0, academy__latitude__lte=1.0) & Q(
+        academy__longitude__gte=-1.0, academy__longitude__lte=1.0
+    )
+
+
+def test_bounding_box__with_prefix():
+    query = bounding_box(0, 0, 111.19492664455873, prefix="")
+
+    assert query == Q(latitude__gte=-1.0, latitude__lte=1.0) & Q(longitude__gte=-1.0, longitude__lte=1.0)
+
+
+def test_bounding_box__crossing_the_antimeridian():
+    query = bounding_box(0, 179.5, 111.19492664455873)
+
+    assert query == Q(academy__latitude__gte=-1.0, academy__latitude__lte=1.0) & (
+        Q(academy__longitude__gte=178.5) | Q(academy__longitude__lte=-179.5)
+    )
+
+
+def test_bounding_box__containing_a_pole():
+    query = bounding_box(89.5, 0, 111.19492664455873)
+
+    assert query == Q(academy__latitude__gte=88.5, academy__latitude__lte=90.5)
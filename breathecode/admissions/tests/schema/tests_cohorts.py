@@ -0,0 +1,83 @@
+"""
+Test the cohorts of the admissions graphql schema
+"""
+
+import pytest
+from rest_framework.test import APIClient
+
+from capyc.rest_framework import pytest as capy
+
+QUERY = """
+query {
+    Admissions {
+        cohorts(limit: 100) {
+            id
+            academy {
+                id
+                city {
+                    id
+                    country {
+                        code
+                    }
+                }
+            }
+            syllabusVersion {
+                id
+                syllabus {
+                    id
+                }
+            }
+            timeslots {
+                id
+            }
+        }
+    }
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def setup(db):
+    yield
+
+
+def query(client: APIClient, query: str):
+    return client.post("/graphql", {"query": query}, format="json")
+
+
+@pytest.mark.parametrize("n", [1, 4])
+def test_nested_relations__the_number_of_queries_does_not_depend_on_the_results(
+    database: capy.Database, client: APIClient, django_assert_num_queries, n
+):
+    model = database.create(
+        city=1,
+        country=1,
+        academy=n,
+        syllabus=1,
+        syllabus_version=1,
+        cohort=[{"academy_id": x + 1} for x in range(n)],
+        cohort_time_slot=[{"cohort_id": x + 1} for x in range(n)],
+    )
+
+    # cohorts, academies, cities, countries, syllabus versions, syllabus and timeslots
+    with django_assert_num_queries(7):
+        response = query(client, QUERY)
+
+    data = response.json()["data"]["Admissions"]["cohorts"]
+    cohorts = model.cohort if n > 1 else [model.cohort]
+    timeslots = model.cohort_time_slot if n > 1 else [model.cohort_time_slot]
+
+    assert response.status_code == 200
+    assert [x["id"] for x in data] == [str(x.id) for x in cohorts]
+    assert [x["academy"]["id"] for x in data] == [str(x.academy.id) for x in cohorts]
+    assert [x["academy"]["city"]["country"]["code"] for x in data] == [model.country.code] * n
+    assert [x["syllabusVersion"]["syllabus"]["id"] for x in data] == [str(model.syllabus.id)] * n
+    assert [[y["id"] for y in x["timeslots"]] for x in data] == [[str(y.id)] for y in timeslots]
+
+
+def test_depth_limit(client: APIClient):
+    nested = "id " + "cohortSet { id academy { id " * 5 + "}}" * 5
+    response = query(client, "query { Admissions { cohorts { academy { %s } } } }" % nested)
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["message"] == "'anonymous' exceeds maximum operation depth of 10."
@@ -2,6 +2,7 @@
 Test /cohort/user
 """
 
+import json
 import random
 import re
 from random import choice
@@ -213,6 +214,25 @@ class CohortUserTestSuite(AdmissionsTestCase):
         self.assertEqual(self.count_cohort_user(), 1)
         self.assertEqual(self.get_cohort_user_dict(1), model_dict)
 
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock())
+    @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    def test__with_data__stream_ndjson(self):
+        """Test /cohort/user?stream=ndjson"""
+        self.headers(academy=1)
+        model = self.generate_models(
+            authenticate=True, cohort_user=2, profile_academy=True, capability="read_all_cohort", role="potato"
+        )
+        url = reverse_lazy("admissions:academy_cohort_user") + "?stream=ndjson&sort=id"
+        response = self.client.get(url)
+        lines = [json.loads(x) for x in b"".join(response.streaming_content).splitlines()]
+
+        self.assertEqual([x["id"] for x in lines], [x.id for x in model.cohort_user])
+        self.assertEqual([x["user"]["id"] for x in lines], [x.user.id for x in model.cohort_user])
+        self.assertEqual([x["cohort"]["slug"] for x in lines], [x.cohort.slug for x in model.cohort_user])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
     """
     🔽🔽🔽 Roles in querystring
     """
@@ -510,6 +510,91 @@ class CohortAllTestSuite(AdmissionsTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(self.bc.database.list_of("admissions.Cohort"), self.bc.format.to_dict(model.cohort))
 
+    def test_with_data__good_coordinates__sorting_the_distances__paginated(self):
+        """Test /cohort/all without auth"""
+        distance2 = 11318.400937786448
+        distance3 = 14915.309490907744
+        academies = [
+            {
+                "latitude": -60,
+                "longitude": -99,
+            },
+            {
+                "latitude": 76,
+                "longitude": 130,
+            },
+            {
+                "latitude": 43,
+                "longitude": -165,
+            },
+            {
+                "latitude": 90,
+                "longitude": -33,
+            },
+        ]
+        cohorts = [{"academy_id": n} for n in range(1, 5)]
+        model = self.generate_models(academy=academies, cohort=cohorts, syllabus_version=True)
+
+        url = reverse_lazy("admissions:cohort_all") + "?coordinates=-56,167&limit=2&offset=1"
+        response = self.client.get(url)
+        json = response.json()
+        expected = [
+            get_serializer(model.cohort[2], model.syllabus, model.syllabus_version, data={"distance": distance2}),
+            get_serializer(model.cohort[1], model.syllabus, model.syllabus_version, data={"distance": distance3}),
+        ]
+
+        self.assertEqual(json["results"], expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_with_data__good_coordinates__with_max_distance(self):
+        """Test /cohort/all without auth"""
+        distance1 = 5081.175052677738
+        distance2 = 11318.400937786448
+        academies = [
+            {
+                "latitude": -60,
+                "longitude": -99,
+            },
+            {
+                "latitude": 76,
+                "longitude": 130,
+            },
+            {
+                "latitude": 43,
+                "longitude": -165,
+            },
+            {
+                "latitude": 90,
+                "longitude": -33,
+            },
+        ]
+        cohorts = [{"academy_id": n} for n in range(1, 5)]
+        model = self.generate_models(academy=academies, cohort=cohorts, syllabus_version=True)
+
+        url = reverse_lazy("admissions:cohort_all") + "?coordinates=-56,167&max_distance=12000"
+        response = self.client.get(url)
+        json = response.json()
+        expected = [
+            get_serializer(model.cohort[0], model.syllabus, model.syllabus_version, data={"distance": distance1}),
+            get_serializer(model.cohort[2], model.syllabus, model.syllabus_version, data={"distance": distance2}),
+        ]
+
+        self.assertEqual(json, expected)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_with_data__good_coordinates__with_bad_max_distance(self):
+        """Test /cohort/all without auth"""
+        self.generate_models(cohort=True, syllabus_version=True)
+
+        for max_distance in ["a", "0", "-1"]:
+            url = reverse_lazy("admissions:cohort_all") + f"?coordinates=-56,167&max_distance={max_distance}"
+            response = self.client.get(url)
+            json = response.json()
+            expected = {"detail": "bad-max-distance", "status_code": 400}
+
+            self.assertEqual(json, expected)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     """
     🔽🔽🔽 saas in querystring
     """
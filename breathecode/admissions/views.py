@@ -3,7 +3,7 @@ import logging
 import pytz
 from adrf.decorators import api_view
 from django.contrib.auth.models import AnonymousUser, User
-from django.db.models import FloatField, Max, Q, Value
+from django.db.models import F, FloatField, Max, Q, Value
 from django.utils import timezone
 from slugify import slugify
 from rest_framework import status
@@ -22,14 +22,16 @@ from breathecode.utils import (
     DatetimeInteger,
     GenerateLookupsMixin,
     HeaderLimitOffsetPagination,
+    StreamingListResponse,
     capable_of,
+    get_streaming_format,
     localize_query,
 )
 from breathecode.utils.find_by_full_name import query_like_by_full_name
 from breathecode.utils.i18n import translation
 from capyc.rest_framework.exceptions import ValidationException
 
-from .actions import find_asset_on_json, test_syllabus, update_asset_on_json
+from .actions import bounding_box, find_asset_on_json, haversine_expression, test_syllabus, update_asset_on_json
 from .models import (
     DELETED,
     STUDENT,
@@ -198,9 +200,13 @@ def get_public_syllabus(request, id=None):
 class PublicCohortView(APIView):
     permission_classes = [AllowAny]
     extensions = APIViewExtensions(cache=CohortCache, paginate=True, sort="-kickoff_date")
+    nearest_extensions = APIViewExtensions(cache=CohortCache, paginate=True, sort=F("distance").asc(nulls_last=True))
 
     def get(self, request, id=None):
-        handler = self.extensions(request)
+        coordinates = request.GET.get("coordinates", "")
+
+        # the cohorts are sorted by distance in the database, then the pagination is right across pages
+        handler = self.nearest_extensions(request) if coordinates else self.extensions(request)
 
         cache = handler.cache.get()
         if cache is not None:
@@ -208,9 +214,7 @@ class PublicCohortView(APIView):
 
         items = Cohort.objects.filter(private=False).select_related("syllabus_version__syllabus")
 
-        items = items.annotate(
-            longitude=Value(None, output_field=FloatField()), latitude=Value(None, output_field=FloatField())
-        )
+        items = items.annotate(distance=Value(None, output_field=FloatField()))
 
         upcoming = request.GET.get("upcoming", None)
         if upcoming == "true":
@@ -243,7 +247,7 @@ class PublicCohortView(APIView):
         else:
             items = items.exclude(stage="DELETED")
 
-        if coordinates := request.GET.get("coordinates", ""):
+        if coordinates:
             try:
                 latitude, longitude = coordinates.split(",")
                 latitude = float(latitude)
@@ -257,7 +261,21 @@ class PublicCohortView(APIView):
             if longitude > 180 or longitude < -180:
                 raise ValidationException("Bad longitude", slug="bad-longitude")
 
-            items = items.annotate(longitude=Value(longitude, FloatField()), latitude=Value(latitude, FloatField()))
+            if max_distance := request.GET.get("max_distance", ""):
+                try:
+                    max_distance = float(max_distance)
+                except Exception:
+                    raise ValidationException("Bad max_distance, it must be a number", slug="bad-max-distance")
+
+                if max_distance <= 0:
+                    raise ValidationException("Bad max_distance, it must be greater than 0", slug="bad-max-distance")
+
+                items = items.filter(bounding_box(latitude, longitude, max_distance))
+
+            items = items.annotate(distance=haversine_expression(latitude, longitude))
+
+            if max_distance:
+                items = items.filter(distance__lte=max_distance)
 
         saas = request.GET.get("saas", "").lower()
         if saas == "true":
@@ -293,9 +311,8 @@ class PublicCohortView(APIView):
 
         items = handler.queryset(items)
         serializer = PublicCohortSerializer(items, many=True)
-        data = sorted(serializer.data, key=lambda x: x["distance"] or float("inf")) if coordinates else serializer.data
 
-        return handler.response(data)
+        return handler.response(serializer.data)
 
 
 class AcademyReportView(APIView):
@@ -667,6 +684,14 @@ class AcademyCohortUserView(APIView, GenerateLookupsMixin):
 
         tasks = request.GET.get("tasks", None)
 
+        # unbounded exports skip the pagination and the cache, they are streamed row by row
+        if stream := get_streaming_format(request):
+            items = items.select_related("user", "cohort__academy")
+            serializer = (
+                GetCohortUserTasksSerializer if tasks is not None and tasks == "True" else GetCohortUserSerializer
+            )
+            return StreamingListResponse(items, format=stream, serializer=serializer, filename="cohort-users")
+
         items = handler.queryset(items)
         serializer = (
             GetCohortUserTasksSerializer(items, many=True)
@@ -0,0 +1,13 @@
+from breathecode.utils import Cache
+
+from .models import Assessment, Option
+
+
+class AssessmentCache(Cache):
+    model = Assessment
+
+
+class OptionCache(Cache):
+    model = Option
+    # the options are two relations away from their assessment
+    max_deep = 3
@@ -96,7 +96,8 @@ class Assessment(models.Model):
             },
             "questions": [],
         }
-        _questions = self.question_set.all()
+        # the options of every question are loaded in one query
+        _questions = self.question_set.prefetch_related("option_set")
         for q in _questions:
             _q = {"id": q.id, "title": q.title, "options": []}
 
@@ -304,24 +305,23 @@ class UserAssessment(models.Model):
         return super().save(*args, **kwargs)
 
     def get_score(self):
+        # Ignore open text questions
+        answers = self.answer_set.exclude(question__question_type="TEXT")
 
-        total_score = 0
-        answers = self.answer_set.all().order_by("created_at")
-        last_one = None
-        for a in answers:
-            last_one = a
-
-            # Ignore open text questions
-            if a.question.question_type == "TEXT":
-                continue
-            if a.option:
-                a.value = str(a.option.score)
+        result = answers.filter(option__isnull=False).aggregate(total_score=models.Sum("option__score"))
+        total_score = result["total_score"] or 0
 
+        # answers without option hold the value picked by the user
+        for value in answers.filter(option__isnull=True).values_list("value", flat=True):
             try:
-                total_score += float(a.value)
+                total_score += float(value)
             except ValueError:
                 pass
 
+        last_one = self.answer_set.select_related("option", "question").order_by("created_at", "id").last()
+        if last_one and last_one.option and (last_one.question is None or last_one.question.question_type != "TEXT"):
+            last_one.value = str(last_one.option.score)
+
         return total_score, last_one
 
     def __str__(self):
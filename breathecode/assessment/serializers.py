@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AnonymousUser
+from django.db.models import Prefetch
 from django.utils import timezone
 from rest_framework import serializers
 
@@ -85,6 +86,9 @@ class GetQuestionSerializer(serpy.Serializer):
     options = serpy.MethodField()
 
     def get_options(self, obj):
+        if hasattr(obj, "active_options"):
+            return GetOptionSerializer(obj.active_options, many=True).data
+
         return GetOptionSerializer(obj.option_set.filter(is_deleted=False), many=True).data
 
 
@@ -186,9 +190,14 @@ class GetAssessmentBigSerializer(GetAssessmentSerializer):
     is_instant_feedback = serpy.Field()
 
     def get_questions(self, obj):
-        return GetQuestionSerializer(
-            obj.question_set.filter(is_deleted=False).order_by("-position", "id"), many=True
-        ).data
+        questions = (
+            obj.question_set.filter(is_deleted=False)
+            .order_by("-position", "id")
+            .prefetch_related(
+                Prefetch("option_set", queryset=Option.objects.filter(is_deleted=False), to_attr="active_options")
+            )
+        )
+        return GetQuestionSerializer(questions, many=True).data
 
 
 class OptionSerializer(serializers.ModelSerializer):
@@ -15,6 +15,7 @@ from breathecode.utils import APIViewExtensions, GenerateLookupsMixin, capable_o
 from breathecode.utils.i18n import translation
 from capyc.rest_framework.exceptions import ValidationException
 
+from .caches import AssessmentCache
 from .models import Answer, Assessment, AssessmentLayout, AssessmentThreshold, Option, Question, UserAssessment
 from .serializers import (
     AnswerSerializer,
@@ -91,10 +92,18 @@ class GetAssessmentView(APIView):
     """
 
     permission_classes = [AllowAny]
+    extensions = APIViewExtensions(cache=AssessmentCache)
 
     def get(self, request, assessment_slug=None):
 
         if assessment_slug is not None:
+            handler = self.extensions(request)
+
+            # the cache is keyed by slug and lang, and cleaned when the questions or options change
+            cache = handler.cache.get()
+            if cache is not None:
+                return cache
+
             lang = None
             if "lang" in self.request.GET:
                 lang = self.request.GET.get("lang")
@@ -109,7 +118,7 @@ class GetAssessmentView(APIView):
                     raise ValidationException(f"Language '{lang}' not found for assesment {assessment_slug}", 404)
 
             serializer = GetAssessmentBigSerializer(item, many=False)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return handler.response(serializer.data)
 
         # get original all assessments (assessments that have no parent)
         items = Assessment.objects.all()
@@ -1,11 +1,17 @@
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 import requests
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from breathecode.admissions.models import CohortUser
 from capyc.rest_framework.exceptions import ValidationException
 
+from . import signals
 from .models import Task
 
 logger = logging.getLogger(__name__)
@@ -58,6 +64,120 @@ def deliver_task(github_url, live_url=None, task_id=None, task=None):
     return task
 
 
+OLD_API_TIMEOUT = 2
+OLD_API_MAX_WORKERS = 8
+TASKS_BATCH_SIZE = 500
+
+SYNC_TASK_TYPE = {
+    "assignment": "PROJECT",
+    "quiz": "QUIZ",
+    "lesson": "LESSON",
+    "replit": "EXERCISE",
+}
+
+SYNC_REVISION_STATUS = {
+    "None": "PENDING",
+    "pending": "PENDING",
+    "approved": "APPROVED",
+    "rejected": "REJECTED",
+}
+
+SYNC_TASK_STATUS = {
+    "pending": "PENDING",
+    "done": "DONE",
+}
+
+session_lock = threading.Lock()
+session: Optional[requests.Session] = None
+
+
+def get_old_api_session() -> requests.Session:
+    """Get the session used to fetch the tasks from the old API, it keeps a pool of connections."""
+
+    global session
+
+    if session is None:
+        with session_lock:
+            if session is None:
+                s = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=OLD_API_MAX_WORKERS, pool_maxsize=OLD_API_MAX_WORKERS
+                )
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                session = s
+
+    return session
+
+
+def fetch_student_tasks(email: str) -> list[dict]:
+    """Get the tasks of a student from the old API, they are validated before being returned."""
+
+    response = get_old_api_session().get(f"{HOST}/student/{email}/task/", timeout=OLD_API_TIMEOUT)
+    if response.status_code != 200:
+        raise Exception(f"Student {email} not found on the old API")
+
+    tasks = response.json()["data"]
+    for _task in tasks:
+        if _task["type"] not in SYNC_TASK_TYPE:
+            raise Exception(f"Invalid task_type {_task['type']}")
+        if _task["status"] not in SYNC_TASK_STATUS:
+            raise Exception(f"Invalid status {_task['status']}")
+        if str(_task["revision_status"]) not in SYNC_REVISION_STATUS:
+            raise Exception(f"Invalid revision_status {_task['revision_status']}")
+
+    return tasks
+
+
+def build_synced_task(user_id: int, cohort, _task: dict) -> Task:
+    """Build a task from the old API and check its fields, `bulk_create` skips the `full_clean` of `Task.save`."""
+
+    task = Task(
+        user_id=user_id,
+        task_status=SYNC_TASK_STATUS[_task["status"]],
+        live_url=_task["live_url"],
+        github_url=_task["github_url"],
+        associated_slug=_task["associated_slug"],
+        title=_task["title"],
+        task_type=SYNC_TASK_TYPE[_task["type"]],
+        revision_status=SYNC_REVISION_STATUS[str(_task["revision_status"])],
+        description=_task["description"],
+        cohort=cohort,
+    )
+
+    # the user and the cohort come from the database already
+    task.full_clean(exclude=["user", "cohort"])
+
+    return task
+
+
+def create_synced_tasks(tasks: list[Task]) -> list[Task]:
+    """
+    Save the new tasks in bulk.
+
+    `bulk_create` skips `assignment_created` and `post_save`, so the subtasks of the registry assets are added
+    here, each asset is read once, and the cache is cleared once.
+    """
+
+    from breathecode.commons.signals import update_cache
+    from breathecode.registry.models import Asset
+
+    if not tasks:
+        return []
+
+    slugs = {x.associated_slug for x in tasks}
+    subtasks = {x.slug: x.get_tasks() for x in Asset.objects.filter(slug__in=slugs)}
+
+    for task in tasks:
+        if task.associated_slug in subtasks:
+            task.subtasks = subtasks[task.associated_slug]
+
+    created = Task.objects.bulk_create(tasks, batch_size=TASKS_BATCH_SIZE)
+    update_cache.send_robust(sender=Task)
+
+    return created
+
+
 # FIXME: this maybe is a deadcode
 def sync_student_tasks(user, cohort=None):
 
@@ -66,72 +186,94 @@ def sync_student_tasks(user, cohort=None):
         if cu is not None:
             cohort = cu.cohort
 
-    response = requests.get(f"{HOST}/student/{user.email}/task/", timeout=2)
-    if response.status_code != 200:
-        raise Exception(f"Student {user.email} not found on the old API")
-
-    tasks = response.json()
-    task_type = {
-        "assignment": "PROJECT",
-        "quiz": "QUIZ",
-        "lesson": "LESSON",
-        "replit": "EXERCISE",
-    }
-
-    revision_status = {
-        "None": "PENDING",
-        "pending": "PENDING",
-        "approved": "APPROVED",
-        "rejected": "REJECTED",
-    }
+    tasks = fetch_student_tasks(user.email)
+    slugs = {x["associated_slug"] for x in tasks}
 
-    task_status = {
-        "pending": "PENDING",
-        "done": "DONE",
+    # the oldest task wins if the slug is repeated
+    existing = {
+        x.associated_slug: x
+        for x in Task.objects.filter(user_id=user.id, associated_slug__in=slugs).order_by("-id")
     }
 
-    syncronized = []
-    for _task in tasks["data"]:
+    missing = {}
+    for _task in tasks:
+        if _task["associated_slug"] not in existing and _task["associated_slug"] not in missing:
+            missing[_task["associated_slug"]] = build_synced_task(user.id, cohort, _task)
 
-        if _task["type"] not in task_type:
-            raise Exception(f"Invalid task_type {_task['type']}")
-        if _task["status"] not in task_status:
-            raise Exception(f"Invalid status {_task['status']}")
-        if str(_task["revision_status"]) not in revision_status:
-            raise Exception(f"Invalid revision_status {_task['revision_status']}")
+    created = {x.associated_slug: x for x in create_synced_tasks(list(missing.values()))}
+    syncronized = [existing.get(x["associated_slug"]) or created[x["associated_slug"]] for x in tasks]
 
-        task = Task.objects.filter(user_id=user.id, associated_slug=_task["associated_slug"]).first()
-        if task is None:
-            task = Task(
-                user=user,
-            )
-            task.task_status = task_status[_task["status"]]
-            task.live_url = _task["live_url"]
-            task.github_url = _task["github_url"]
-            task.associated_slug = _task["associated_slug"]
-            task.title = _task["title"]
-            task.task_type = task_type[_task["type"]]
-            task.revision_status = revision_status[str(_task["revision_status"])]
-            task.description = _task["description"]
-            task.cohort = cohort
-            task.save()
-        syncronized.append(task)
     logger.debug(f"Added {len(syncronized)} tasks for student {user.email}")
     return syncronized
 
 
-def sync_cohort_tasks(cohort):
+def sync_cohort_tasks(cohort) -> dict:
+    """
+    Sync the tasks of the active students of a cohort from the old API.
+
+    The students are fetched concurrently, then their existing tasks are read in one query and the missing ones
+    are created in bulk. It returns a summary instead of the tasks.
+    """
+
+    cohort_users = CohortUser.objects.filter(
+        cohort__id=cohort.id, role="STUDENT", educational_status__in=["ACTIVE"]
+    ).select_related("user")
+    users = [cu.user for cu in cohort_users]
+
+    remote = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=OLD_API_MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_student_tasks, user.email): user for user in users}
+        for future in as_completed(futures):
+            user = futures[future]
+            try:
+                remote[user.id] = future.result()
+            except Exception as e:
+                logger.warning(f"Tasks of {user.email} could not be synced: {e}")
+                failed.append(user.email)
+
+    slugs = {x["associated_slug"] for tasks in remote.values() for x in tasks}
+    existing = set(
+        Task.objects.filter(user_id__in=remote.keys(), associated_slug__in=slugs).values_list(
+            "user_id", "associated_slug"
+        )
+    )
+
+    emails = {user.id: user.email for user in users}
+    missing = {}
+    found = set()
+    synced = 0
+    for user_id, tasks in remote.items():
+        student_missing = {}
+        student_found = set()
 
-    synchronized = []
-    cohort_users = CohortUser.objects.filter(cohort__id=cohort.id, role="STUDENT", educational_status__in=["ACTIVE"])
-    for cu in cohort_users:
         try:
-            tasks = sync_student_tasks(cu.user, cohort=cohort)
-            synchronized = synchronized + tasks
-        except Exception:
+            for _task in tasks:
+                key = (user_id, _task["associated_slug"])
+                if key in existing:
+                    student_found.add(key)
+
+                elif key not in student_missing:
+                    student_missing[key] = build_synced_task(user_id, cohort, _task)
+
+        except ValidationError as e:
+            logger.warning(f"Tasks of {emails[user_id]} could not be synced: {e}")
+            failed.append(emails[user_id])
             continue
 
-    return synchronized
+        missing.update(student_missing)
+        found |= student_found
+        synced += 1
+
+    created = create_synced_tasks(list(missing.values()))
+
+    return {
+        "students": len(users),
+        "synced_students": synced,
+        "failed_students": sorted(failed),
+        "created": len(created),
+        "existing": len(found),
+    }
 
 
 def task_is_valid_for_notifications(task: Task) -> bool:
@@ -150,3 +292,153 @@ def task_is_valid_for_notifications(task: Task) -> bool:
         return False
 
     return True
+
+
+def set_assignment_history(history_log: Optional[dict], task_id: int, task_type: str, task_status: str) -> dict:
+    """Move a task to the pending or delivered assignments of the history log of a student."""
+
+    history_log = history_log or {}
+    pending = [x for x in history_log.get("pending_assignments", []) if x["id"] != task_id]
+    delivered = [x for x in history_log.get("delivered_assignments", []) if x["id"] != task_id]
+
+    if task_status == "PENDING":
+        pending.append({"id": task_id, "type": task_type})
+
+    if task_status == "DONE":
+        delivered.append({"id": task_id, "type": task_type})
+
+    history_log["pending_assignments"] = pending
+    history_log["delivered_assignments"] = delivered
+
+    return history_log
+
+
+def build_assignment_history(history_log: Optional[dict], tasks: list[dict]) -> dict:
+    """Rebuild the pending and delivered assignments of the history log of a student from its tasks."""
+
+    history_log = history_log or {}
+    history_log["pending_assignments"] = [
+        {"id": x["id"], "type": x["task_type"]} for x in tasks if x["task_status"] == "PENDING"
+    ]
+    history_log["delivered_assignments"] = [
+        {"id": x["id"], "type": x["task_type"]} for x in tasks if x["task_status"] == "DONE"
+    ]
+
+    return history_log
+
+
+def get_task_activities(task: Task, data: dict) -> list[str]:
+    """Get the kind of the activities that a change of a task generates, `data` is its validated data."""
+
+    kinds = []
+
+    if (
+        "opened_at" in data
+        and data["opened_at"] is not None
+        and (task.opened_at is None or data["opened_at"] > task.opened_at)
+    ):
+        kinds.append("read_assignment")
+
+    if "revision_status" in data and data["revision_status"] != task.revision_status:
+        kinds.append("assignment_review_status_updated")
+
+    if "task_status" in data and data["task_status"] != task.task_status:
+        kinds.append("assignment_status_updated")
+
+    return kinds
+
+
+def update_tasks_in_bulk(changes: list[tuple[Task, dict]], author_id: int) -> list[Task]:
+    """
+    Apply the validated changes of many tasks with one `bulk_update`.
+
+    `Task.save` is skipped, so its side effects are aggregated: one activity task for all the changes, one
+    `assignment_status_bulk_updated` and one `revision_status_updated` per student and cohort, and one cache
+    invalidation.
+    """
+
+    import breathecode.activity.tasks as tasks_activity
+    from breathecode.commons.signals import update_cache
+
+    if not changes:
+        return []
+
+    now = timezone.now()
+    fields = {"updated_at"}
+    activities = []
+    status_updated: dict[tuple[int, Optional[int]], list[int]] = {}
+    revision_updated: dict[tuple[int, Optional[int]], Task] = {}
+
+    for task, data in changes:
+        for kind in get_task_activities(task, data):
+            activities.append(
+                {"user_id": author_id, "kind": kind, "related_type": "assignments.Task", "related_id": task.id}
+            )
+
+        previous_task_status = task.task_status
+        previous_revision_status = task.revision_status
+
+        for attr, value in data.items():
+            if Task._meta.get_field(attr).many_to_many:
+                getattr(task, attr).set(value)
+                continue
+
+            setattr(task, attr, value)
+            fields.add(attr)
+
+        task.updated_at = now
+        key = (task.user_id, task.cohort_id)
+
+        if task.task_status != previous_task_status:
+            status_updated.setdefault(key, []).append(task.id)
+
+        if task.revision_status != previous_revision_status:
+            revision_updated.setdefault(key, task)
+
+        task._current_task_status = task.task_status
+        task._current_revision_status = task.revision_status
+
+    items = [task for task, _ in changes]
+    Task.objects.bulk_update(items, sorted(fields), batch_size=TASKS_BATCH_SIZE)
+
+    for (user_id, cohort_id), task_ids in status_updated.items():
+        # the history log belongs to a cohort user, the tasks without cohort do not have one
+        if cohort_id is None:
+            continue
+
+        signals.assignment_status_bulk_updated.send_robust(
+            sender=Task, user_id=user_id, cohort_id=cohort_id, task_ids=task_ids
+        )
+
+    # its receivers only look at the student and the cohort of the task
+    for task in revision_updated.values():
+        signals.revision_status_updated.send_robust(instance=task, sender=Task)
+
+    if activities:
+        tasks_activity.add_activities.delay(activities)
+
+    update_cache.send_robust(sender=Task)
+
+    return items
+
+
+def delete_tasks_in_bulk(task_ids: list[int]) -> None:
+    """
+    Delete many tasks at once.
+
+    A queryset delete emits `post_delete` for each task and each one schedules a cache invalidation, the tasks are
+    not referenced by other models, so they are deleted without signals and the cache is invalidated once.
+    """
+
+    from breathecode.commons.signals import update_cache
+
+    if not task_ids:
+        return
+
+    attachments = Task.attachments.through.objects.filter(task_id__in=task_ids)
+    attachments._raw_delete(attachments.db)
+
+    items = Task.objects.filter(id__in=task_ids)
+    items._raw_delete(items.db)
+
+    update_cache.send_robust(sender=Task)
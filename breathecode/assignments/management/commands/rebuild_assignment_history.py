@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from breathecode.admissions.models import CohortUser
+from breathecode.assignments.actions import build_assignment_history
+from breathecode.assignments.models import Task
+from breathecode.commons.signals import update_cache
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Rebuild the pending and delivered assignments of the history log of the students"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cohorts", type=str, default=None, help="Cohorts slugs to rebuild, comma separated")
+
+    def handle(self, *args, **options):
+        cohort_users = CohortUser.objects.filter(role="STUDENT")
+        if options["cohorts"]:
+            cohort_users = cohort_users.filter(cohort__slug__in=options["cohorts"].split(","))
+
+        cohort_ids = list(cohort_users.values_list("cohort_id", flat=True).distinct())
+        rebuilt = 0
+
+        for cohort_id in cohort_ids:
+            rebuilt += self.rebuild(cohort_users.filter(cohort__id=cohort_id), cohort_id)
+
+        if rebuilt:
+            update_cache.send_robust(sender=CohortUser)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the assignment history of {rebuilt} students"))
+
+    def rebuild(self, cohort_users, cohort_id: int) -> int:
+        # the rows are locked and read again, so the history log written meanwhile by the tasks is not lost
+        with transaction.atomic():
+            batch = list(cohort_users.select_for_update().only("id", "cohort_id", "user_id", "history_log"))
+
+            tasks = {}
+            for task in (
+                Task.objects.filter(cohort__id=cohort_id, task_status__in=["PENDING", "DONE"])
+                .values("id", "user_id", "task_type", "task_status")
+                .order_by("id")
+            ):
+                tasks.setdefault(task["user_id"], []).append(task)
+
+            for cohort_user in batch:
+                cohort_user.history_log = build_assignment_history(
+                    cohort_user.history_log, tasks.get(cohort_user.user_id, [])
+                )
+
+            CohortUser.objects.bulk_update(batch, ["history_log"], batch_size=BATCH_SIZE)
+
+        return len(batch)
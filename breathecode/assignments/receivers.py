@@ -7,7 +7,7 @@ from breathecode.admissions.signals import syllabus_asset_slug_updated
 from breathecode.assignments import tasks
 
 from .models import Task
-from .signals import assignment_status_updated
+from .signals import assignment_status_bulk_updated, assignment_status_updated
 
 logger = logging.getLogger(__name__)
 
@@ -31,3 +31,12 @@ def process_cohort_history_log(sender: Type[Task], instance: Task, **kwargs: Any
     logger.info("Procesing Cohort history log for cohort: " + str(instance.id))
 
     tasks.set_cohort_user_assignments.delay(instance.id)
+
+
+@receiver(assignment_status_bulk_updated, sender=Task)
+def process_cohort_history_log_in_bulk(
+    sender: Type[Task], user_id: int, cohort_id: int, task_ids: list[int], **kwargs: Any
+):
+    logger.info(f"Procesing Cohort history log of {len(task_ids)} tasks for cohort: {cohort_id}")
+
+    tasks.set_cohort_user_assignments_in_bulk.delay(user_id, cohort_id, task_ids)
@@ -10,6 +10,7 @@ from breathecode.authenticate.models import ProfileAcademy, Token
 from breathecode.utils import serpy
 from capyc.rest_framework.exceptions import ValidationException
 
+from .actions import get_task_activities
 from .models import AssignmentTelemetry, FinalProject, Task, UserAttachment
 
 logger = logging.getLogger(__name__)
@@ -267,30 +268,10 @@ class PUTTaskSerializer(serializers.ModelSerializer):
         return data
 
     def update(self, instance, validated_data):
-        if (
-            "opened_at" in validated_data
-            and validated_data["opened_at"] is not None
-            and (instance.opened_at is None or validated_data["opened_at"] > instance.opened_at)
-        ):
-            tasks_activity.add_activity.delay(
-                self.context["request"].user.id,
-                "read_assignment",
-                related_type="assignments.Task",
-                related_id=instance.id,
-            )
-
-        if "revision_status" in validated_data and validated_data["revision_status"] != instance.revision_status:
-            tasks_activity.add_activity.delay(
-                self.context["request"].user.id,
-                "assignment_review_status_updated",
-                related_type="assignments.Task",
-                related_id=instance.id,
-            )
-
-        if "task_status" in validated_data and validated_data["task_status"] != instance.task_status:
+        for kind in get_task_activities(instance, validated_data):
             tasks_activity.add_activity.delay(
                 self.context["request"].user.id,
-                "assignment_status_updated",
+                kind,
                 related_type="assignments.Task",
                 related_id=instance.id,
             )
@@ -6,4 +6,7 @@ emisor = Emisor("breathecode.assignments")
 
 assignment_created = emisor.signal("assignment_created")
 assignment_status_updated = emisor.signal("assignment_status_updated")
+# sent once per student and cohort when many tasks are updated at once, it receives `user_id`, `cohort_id` and
+# `task_ids` instead of an instance
+assignment_status_bulk_updated = emisor.signal("assignment_status_bulk_updated")
 revision_status_updated = emisor.signal("revision_status_updated")
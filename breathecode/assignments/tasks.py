@@ -3,13 +3,20 @@ import os
 import re
 
 from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
 from linked_services.django.service import Service
 
 import breathecode.notify.actions as actions
 from breathecode.services.learnpack import LearnPack
 from breathecode.admissions.models import CohortUser
+from breathecode.commons.signals import update_cache
 from breathecode.assignments.models import LearnPackWebhook
-from breathecode.assignments.actions import NOTIFICATION_STRINGS, task_is_valid_for_notifications
+from breathecode.assignments.actions import (
+    NOTIFICATION_STRINGS,
+    set_assignment_history,
+    task_is_valid_for_notifications,
+)
 from breathecode.utils import TaskPriority
 
 from .models import Task
@@ -118,46 +125,8 @@ def teacher_task_notification(self, task_id):
     )
 
 
-@shared_task(bind=False, priority=TaskPriority.ACADEMY.value)
-def set_cohort_user_assignments(task_id: int):
-    logger.info("Executing set_cohort_user_assignments")
-
-    def serialize_task(task):
-        return {
-            "id": task.id,
-            "type": task.task_type,
-        }
-
-    task = Task.objects.filter(id=task_id).first()
-
-    if not task:
-        logger.error("Task not found")
-        return
-
-    cohort_user = CohortUser.objects.filter(cohort=task.cohort, user=task.user, role="STUDENT").first()
-
-    if not cohort_user:
-        logger.error("CohortUser not found")
-        return
-
-    user_history_log = cohort_user.history_log or {}
-    user_history_log["delivered_assignments"] = user_history_log.get("delivered_assignments", [])
-    user_history_log["pending_assignments"] = user_history_log.get("pending_assignments", [])
-
-    user_history_log["pending_assignments"] = [x for x in user_history_log["pending_assignments"] if x["id"] != task.id]
-
-    user_history_log["delivered_assignments"] = [
-        x for x in user_history_log["delivered_assignments"] if x["id"] != task.id
-    ]
-
-    if task.task_status == "PENDING":
-        user_history_log["pending_assignments"].append(serialize_task(task))
-
-    if task.task_status == "DONE":
-        user_history_log["delivered_assignments"].append(serialize_task(task))
-
-    cohort_user.history_log = user_history_log
-    cohort_user.save()
+def sync_rigobot_repository(task: Task) -> None:
+    """Watch the repository of a delivered task in rigobot, or mark it as inactive if the task is not done."""
 
     s = None
     try:
@@ -189,4 +158,75 @@ def set_cohort_user_assignments(task_id: int):
     except Exception as e:
         logger.error(str(e))
 
+
+@shared_task(bind=False, priority=TaskPriority.ACADEMY.value)
+def set_cohort_user_assignments(task_id: int):
+    logger.info("Executing set_cohort_user_assignments")
+
+    task = Task.objects.filter(id=task_id).first()
+
+    if not task:
+        logger.error("Task not found")
+        return
+
+    # the row is locked to avoid losing the changes of the other tasks of the student that change at the same time
+    with transaction.atomic():
+        cohort_user = (
+            CohortUser.objects.select_for_update()
+            .filter(cohort=task.cohort, user=task.user, role="STUDENT")
+            .only("id", "history_log")
+            .first()
+        )
+
+        if not cohort_user:
+            logger.error("CohortUser not found")
+            return
+
+        history_log = set_assignment_history(cohort_user.history_log, task.id, task.task_type, task.task_status)
+
+        # only the history log is written, the rest of the row could be edited by someone else
+        CohortUser.objects.filter(id=cohort_user.id).update(history_log=history_log, updated_at=timezone.now())
+
+    update_cache.send_robust(sender=CohortUser)
+
+    sync_rigobot_repository(task)
+
+    logger.info("History log saved")
+
+
+@shared_task(bind=False, priority=TaskPriority.ACADEMY.value)
+def set_cohort_user_assignments_in_bulk(user_id: int, cohort_id: int, task_ids: list[int]):
+    """Move many tasks of a student in the history log of a cohort, the row is locked and written once."""
+
+    logger.info("Executing set_cohort_user_assignments_in_bulk")
+
+    items = list(Task.objects.filter(id__in=task_ids, user__id=user_id, cohort__id=cohort_id).select_related("user"))
+
+    if not items:
+        logger.error("Tasks not found")
+        return
+
+    with transaction.atomic():
+        cohort_user = (
+            CohortUser.objects.select_for_update()
+            .filter(cohort__id=cohort_id, user__id=user_id, role="STUDENT")
+            .only("id", "history_log")
+            .first()
+        )
+
+        if not cohort_user:
+            logger.error("CohortUser not found")
+            return
+
+        history_log = cohort_user.history_log
+        for task in items:
+            history_log = set_assignment_history(history_log, task.id, task.task_type, task.task_status)
+
+        CohortUser.objects.filter(id=cohort_user.id).update(history_log=history_log, updated_at=timezone.now())
+
+    update_cache.send_robust(sender=CohortUser)
+
+    for task in items:
+        sync_rigobot_repository(task)
+
     logger.info("History log saved")
@@ -0,0 +1,111 @@
+"""
+Test sync_cohort_tasks
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.assignments.actions import HOST, sync_cohort_tasks
+from breathecode.assignments.models import Task
+from breathecode.commons.signals import update_cache
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+from breathecode.tests.mocks import apply_requests_get_mock
+
+
+def remote_task(slug, type="assignment", status="done", revision_status="approved"):
+    return {
+        "associated_slug": slug,
+        "type": type,
+        "status": status,
+        "revision_status": revision_status,
+        "live_url": None,
+        "github_url": f"https://github.com/4GeeksAcademy/{slug}",
+        "title": slug.capitalize(),
+        "description": "",
+    }
+
+
+@pytest.fixture(autouse=True)
+def setup(db):
+    yield
+
+
+def test_tasks_are_synced_in_bulk(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    endpoints = [
+        (200, f"{HOST}/student/kenny@4geeks.com/task/", {"data": [remote_task("kenny"), remote_task("kyle")]}),
+        (200, f"{HOST}/student/kyle@4geeks.com/task/", {"data": [remote_task("kenny", type="quiz", status="pending")]}),
+    ]
+    monkeypatch.setattr("requests.Session.get", apply_requests_get_mock(endpoints))
+
+    users = [{"email": "kenny@4geeks.com"}, {"email": "kyle@4geeks.com"}, {"email": "stan@4geeks.com"}]
+    cohort_users = [{"user_id": n, "role": "STUDENT", "educational_status": "ACTIVE"} for n in range(1, 4)]
+    model = bc.database.create(
+        user=users, cohort=1, cohort_user=cohort_users, task={"user_id": 1, "associated_slug": "kenny"}
+    )
+
+    summary = sync_cohort_tasks(model.cohort)
+
+    assert summary == {
+        "students": 3,
+        "synced_students": 2,
+        "failed_students": ["stan@4geeks.com"],
+        "created": 2,
+        "existing": 1,
+    }
+
+    tasks = bc.database.list_of("assignments.Task")
+    assert [(x["user_id"], x["associated_slug"], x["task_type"], x["task_status"]) for x in tasks] == [
+        (1, "kenny", model.task.task_type, model.task.task_status),
+        (1, "kyle", "PROJECT", "DONE"),
+        (2, "kenny", "QUIZ", "PENDING"),
+    ]
+    assert [x["cohort_id"] for x in tasks[1:]] == [1, 1]
+
+
+def test_invalid_remote_task(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    endpoints = [
+        (200, f"{HOST}/student/kenny@4geeks.com/task/", {"data": [remote_task("kenny"), remote_task("kyle", "x")]}),
+    ]
+    monkeypatch.setattr("requests.Session.get", apply_requests_get_mock(endpoints))
+
+    model = bc.database.create(
+        user={"email": "kenny@4geeks.com"},
+        cohort=1,
+        cohort_user={"role": "STUDENT", "educational_status": "ACTIVE"},
+    )
+
+    summary = sync_cohort_tasks(model.cohort)
+
+    # nothing is saved for a student with an invalid task
+    assert summary["failed_students"] == ["kenny@4geeks.com"]
+    assert summary["created"] == 0
+    assert bc.database.list_of("assignments.Task") == []
+
+
+def test_task_with_invalid_fields(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    endpoints = [
+        (200, f"{HOST}/student/kenny@4geeks.com/task/", {"data": [remote_task("kenny")]}),
+        (200, f"{HOST}/student/kyle@4geeks.com/task/", {"data": [{**remote_task("kyle"), "title": "x" * 151}]}),
+    ]
+    monkeypatch.setattr("requests.Session.get", apply_requests_get_mock(endpoints))
+
+    users = [{"email": "kenny@4geeks.com"}, {"email": "kyle@4geeks.com"}]
+    cohort_users = [{"user_id": n, "role": "STUDENT", "educational_status": "ACTIVE"} for n in range(1, 3)]
+    model = bc.database.create(user=users, cohort=1, cohort_user=cohort_users)
+
+    monkeypatch.setattr("breathecode.commons.signals.update_cache.send_robust", MagicMock())
+
+    summary = sync_cohort_tasks(model.cohort)
+
+    assert summary == {
+        "students": 2,
+        "synced_students": 1,
+        "failed_students": ["kyle@4geeks.com"],
+        "created": 1,
+        "existing": 0,
+    }
+
+    tasks = bc.database.list_of("assignments.Task")
+    assert [(x["user_id"], x["associated_slug"]) for x in tasks] == [(1, "kenny")]
+    assert update_cache.send_robust.call_args_list == [call(sender=Task)]
@@ -0,0 +1,54 @@
+"""
+Test rebuild_assignment_history
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.admissions.models import CohortUser
+from breathecode.assignments.management.commands.rebuild_assignment_history import Command
+from breathecode.commons.signals import update_cache
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    empty = lambda *args, **kwargs: None
+
+    monkeypatch.setattr("breathecode.assignments.signals.assignment_created.send_robust", empty)
+    monkeypatch.setattr("breathecode.assignments.signals.assignment_status_updated.send_robust", empty)
+    monkeypatch.setattr("breathecode.activity.tasks.get_attendancy_log.delay", empty)
+    monkeypatch.setattr("breathecode.admissions.signals.student_edu_status_updated.send_robust", empty)
+    monkeypatch.setattr("breathecode.assignments.tasks.set_cohort_user_assignments.delay", MagicMock())
+
+    yield
+
+
+def test_rebuild(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    tasks = [
+        {"user_id": 1, "task_status": "PENDING", "task_type": "PROJECT"},
+        {"user_id": 1, "task_status": "DONE", "task_type": "EXERCISE"},
+        {"user_id": 2, "task_status": "DONE", "task_type": "PROJECT"},
+    ]
+    cohort_users = [
+        {"user_id": 1, "role": "STUDENT", "history_log": {"attendance": {}, "pending_assignments": [{"id": 9}]}},
+        {"user_id": 2, "role": "STUDENT", "history_log": None},
+        {"user_id": 3, "role": "TEACHER", "history_log": None},
+    ]
+    bc.database.create(user=3, cohort=1, cohort_user=cohort_users, task=tasks)
+    monkeypatch.setattr("breathecode.commons.signals.update_cache.send_robust", MagicMock())
+
+    command = Command()
+    command.handle(cohorts=None)
+
+    assert [x["history_log"] for x in bc.database.list_of("admissions.CohortUser")] == [
+        {
+            "attendance": {},
+            "pending_assignments": [{"id": 1, "type": "PROJECT"}],
+            "delivered_assignments": [{"id": 2, "type": "EXERCISE"}],
+        },
+        {"pending_assignments": [], "delivered_assignments": [{"id": 3, "type": "PROJECT"}]},
+        None,
+    ]
+    assert update_cache.send_robust.call_args_list == [call(sender=CohortUser)]
@@ -0,0 +1,74 @@
+"""
+Test set_cohort_user_assignments_in_bulk
+"""
+
+from logging import Logger
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.admissions.models import CohortUser
+from breathecode.commons.signals import update_cache
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+from ...tasks import set_cohort_user_assignments_in_bulk
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    empty = lambda *args, **kwargs: None
+
+    monkeypatch.setattr("logging.Logger.info", MagicMock())
+    monkeypatch.setattr("logging.Logger.error", MagicMock())
+
+    monkeypatch.setattr("breathecode.assignments.signals.assignment_created.send_robust", empty)
+    monkeypatch.setattr("breathecode.activity.tasks.get_attendancy_log.delay", empty)
+    monkeypatch.setattr("breathecode.admissions.signals.student_edu_status_updated.send_robust", empty)
+    monkeypatch.setattr("breathecode.commons.signals.update_cache.send_robust", MagicMock())
+
+    yield
+
+
+def test_without_tasks(bc: Breathecode):
+    set_cohort_user_assignments_in_bulk.delay(1, 1, [1, 2])
+
+    assert bc.database.list_of("admissions.CohortUser") == []
+    assert Logger.error.call_args_list == [call("Tasks not found")]
+
+
+def test_without_cohort_user(bc: Breathecode):
+    bc.database.create(task=2, cohort=1)
+    Logger.info.call_args_list = []
+
+    set_cohort_user_assignments_in_bulk.delay(1, 1, [1, 2])
+
+    assert bc.database.list_of("admissions.CohortUser") == []
+    assert Logger.error.call_args_list == [call("CohortUser not found")]
+
+
+def test_history_log_is_written_once(bc: Breathecode):
+    tasks = [
+        {"task_status": "PENDING", "task_type": "LESSON"},
+        {"task_status": "DONE", "task_type": "PROJECT"},
+        {"task_status": "DONE", "task_type": "QUIZ"},
+    ]
+    history_log = {"pending_assignments": [{"id": 2, "type": "PROJECT"}], "delivered_assignments": []}
+    bc.database.create(task=tasks, cohort_user={"history_log": history_log})
+    Logger.info.call_args_list = []
+    update_cache.send_robust.call_args_list = []
+
+    set_cohort_user_assignments_in_bulk.delay(1, 1, [1, 2])
+
+    cohort_users = bc.database.list_of("admissions.CohortUser")
+    assert [x["history_log"] for x in cohort_users] == [
+        {
+            "pending_assignments": [{"id": 1, "type": "LESSON"}],
+            "delivered_assignments": [{"id": 2, "type": "PROJECT"}],
+        },
+    ]
+    assert Logger.info.call_args_list == [
+        call("Executing set_cohort_user_assignments_in_bulk"),
+        call("History log saved"),
+    ]
+    assert Logger.error.call_args_list == []
+    assert update_cache.send_robust.call_args_list == [call(sender=CohortUser)]
@@ -134,6 +134,7 @@ def put_serializer(self, task, data={}):
 @pytest.fixture(autouse=True)
 def setup(db, monkeypatch):
     monkeypatch.setattr(activity_tasks.add_activity, "delay", MagicMock())
+    monkeypatch.setattr(activity_tasks.add_activities, "delay", MagicMock())
     yield
 
 
@@ -564,14 +565,19 @@ class MediaTestSuite(AssignmentsTestCase):
             self.bc.database.list_of("assignments.Task"),
             [{**self.bc.format.to_dict(model.task[x]), **data[x]} for x in range(0, 2)],
         )
-        self.bc.check.calls(
-            activity_tasks.add_activity.delay.call_args_list,
-            [
-                call(model.user.id, "assignment_status_updated", related_type="assignments.Task", related_id=x.id)
-                for x in model.task
-                if data[x.id - 1]["task_status"] != x.task_status
-            ],
-        )
+        self.bc.check.calls(activity_tasks.add_activity.delay.call_args_list, [])
+
+        activities = [
+            {
+                "user_id": model.user.id,
+                "kind": "assignment_status_updated",
+                "related_type": "assignments.Task",
+                "related_id": x.id,
+            }
+            for x in model.task
+            if data[x.id - 1]["task_status"] != x.task_status
+        ]
+        self.bc.check.calls(activity_tasks.add_activities.delay.call_args_list, [call(activities)] if activities else [])
 
     """
     🔽🔽🔽 Put with Task, one item in body, passing revision_status
@@ -684,14 +690,19 @@ class MediaTestSuite(AssignmentsTestCase):
             self.assertEqual(tasks.student_task_notification.delay.call_args_list, [call(index + 1)])
             self.assertEqual(tasks.teacher_task_notification.delay.call_args_list, [])
 
+            self.bc.check.calls(activity_tasks.add_activity.delay.call_args_list, [])
             self.bc.check.calls(
-                activity_tasks.add_activity.delay.call_args_list,
+                activity_tasks.add_activities.delay.call_args_list,
                 [
                     call(
-                        model.user[1].id,
-                        "assignment_review_status_updated",
-                        related_type="assignments.Task",
-                        related_id=model.task.id,
+                        [
+                            {
+                                "user_id": model.user[1].id,
+                                "kind": "assignment_review_status_updated",
+                                "related_type": "assignments.Task",
+                                "related_id": model.task.id,
+                            },
+                        ]
                     ),
                 ],
             )
@@ -699,7 +710,7 @@ class MediaTestSuite(AssignmentsTestCase):
             # teardown
             self.bc.database.delete("assignments.Task")
             tasks.student_task_notification.delay.call_args_list = []
-            activity_tasks.add_activity.delay.call_args_list = []
+            activity_tasks.add_activities.delay.call_args_list = []
 
     @patch.object(APIViewExtensionHandlers, "_spy_extension_arguments", MagicMock())
     @patch.object(APIViewExtensionHandlers, "_spy_extensions", MagicMock())
@@ -795,3 +806,41 @@ def test_post__created(
     assert database.list_of("assignments.Task") == [
         db_item(data),
     ]
+
+
+def test_put__in_bulk__one_history_update_per_cohort(
+    client: capy.Client, database: capy.Database, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(tasks.set_cohort_user_assignments, "delay", MagicMock())
+    monkeypatch.setattr(tasks.set_cohort_user_assignments_in_bulk, "delay", MagicMock())
+    url = reverse_lazy("assignments:user_me_task")
+
+    task_list = [{"cohort_id": 1 if n < 3 else 2, "task_status": "PENDING"} for n in range(4)]
+    model = database.create(user=1, cohort=2, task=task_list, city=1, country=1)
+    client.force_authenticate(model.user)
+
+    data = [{"id": n, "task_status": "DONE"} for n in range(1, 5)]
+    response = client.put(url, data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [x["task_status"] for x in response.json()] == ["DONE"] * 4
+    assert [x["task_status"] for x in database.list_of("assignments.Task")] == ["DONE"] * 4
+
+    assert tasks.set_cohort_user_assignments.delay.call_args_list == []
+    assert tasks.set_cohort_user_assignments_in_bulk.delay.call_args_list == [
+        call(1, 1, [1, 2, 3]),
+        call(1, 2, [4]),
+    ]
+    assert activity_tasks.add_activities.delay.call_args_list == [
+        call(
+            [
+                {
+                    "user_id": 1,
+                    "kind": "assignment_status_updated",
+                    "related_type": "assignments.Task",
+                    "related_id": n,
+                }
+                for n in range(1, 5)
+            ]
+        ),
+    ]
@@ -31,7 +31,7 @@ from breathecode.utils.i18n import translation
 from breathecode.utils.multi_status_response import MultiStatusResponse
 from capyc.rest_framework.exceptions import ValidationException
 
-from .actions import deliver_task, sync_cohort_tasks
+from .actions import delete_tasks_in_bulk, deliver_task, sync_cohort_tasks, update_tasks_in_bulk
 from .caches import TaskCache
 from .forms import DeliverAssigntmentForm
 from .models import FinalProject, Task, UserAttachment
@@ -151,12 +151,11 @@ def sync_cohort_tasks_view(request, cohort_id=None):
     if item is None:
         raise ValidationException("Cohort not found")
 
-    syncronized = sync_cohort_tasks(item)
-    if len(syncronized) == 0:
+    summary = sync_cohort_tasks(item)
+    if summary["created"] + summary["existing"] == 0:
         raise ValidationException("No tasks updated")
 
-    serializer = TaskGETSerializer(syncronized, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return Response(summary, status=status.HTTP_200_OK)
 
 
 class AssignmentTelemetryView(APIView, GenerateLookupsMixin):
@@ -733,17 +732,34 @@ class TaskMeView(APIView):
             for item in request.data:
                 if "id" not in item:
                     item["id"] = None
-                code, data = update(request, item, item["id"], only_validate=True)
-                if code != status.HTTP_200_OK:
-                    return Response(data, status=code)
 
-            updated_tasks = []
+            # all the tasks are read at once, then every item is validated before saving any of them
+            ids = [item["id"] for item in request.data if item["id"] is not None]
+            items = Task.objects.filter(id__in=ids).select_related("user").prefetch_related("attachments")
+            items = {str(x.id): x for x in items}
+
+            serializers = []
             for item in request.data:
-                code, data = update(request, item, item["id"], only_validate=False)
-                if code == status.HTTP_200_OK:
-                    updated_tasks.append(data)
+                if item["id"] is None:
+                    raise ValidationException("Missing task id to update", slug="missing=task-id")
+
+                task = items.get(str(item["id"]))
+                if task is None:
+                    raise ValidationException("Task not found", slug="task-not-found", code=404)
+
+                serializer = PUTTaskSerializer(task, data=item, context={"request": request})
+                if not serializer.is_valid():
+                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+                serializers.append(serializer)
+
+            update_tasks_in_bulk([(x.instance, x.validated_data) for x in serializers], request.user.id)
+
+            for serializer in serializers:
+                if request.user.id != serializer.instance.user.id:
+                    tasks.student_task_notification.delay(serializer.instance.id)
 
-            return Response(updated_tasks, status=status.HTTP_200_OK)
+            return Response([x.data for x in serializers], status=status.HTTP_200_OK)
 
     def post(self, request, user_id=None):
 
@@ -816,10 +832,10 @@ class TaskMeView(APIView):
 
             if do_not_belong or ids_to_delete:
                 response = response_207(responses, "associated_slug")
-                belong.delete()
+                delete_tasks_in_bulk([x.id for x in belong])
                 return response
 
-            belong.delete()
+            delete_tasks_in_bulk([x.id for x in belong])
 
         return Response(None, status=status.HTTP_204_NO_CONTENT)
 
@@ -11,18 +11,22 @@ from urllib.parse import urlencode
 
 import requests
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count
 from django.utils import timezone
 
-from breathecode.admissions.models import FULLY_PAID, UP_TO_DATE, CohortUser, SyllabusVersion
+from breathecode.admissions.models import FULLY_PAID, UP_TO_DATE, Cohort, CohortUser, SyllabusVersion
 from breathecode.assignments.models import Task
 from capyc.rest_framework.exceptions import ValidationException
 
 from ..services.google_cloud import Storage
+from . import tasks
 from .models import ERROR, PERSISTED, LayoutDesign, Specialty, UserSpecialty
 
 logger = logging.getLogger(__name__)
 ENVIRONMENT = os.getenv("ENV", None)
 BUCKET_NAME = "certificates-breathecode"
+SYLLABUS_ASSETS_CACHE_TIMEOUT = 60 * 60 * 24
 
 strings = {
     "es": {
@@ -58,84 +62,161 @@ def syllabus_weeks_to_days(json):
     return json
 
 
-def get_assets_from_syllabus(
-    syllabus_version: SyllabusVersion | int, task_types: Optional[list[str]] = None, only_mandatory=False
-):
-    if not isinstance(syllabus_version, SyllabusVersion):
-        syllabus = SyllabusVersion.objects.filter(id=syllabus_version).first()
+SYLLABUS_ASSET_TYPES = {
+    "QUIZ": "quizzes",
+    "LESSON": "lessons",
+    "EXERCISE": "replits",
+    "PROJECT": "assignments",
+}
 
-    else:
-        syllabus = syllabus_version
 
-    key_map = {
-        "QUIZ": "quizzes",
-        "LESSON": "lessons",
-        "EXERCISE": "replits",
-        "PROJECT": "assignments",
-    }
+def syllabus_assets_cache_key(syllabus_version_id: int) -> str:
+    return f"certificate:syllabus-version:{syllabus_version_id}:assets"
 
-    if task_types is None:
-        task_types = key_map.keys()
 
-    findings = []
+def build_syllabus_asset_index(syllabus: SyllabusVersion) -> list[tuple[str, str, bool]]:
+    """Get the (asset slug, task type, mandatory) of every asset of a syllabus version, in syllabus order."""
 
-    if isinstance(syllabus.json, str):
-        syllabus.json = json.loads(syllabus.json)
+    content = syllabus.json
+    if isinstance(content, str):
+        content = json.loads(content)
 
-    syllabus.json = syllabus_weeks_to_days(syllabus.json)
+    content = syllabus_weeks_to_days({**content})
 
-    for day in syllabus.json["days"]:
-        for atype in key_map:
-            if key_map[atype] not in day:
-                continue
+    index = []
+    for day in content["days"]:
+        for atype, key in SYLLABUS_ASSET_TYPES.items():
+            for asset in day.get(key, []):
+                index.append((asset["slug"], atype, asset.get("mandatory", True) == True))
 
-            if atype not in task_types:
-                continue
+    return index
 
-            for asset in day[key_map[atype]]:
-                if (only_mandatory and asset.get("mandatory", True) == True) or only_mandatory is False:
-                    findings.append(asset["slug"])
 
-    return findings
+def get_syllabus_asset_index(syllabus_version: SyllabusVersion | int) -> list[tuple[str, str, bool]]:
+    """Get the asset index of a syllabus version, it is rebuilt when the json of the syllabus version changes."""
 
+    syllabus_version_id = syllabus_version.id if isinstance(syllabus_version, SyllabusVersion) else syllabus_version
+    key = syllabus_assets_cache_key(syllabus_version_id)
+
+    index = cache.get(key)
+    if index is not None:
+        return index
+
+    if not isinstance(syllabus_version, SyllabusVersion):
+        syllabus_version = SyllabusVersion.objects.filter(id=syllabus_version).first()
+
+    index = build_syllabus_asset_index(syllabus_version)
+    cache.set(key, index, SYLLABUS_ASSETS_CACHE_TIMEOUT)
+
+    return index
 
-def how_many_pending_tasks(
-    syllabus_version: SyllabusVersion | int, user: User | int, task_types: list[str], only_mandatory: bool
-) -> int:
+
+def get_assets_from_syllabus(
+    syllabus_version: SyllabusVersion | int, task_types: Optional[list[str]] = None, only_mandatory=False
+):
+    if task_types is None:
+        task_types = SYLLABUS_ASSET_TYPES.keys()
+
+    return [
+        slug
+        for slug, task_type, mandatory in get_syllabus_asset_index(syllabus_version)
+        if task_type in task_types and (mandatory or only_mandatory is False)
+    ]
+
+
+def how_many_pending_tasks_by_user(
+    syllabus_version: SyllabusVersion | int,
+    users: list[User | int],
+    task_types: list[str],
+    only_mandatory: bool,
+) -> dict[int, int]:
+    """Get the pending tasks of many users with one grouped query, it returns a dict of user id to pending tasks."""
 
     extra = {}
     if (n_task_types := len(task_types)) == 1:
-
         extra["task_type"] = task_types[0]
 
     elif n_task_types > 1:
         extra["task_type__in"] = task_types
 
-    if not isinstance(user, User):
-        extra["user__id"] = user.id
+    user_ids = [x.id if isinstance(x, User) else x for x in users]
+    slugs = get_assets_from_syllabus(syllabus_version, task_types=task_types, only_mandatory=only_mandatory)
 
-    else:
-        extra["user"] = user
+    approved_tasks = {
+        x["user"]: x["approved"]
+        for x in Task.objects.filter(
+            user__id__in=user_ids, associated_slug__in=slugs, revision_status__in=["APPROVED", "IGNORED"], **extra
+        )
+        .values("user")
+        .annotate(approved=Count("id"))
+        .order_by()
+    }
 
-    slugs = get_assets_from_syllabus(syllabus_version, task_types=task_types, only_mandatory=only_mandatory)
-    how_many_approved_tasks = Task.objects.filter(
-        associated_slug__in=slugs, revision_status__in=["APPROVED", "IGNORED"], **extra
-    ).count()
-
-    how_many_pending_tasks = (
-        Task.objects.filter(associated_slug__in=slugs, **extra)
-        .exclude(revision_status__in=["APPROVED", "IGNORED"])
-        .count()
+    # every syllabus asset without an approved task is pending, whether the task exists or not
+    how_many_slugs = len(slugs)
+    return {user_id: how_many_slugs - approved_tasks.get(user_id, 0) for user_id in user_ids}
+
+
+def how_many_pending_tasks(
+    syllabus_version: SyllabusVersion | int, user: User | int, task_types: list[str], only_mandatory: bool
+) -> int:
+
+    user_id = user.id if isinstance(user, User) else user
+    pending_tasks = how_many_pending_tasks_by_user(
+        syllabus_version, [user_id], task_types=task_types, only_mandatory=only_mandatory
     )
 
-    how_many_tasks = how_many_approved_tasks + how_many_pending_tasks
-    if (how_many_slugs := len(slugs)) != how_many_tasks:
-        how_many_pending_tasks = how_many_slugs - how_many_approved_tasks
+    return pending_tasks[user_id]
+
+
+def get_certificate_layout(slug: Optional[str], academy) -> LayoutDesign:
+    layout = LayoutDesign.objects.filter(slug=slug).first()
+
+    if layout is None:
+        layout = LayoutDesign.objects.filter(is_default=True, academy=academy).first()
 
-    return how_many_pending_tasks
+    if layout is None:
+        layout = LayoutDesign.objects.filter(slug="default").first()
+
+    if layout is None:
+        raise ValidationException(
+            "No layout was specified and there is no default layout for this academy", slug="no-default-layout"
+        )
 
+    return layout
 
-def generate_certificate(user, cohort=None, layout=None):
+
+def validate_certificate_requirements(cohort: Cohort, cohort_user: CohortUser, pending_tasks: int) -> None:
+    """Check the rules that a student must meet to get the certificate of a cohort."""
+
+    if pending_tasks and pending_tasks > 0:
+        raise ValidationException(
+            f"The student has {pending_tasks} pending tasks", slug=f"with-pending-tasks-{pending_tasks}"
+        )
+
+    if not (cohort_user.finantial_status == FULLY_PAID or cohort_user.finantial_status == UP_TO_DATE):
+        message = "The student must have finantial status FULLY_PAID or UP_TO_DATE"
+        raise ValidationException(message, slug="bad-finantial-status")
+
+    if cohort_user.educational_status != "GRADUATED":
+        raise ValidationException(
+            "The student must have educational " "status GRADUATED", slug="bad-educational-status"
+        )
+
+    if not cohort.never_ends and cohort.current_day != cohort.syllabus_version.syllabus.duration_in_days:
+        raise ValidationException(
+            "Cohort current day should be " f"{cohort.syllabus_version.syllabus.duration_in_days}",
+            slug="cohort-not-finished",
+        )
+
+    if not cohort.never_ends and cohort.stage != "ENDED":
+        raise ValidationException(
+            "The student cohort stage has to be 'ENDED' before you can issue any certificates",
+            slug="cohort-without-status-ended",
+        )
+
+
+def generate_certificate(user, cohort=None, layout=None, pending_tasks=None):
     query = {"user__id": user.id}
 
     if cohort:
@@ -178,20 +259,7 @@ def generate_certificate(user, cohort=None, layout=None):
         if specialty.expiration_day_delta is not None:
             uspe.expires_at = utc_now + timezone.timedelta(days=specialty.expiration_day_delta)
 
-    layout = LayoutDesign.objects.filter(slug=layout).first()
-
-    if layout is None:
-        layout = LayoutDesign.objects.filter(is_default=True, academy=cohort.academy).first()
-
-    if layout is None:
-        layout = LayoutDesign.objects.filter(slug="default").first()
-
-    if layout is None:
-        raise ValidationException(
-            "No layout was specified and there is no default layout for this academy", slug="no-default-layout"
-        )
-
-    uspe.layout = layout
+    uspe.layout = get_certificate_layout(layout, cohort.academy)
 
     # validate for teacher
     main_teacher = CohortUser.objects.filter(cohort__id=cohort.id, role="TEACHER").first()
@@ -205,35 +273,12 @@ def generate_certificate(user, cohort=None, layout=None):
 
     try:
         uspe.academy = cohort.academy
-        pending_tasks = how_many_pending_tasks(
-            cohort.syllabus_version, user, task_types=["PROJECT"], only_mandatory=True
-        )
-
-        if pending_tasks and pending_tasks > 0:
-            raise ValidationException(
-                f"The student has {pending_tasks} pending tasks", slug=f"with-pending-tasks-{pending_tasks}"
+        if pending_tasks is None:
+            pending_tasks = how_many_pending_tasks(
+                cohort.syllabus_version, user, task_types=["PROJECT"], only_mandatory=True
             )
 
-        if not (cohort_user.finantial_status == FULLY_PAID or cohort_user.finantial_status == UP_TO_DATE):
-            message = "The student must have finantial status FULLY_PAID or UP_TO_DATE"
-            raise ValidationException(message, slug="bad-finantial-status")
-
-        if cohort_user.educational_status != "GRADUATED":
-            raise ValidationException(
-                "The student must have educational " "status GRADUATED", slug="bad-educational-status"
-            )
-
-        if not cohort.never_ends and cohort.current_day != cohort.syllabus_version.syllabus.duration_in_days:
-            raise ValidationException(
-                "Cohort current day should be " f"{cohort.syllabus_version.syllabus.duration_in_days}",
-                slug="cohort-not-finished",
-            )
-
-        if not cohort.never_ends and cohort.stage != "ENDED":
-            raise ValidationException(
-                "The student cohort stage has to be 'ENDED' before you can issue any certificates",
-                slug="cohort-without-status-ended",
-            )
+        validate_certificate_requirements(cohort, cohort_user, pending_tasks)
 
         if not uspe.issued_at:
             uspe.issued_at = timezone.now()
@@ -251,6 +296,129 @@ def generate_certificate(user, cohort=None, layout=None):
     return uspe
 
 
+def generate_cohort_certificates(cohort: Cohort, layout: Optional[str] = None) -> list[UserSpecialty]:
+    """
+    Generate the certificates of every student of a cohort in one pass.
+
+    It applies the same rules than `generate_certificate`, but the cohort context is loaded once, the pending
+    tasks come from one grouped query and the certificates are written with `bulk_create` and `bulk_update`.
+    Students that already have a persisted certificate with preview are skipped.
+    """
+
+    if cohort.syllabus_version is None:
+        raise ValidationException(
+            f"The cohort has no syllabus assigned, please set a syllabus for cohort: {cohort.name}",
+            slug="missing-syllabus-version",
+        )
+
+    specialty = Specialty.objects.filter(syllabus__id=cohort.syllabus_version.syllabus_id).first()
+    if not specialty:
+        raise ValidationException("Specialty has no Syllabus assigned", slug="missing-specialty")
+
+    layout = get_certificate_layout(layout, cohort.academy)
+
+    main_teacher = CohortUser.objects.filter(cohort__id=cohort.id, role="TEACHER").select_related("user").first()
+    if main_teacher is None or main_teacher.user is None:
+        raise ValidationException(
+            "This cohort does not have a main teacher, please assign it first", slug="without-main-teacher"
+        )
+
+    main_teacher = main_teacher.user
+    signed_by = main_teacher.first_name + " " + main_teacher.last_name
+
+    cohort_users = list(
+        CohortUser.objects.filter(cohort__id=cohort.id, role="STUDENT")
+        .exclude(cohort__stage="DELETED")
+        .select_related("user")
+    )
+    if not cohort_users:
+        return []
+
+    certificates = {x.user_id: x for x in UserSpecialty.objects.filter(cohort__id=cohort.id)}
+    pending_tasks = how_many_pending_tasks_by_user(
+        cohort.syllabus_version, [x.user_id for x in cohort_users], task_types=["PROJECT"], only_mandatory=True
+    )
+
+    utc_now = timezone.now()
+    to_create = []
+    to_update = []
+
+    for cohort_user in cohort_users:
+        user = cohort_user.user
+        uspe = certificates.get(user.id)
+
+        if uspe is not None and uspe.status == PERSISTED and uspe.preview_url:
+            logger.info(f"User {user.id} already has a certificate created for cohort {cohort.id}")
+            continue
+
+        if uspe is None:
+            uspe = UserSpecialty(
+                user=user,
+                cohort=cohort,
+                token=hashlib.sha1((str(user.id) + str(utc_now)).encode("UTF-8")).hexdigest(),
+                specialty=specialty,
+                signed_by_role=strings[cohort.language.lower()]["Main Instructor"],
+            )
+            to_create.append(uspe)
+
+        else:
+            to_update.append(uspe)
+
+        uspe.layout = layout
+        uspe.signed_by = signed_by
+        uspe.academy = cohort.academy
+
+        if specialty.expiration_day_delta is not None:
+            uspe.expires_at = utc_now + timezone.timedelta(days=specialty.expiration_day_delta)
+
+        error = None
+        try:
+            validate_certificate_requirements(cohort, cohort_user, pending_tasks[user.id])
+
+        except ValidationException as e:
+            error = str(e)
+
+        if error:
+            uspe.status = ERROR
+            uspe.status_text = error
+
+        else:
+            if not uspe.issued_at:
+                uspe.issued_at = utc_now
+
+            uspe.status = PERSISTED
+            uspe.status_text = "Certificate successfully queued for PDF generation"
+
+        # the same bookkeeping than UserSpecialty.save, that is skipped by the bulk operations
+        hash = uspe.generate_update_hash()
+        uspe._hash_was_updated = uspe.update_hash != hash
+        uspe.update_hash = hash
+        uspe.updated_at = utc_now
+
+    UserSpecialty.objects.bulk_create(to_create)
+    UserSpecialty.objects.bulk_update(
+        to_update,
+        [
+            "layout",
+            "signed_by",
+            "academy",
+            "expires_at",
+            "issued_at",
+            "status",
+            "status_text",
+            "update_hash",
+            "updated_at",
+        ],
+    )
+
+    result = to_create + to_update
+    screenshots = [x.id for x in result if x._hash_was_updated and x.status == PERSISTED]
+    if screenshots:
+        tasks.take_screenshots.delay(screenshots)
+
+    return result
+
+
 def certificate_screenshot(certificate_id: int):
 
     certificate = UserSpecialty.objects.get(id=certificate_id)
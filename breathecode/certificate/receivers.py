@@ -1,11 +1,13 @@
 import logging
 
+from django.core.cache import cache
 from django.dispatch import receiver
 
 import breathecode.certificate.tasks as tasks
-from breathecode.admissions.models import CohortUser
-from breathecode.admissions.signals import student_edu_status_updated
+from breathecode.admissions.models import CohortUser, SyllabusVersion
+from breathecode.admissions.signals import student_edu_status_updated, syllabus_version_json_updated
 
+from .actions import syllabus_assets_cache_key
 from .models import UserSpecialty
 from .signals import user_specialty_saved
 
@@ -25,3 +27,8 @@ def post_save_user_specialty(sender, instance: UserSpecialty, **kwargs):
 def generate_certificate(sender, instance: CohortUser, **kwargs):
     if instance.cohort.available_as_saas and instance.educational_status == "GRADUATED":
         tasks.async_generate_certificate.delay(instance.cohort.id, instance.user.id)
+
+
+@receiver(syllabus_version_json_updated, sender=SyllabusVersion)
+def clear_syllabus_asset_index(sender, instance: SyllabusVersion, **kwargs):
+    cache.delete(syllabus_assets_cache_key(instance.id))
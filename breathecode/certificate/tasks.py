@@ -1,10 +1,11 @@
 from task_manager.core.exceptions import AbortTask, RetryTask
 from task_manager.django.decorators import task
 
-from breathecode.admissions.models import CohortUser
+from breathecode.admissions.models import Cohort, CohortUser
 from breathecode.certificate.models import UserSpecialty
 from breathecode.utils import getLogger
 from breathecode.utils.decorators import TaskPriority
+from capyc.rest_framework.exceptions import ValidationException
 
 # Get an instance of a logger
 logger = getLogger(__name__)
@@ -45,19 +46,38 @@ def reset_screenshot(self, certificate_id, **_):
     certificate_screenshot(certificate_id)
 
 
+@task(bind=True, priority=TaskPriority.CERTIFICATE.value)
+def take_screenshots(self, certificate_ids, **_):
+    logger.debug("Starting take_screenshots")
+    # unittest.mock.patch is poor applying mocks
+    from .actions import certificate_screenshot, remove_certificate_screenshot
+
+    for certificate in UserSpecialty.objects.filter(id__in=certificate_ids).only("id", "preview_url"):
+        try:
+            if certificate.preview_url:
+                remove_certificate_screenshot(certificate.id)
+
+            certificate_screenshot(certificate.id)
+
+        except Exception:
+            logger.exception(f"Error taking the screenshot of the certificate {certificate.id}")
+
+
 @task(bind=True, priority=TaskPriority.CERTIFICATE.value)
 def generate_cohort_certificates(self, cohort_id, **_):
     logger.debug("Starting generate_cohort_certificates")
-    from .actions import generate_certificate
+    from .actions import generate_cohort_certificates
 
-    cohort_users = CohortUser.objects.filter(cohort__id=cohort_id, role="STUDENT")
+    cohort = Cohort.objects.filter(id=cohort_id).select_related("academy", "syllabus_version__syllabus").first()
+    if cohort is None:
+        raise AbortTask(f"Cohort {cohort_id} not found")
 
-    logger.debug(f"Generating certificate for {str(cohort_users.count())} students that GRADUATED")
-    for cu in cohort_users:
-        try:
-            generate_certificate(cu.user, cu.cohort)
-        except Exception:
-            logger.exception(f"Error generating certificate for {str(cu.user.id)} cohort {str(cu.cohort.id)}")
+    try:
+        certificates = generate_cohort_certificates(cohort)
+    except ValidationException as e:
+        raise AbortTask(f"Error generating the certificates of cohort {cohort_id}: {e}")
+
+    logger.debug(f"Generated {len(certificates)} certificates for cohort {cohort_id}")
 
 
 @task(bind=True, priority=TaskPriority.CERTIFICATE.value)
@@ -490,6 +490,49 @@ class TestActionGenerateCertificate(LegacyAPITestCase):
             ],
         )
 
+    """
+    🔽🔽🔽 Student with precomputed pending tasks
+    """
+
+    @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
+    @patch(GOOGLE_CLOUD_PATH["bucket"], apply_google_cloud_bucket_mock())
+    @patch(GOOGLE_CLOUD_PATH["blob"], apply_google_cloud_blob_mock())
+    @patch("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
+    @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    def test_generate_certificate__with_precomputed_pending_tasks(self):
+        cohort_kwargs = {"stage": "ENDED"}
+        cohort_user_kwargs = {"finantial_status": "UP_TO_DATE"}
+        model = self.generate_models(
+            user=True,
+            cohort=True,
+            cohort_user=True,
+            cohort_kwargs=cohort_kwargs,
+            cohort_user_kwargs=cohort_user_kwargs,
+            syllabus_version={
+                "id": 1,
+                "json": {"days": [{"assignments": [{"slug": "testing-slug", "mandatory": True}]}]},
+            },
+            syllabus=True,
+            syllabus_schedule=True,
+            specialty=True,
+            layout_design=True,
+        )
+
+        base = model.copy()
+        del base["user"]
+        del base["cohort_user"]
+
+        cohort_user_kwargs = {"role": "TEACHER"}
+        self.generate_models(user=True, cohort_user=True, cohort_user_kwargs=cohort_user_kwargs, models=base)
+
+        with patch("breathecode.certificate.actions.how_many_pending_tasks", MagicMock()) as how_many_pending_tasks:
+            result = generate_certificate(model["user"], model["cohort"], pending_tasks=3)
+
+        self.assertEqual(how_many_pending_tasks.call_args_list, [])
+        self.assertEqual(result.status, "ERROR")
+        self.assertEqual(result.status_text, "with-pending-tasks-3")
+
     """
     🔽🔽🔽 Student with pending tasks without mandatory property
     """
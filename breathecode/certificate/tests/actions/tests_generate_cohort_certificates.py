@@ -0,0 +1,82 @@
+"""
+Test generate_cohort_certificates
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.certificate import actions, tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+from capyc.rest_framework.exceptions import ValidationException
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock())
+    monkeypatch.setattr("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
+    monkeypatch.setattr(tasks.take_screenshots, "delay", MagicMock())
+
+    yield
+
+
+def get_models(bc: Breathecode, cohort_users: list[dict], **kwargs):
+    return bc.database.create(
+        user=3,
+        cohort={"stage": "ENDED", "current_day": 10, "language": "en", "never_ends": False},
+        cohort_user=cohort_users,
+        syllabus={"duration_in_days": 10},
+        syllabus_version={"json": {"days": []}},
+        specialty=1,
+        layout_design={"slug": "default"},
+        **kwargs,
+    )
+
+
+def test_without_teacher(bc: Breathecode):
+    model = get_models(bc, [{"user_id": 1, "role": "STUDENT"}])
+
+    with pytest.raises(ValidationException, match="without-main-teacher"):
+        actions.generate_cohort_certificates(model.cohort)
+
+    assert bc.database.list_of("certificate.UserSpecialty") == []
+    assert tasks.take_screenshots.delay.call_args_list == []
+
+
+def test_one_pass_for_the_whole_cohort(bc: Breathecode):
+    cohort_users = [
+        {"user_id": 1, "role": "STUDENT", "finantial_status": "FULLY_PAID", "educational_status": "GRADUATED"},
+        {"user_id": 2, "role": "STUDENT", "finantial_status": "UP_TO_DATE", "educational_status": "ACTIVE"},
+        {"user_id": 3, "role": "TEACHER"},
+    ]
+    model = get_models(bc, cohort_users)
+
+    certificates = actions.generate_cohort_certificates(model.cohort)
+
+    assert [(x.user_id, x.status, x.status_text) for x in certificates] == [
+        (1, "PERSISTED", "Certificate successfully queued for PDF generation"),
+        (2, "ERROR", "bad-educational-status"),
+    ]
+
+    db = bc.database.list_of("certificate.UserSpecialty")
+    assert [(x["user_id"], x["status"], x["layout_id"]) for x in db] == [(1, "PERSISTED", 1), (2, "ERROR", 1)]
+    assert all(x["update_hash"] for x in db)
+    assert all(x["signed_by"] == f"{model.user[2].first_name} {model.user[2].last_name}" for x in db)
+
+    assert tasks.take_screenshots.delay.call_args_list == [call([1])]
+
+
+def test_certificates_with_preview_are_skipped(bc: Breathecode):
+    cohort_users = [
+        {"user_id": 1, "role": "STUDENT", "finantial_status": "FULLY_PAID", "educational_status": "GRADUATED"},
+        {"user_id": 3, "role": "TEACHER"},
+    ]
+    model = get_models(
+        bc,
+        cohort_users,
+        user_specialty={"user_id": 1, "status": "PERSISTED", "preview_url": "https://4geeks.com/preview.png"},
+    )
+
+    assert actions.generate_cohort_certificates(model.cohort) == []
+    assert bc.database.list_of("certificate.UserSpecialty") == [bc.format.to_dict(model.user_specialty)]
+    assert tasks.take_screenshots.delay.call_args_list == []
@@ -0,0 +1,81 @@
+"""
+Test how_many_pending_tasks_by_user
+"""
+
+import pytest
+from django.core.cache import cache
+
+from breathecode.certificate import actions
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+SYLLABUS = {
+    "days": [
+        {
+            "assignments": [
+                {"slug": "project-1"},
+                {"slug": "project-2", "mandatory": False},
+            ],
+            "lessons": [{"slug": "lesson-1"}],
+        },
+        {"assignments": [{"slug": "project-3", "mandatory": True}]},
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def setup(db):
+    yield
+
+
+def test_asset_index():
+    syllabus_version = actions.SyllabusVersion(id=1, json=SYLLABUS)
+
+    assert actions.build_syllabus_asset_index(syllabus_version) == [
+        ("project-1", "PROJECT", True),
+        ("project-2", "PROJECT", False),
+        ("lesson-1", "LESSON", True),
+        ("project-3", "PROJECT", True),
+    ]
+
+
+def test_asset_index_is_cached(bc: Breathecode, django_assert_num_queries):
+    model = bc.database.create(syllabus_version={"json": SYLLABUS})
+
+    assert actions.get_assets_from_syllabus(model.syllabus_version.id, task_types=["PROJECT"]) == [
+        "project-1",
+        "project-2",
+        "project-3",
+    ]
+
+    with django_assert_num_queries(0):
+        assert actions.get_assets_from_syllabus(1, task_types=["PROJECT"], only_mandatory=True) == [
+            "project-1",
+            "project-3",
+        ]
+
+    assert cache.get(actions.syllabus_assets_cache_key(1)) is not None
+
+    model.syllabus_version.json = {"days": []}
+    model.syllabus_version.save()
+
+    assert cache.get(actions.syllabus_assets_cache_key(1)) is None
+    assert actions.get_assets_from_syllabus(1, task_types=["PROJECT"]) == []
+
+
+def test_pending_tasks_in_one_query(bc: Breathecode, django_assert_num_queries):
+    tasks = [
+        {"user_id": 1, "associated_slug": "project-1", "task_type": "PROJECT", "revision_status": "APPROVED"},
+        {"user_id": 1, "associated_slug": "project-3", "task_type": "PROJECT", "revision_status": "IGNORED"},
+        {"user_id": 2, "associated_slug": "project-1", "task_type": "PROJECT", "revision_status": "PENDING"},
+        {"user_id": 2, "associated_slug": "project-3", "task_type": "PROJECT", "revision_status": "APPROVED"},
+    ]
+    model = bc.database.create(user=3, task=tasks, syllabus_version={"json": SYLLABUS})
+    actions.get_syllabus_asset_index(model.syllabus_version)
+
+    with django_assert_num_queries(1):
+        result = actions.how_many_pending_tasks_by_user(
+            model.syllabus_version, [1, 2, 3], task_types=["PROJECT"], only_mandatory=True
+        )
+
+    assert result == {1: 0, 2: 1, 3: 2}
+    assert actions.how_many_pending_tasks(model.syllabus_version, model.user[1], ["PROJECT"], True) == 1
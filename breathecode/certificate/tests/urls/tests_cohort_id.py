@@ -9,6 +9,7 @@ from django.utils import timezone
 from rest_framework import status
 
 import breathecode.certificate.signals as signals
+import breathecode.certificate.tasks as tasks
 from breathecode.tests.mocks import (
     GOOGLE_CLOUD_PATH,
     apply_google_cloud_blob_mock,
@@ -182,6 +183,7 @@ class CertificateTestSuite(CertificateTestCase):
     @patch("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.certificate.tasks.take_screenshots.delay", MagicMock())
     def test_generate_certificate_with_everything_but_schedule(self):
         """Should be ok because cohorts dont need specialy mode to generate certificates"""
         self.headers(academy=1)
@@ -213,13 +215,9 @@ class CertificateTestSuite(CertificateTestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
         user_specialty = self.bc.database.get("certificate.UserSpecialty", 1, dict=False)
-        self.assertEqual(
-            signals.user_specialty_saved.send_robust.call_args_list,
-            [
-                # Action
-                call(instance=user_specialty, sender=user_specialty.__class__),
-            ],
-        )
+        # the certificates are written in bulk
+        self.assertEqual(signals.user_specialty_saved.send_robust.call_args_list, [])
+        self.assertEqual(tasks.take_screenshots.delay.call_args_list, [])
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
     @patch(GOOGLE_CLOUD_PATH["bucket"], apply_google_cloud_bucket_mock())
@@ -330,6 +328,7 @@ class CertificateTestSuite(CertificateTestCase):
     @patch("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.certificate.tasks.take_screenshots.delay", MagicMock())
     def test_generate_certificate_test_without_cohort_user_finantial_status(self):
         self.headers(academy=1)
         cohort_kwargs = {"stage": "ENDED"}
@@ -470,10 +469,9 @@ class CertificateTestSuite(CertificateTestCase):
             [
                 # Mixer
                 call(instance=model.user_specialty, sender=model.user_specialty.__class__),
-                # Action
-                call(instance=model.user_specialty, sender=model.user_specialty.__class__),
             ],
         )
+        self.assertEqual(tasks.take_screenshots.delay.call_args_list, [])
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
     @patch(GOOGLE_CLOUD_PATH["bucket"], apply_google_cloud_bucket_mock())
@@ -481,6 +479,7 @@ class CertificateTestSuite(CertificateTestCase):
     @patch("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.certificate.tasks.take_screenshots.delay", MagicMock())
     def test_generate_certificate_test_without_cohort_user_educational_status(self):
         self.headers(academy=1)
         cohort_kwargs = {"stage": "ENDED"}
@@ -624,6 +623,7 @@ class CertificateTestSuite(CertificateTestCase):
     @patch("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.certificate.tasks.take_screenshots.delay", MagicMock())
     def test_generate_certificate_test_with_final_cohort(self):
         self.headers(academy=1)
         cohort_kwargs = {"stage": "ENDED"}
@@ -765,10 +765,9 @@ class CertificateTestSuite(CertificateTestCase):
             [
                 # Mixer
                 call(instance=model.user_specialty, sender=model.user_specialty.__class__),
-                # Action
-                call(instance=model.user_specialty, sender=model.user_specialty.__class__),
             ],
         )
+        self.assertEqual(tasks.take_screenshots.delay.call_args_list, [])
 
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock())
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -777,6 +776,7 @@ class CertificateTestSuite(CertificateTestCase):
     @patch("breathecode.certificate.signals.user_specialty_saved.send_robust", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.certificate.tasks.take_screenshots.delay", MagicMock())
     def test_generate_certificate_good_request(self):
         """Test /certificate/cohort/id status: 201"""
 
@@ -930,7 +930,6 @@ class CertificateTestSuite(CertificateTestCase):
             [
                 # Mixer
                 call(instance=model.user_specialty, sender=model.user_specialty.__class__),
-                # Action
-                call(instance=model.user_specialty, sender=model.user_specialty.__class__),
             ],
         )
+        self.assertEqual(tasks.take_screenshots.delay.call_args_list, [call([1])])
@@ -7,7 +7,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from breathecode.admissions.models import CohortUser
+from breathecode.admissions.models import Cohort, CohortUser
 from breathecode.authenticate.models import ProfileAcademy
 from breathecode.utils import GenerateLookupsMixin, HeaderLimitOffsetPagination, capable_of
 from breathecode.utils.api_view_extensions.api_view_extensions import APIViewExtensions
@@ -15,7 +15,7 @@ from breathecode.utils.decorators import has_permission
 from breathecode.utils.find_by_full_name import query_like_by_full_name
 from capyc.rest_framework.exceptions import ValidationException
 
-from .actions import generate_certificate
+from .actions import generate_certificate, generate_cohort_certificates
 from .models import Badge, LayoutDesign, Specialty, UserSpecialty
 from .serializers import LayoutDesignSerializer, SpecialtySerializer, UserSpecialtySerializer
 from .tasks import async_generate_certificate
@@ -123,36 +123,28 @@ class CertificateCohortView(APIView):
             layout_slug = request.data["layout_slug"]
 
         cohort_users = CohortUser.objects.filter(cohort__id=cohort_id, role="STUDENT", cohort__academy__id=academy_id)
-        all_certs = []
-        cohort__users = []
 
         if cohort_users.count() == 0:
             raise ValidationException(
                 "There are no users with STUDENT role in this cohort", code=400, slug="no-user-with-student-role"
             )
 
-        for cohort_user in cohort_users:
-            cohort = cohort_user.cohort
-            if cohort.stage != "ENDED" or cohort.never_ends != False:
-                raise ValidationException(
-                    "Cohort stage must be ENDED or never ends", code=400, slug="cohort-stage-must-be-ended"
-                )
-
-            if not cohort.syllabus_version:
-                raise ValidationException(
-                    f"The cohort has no syllabus assigned, please set a syllabus for cohort: {cohort.name}",
-                    slug="cohort-has-no-syllabus-version-assigned",
-                )
+        cohort = Cohort.objects.filter(id=cohort_id).select_related("academy", "syllabus_version__syllabus").first()
+        if cohort.stage != "ENDED" or cohort.never_ends != False:
+            raise ValidationException(
+                "Cohort stage must be ENDED or never ends", code=400, slug="cohort-stage-must-be-ended"
+            )
 
-            else:
-                cohort__users.append(cohort_user)
+        if not cohort.syllabus_version:
+            raise ValidationException(
+                f"The cohort has no syllabus assigned, please set a syllabus for cohort: {cohort.name}",
+                slug="cohort-has-no-syllabus-version-assigned",
+            )
 
-        for cu in cohort__users:
-            cert = generate_certificate(cu.user, cu.cohort, layout_slug)
-            serializer = UserSpecialtySerializer(cert, many=False)
-            all_certs.append(serializer.data)
+        certificates = generate_cohort_certificates(cohort, layout_slug)
+        serializer = UserSpecialtySerializer(certificates, many=True)
 
-        return Response(all_certs, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 class CertificateAcademyView(APIView, HeaderLimitOffsetPagination, GenerateLookupsMixin):
@@ -17,6 +17,7 @@ MODULES = {}
 def clean_task(self, key: str, task_manager_id: int):
     # make sure all the modules are loaded
     from breathecode.admissions import caches as _  # noqa: F811, F401
+    from breathecode.assessment import caches as _  # noqa: F811, F401
     from breathecode.assignments import caches as _  # noqa: F811, F401
     from breathecode.events import caches as _  # noqa: F811, F401
     from breathecode.feedback import caches as _  # noqa: F811, F401
@@ -1,16 +1,19 @@
 import functools
 import logging
+import math
 import os
 import re
 from datetime import datetime, timedelta
+from typing import Optional
 
 import pytz
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db.models import F, Min, QuerySet
 from django.db.models.query_utils import Q
 from django.utils import timezone
 
 from breathecode.admissions.models import Cohort, CohortTimeSlot, CohortUser, TimeSlot
-from breathecode.payments.models import AbstractIOweYou, PlanFinancing, Subscription
+from breathecode.payments.models import CohortSetCohort, EventTypeSet, PlanFinancing, Subscription
 from breathecode.utils.datetime_integer import DatetimeInteger
 
 from .models import Event, EventType, Organization, Organizer, Venue
@@ -28,209 +31,177 @@ status_map = {
 }
 
 
-def get_my_event_types(_user):
+MY_EVENT_TYPES_CACHE_TIMEOUT = 60 * 60
+MY_EVENT_TYPES_VERSION_KEY = "events:my-event-types:version"
 
-    def build_query_params(cohort=None, syllabus=None, academy=None):
-        """
-        Build the query params to the visibility options.
-        """
 
-        return {
-            "visibility_settings__cohort": cohort,
-            "visibility_settings__syllabus": syllabus,
-            "visibility_settings__academy": academy,
-        }
+def my_event_types_cache_key(user_id: int) -> str:
+    version = cache.get(MY_EVENT_TYPES_VERSION_KEY, 0)
+    return f"events:my-event-types:{version}:{user_id}"
+
+
+def clear_my_event_types(user_id: Optional[int] = None) -> None:
+    """Clear the event types cached for a user, or for every user if no user is provided."""
+
+    if user_id is not None:
+        cache.delete(my_event_types_cache_key(user_id))
+        return
+
+    # the keys of the previous version will expire by themselves
+    try:
+        cache.incr(MY_EVENT_TYPES_VERSION_KEY)
+
+    except ValueError:
+        cache.set(MY_EVENT_TYPES_VERSION_KEY, 1, None)
+
+
+def get_my_event_type_ids(user_id: int) -> tuple[list[int], Optional[datetime]]:
+    """
+    Get the ids of the event types that a user can see.
+
+    It also returns when the first subscription or plan financing that granted them expires, `None` if none does.
+    """
+
+    utc_now = timezone.now()
+    statuses = ["CANCELLED", "DEPRECATED"]
+    at_least_one_resource_linked = (
+        Q(selected_cohort_set__isnull=False)
+        | Q(selected_mentorship_service_set__isnull=False)
+        | Q(selected_event_type_set__isnull=False)
+    )
+    fields = [
+        "selected_cohort_set",
+        "selected_event_type_set",
+        "selected_event_type_set__academy",
+        "selected_mentorship_service_set__academy",
+        "valid_until",
+    ]
+
+    subscriptions = Subscription.objects.filter(
+        at_least_one_resource_linked, Q(valid_until=None) | Q(valid_until__gte=utc_now), user__id=user_id
+    ).exclude(status__in=statuses)
+
+    plan_financings = PlanFinancing.objects.filter(
+        at_least_one_resource_linked, valid_until__gte=utc_now, user__id=user_id
+    ).exclude(status__in=statuses)
+
+    i_owe_them = list(subscriptions.values_list(*fields)) + list(plan_financings.values_list(*fields))
+
+    academy_ids = set()
+    event_type_set_ids = set()
+    cohort_set_ids = set()
+    expires_at = None
+
+    for cohort_set_id, event_type_set_id, event_type_set_academy_id, mentorship_academy_id, valid_until in i_owe_them:
+        if valid_until and (expires_at is None or valid_until < expires_at):
+            expires_at = valid_until
+
+        if cohort_set_id:
+            cohort_set_ids.add(cohort_set_id)
+
+        if event_type_set_id:
+            event_type_set_ids.add(event_type_set_id)
+            academy_ids.add(event_type_set_academy_id)
+
+        if mentorship_academy_id:
+            academy_ids.add(mentorship_academy_id)
+
+    # only the first cohort of each cohort set is shared
+    first_cohort_ids = (
+        CohortSetCohort.objects.filter(cohort_set__id__in=cohort_set_ids)
+        .values("cohort_set")
+        .annotate(first_cohort=Min("cohort"))
+        .values("first_cohort")
+    )
+    cohort_sets = Cohort.objects.filter(id__in=first_cohort_ids).values_list(
+        "id", "academy", "syllabus_version__syllabus"
+    )
+
+    cohort_users = CohortUser.objects.filter(user__id=user_id).values_list(
+        "cohort", "cohort__academy", "cohort__syllabus_version__syllabus"
+    )
+
+    cohort_ids = set()
+    syllabus = set()
+    for cohort_id, academy_id, syllabus_id in list(cohort_users) + (list(cohort_sets) if cohort_set_ids else []):
+        cohort_ids.add(cohort_id)
 
-    def get_related_resources():
-        """
-        Get the resources related to this user.
-        """
-
-        def process_i_owe_you(i_owe_them: QuerySet[AbstractIOweYou]):
-            for i_owe_you in i_owe_them:
-                print("get in", i_owe_you)
-                if (
-                    i_owe_you.selected_cohort_set
-                    and i_owe_you.selected_cohort_set.cohorts.first().academy
-                    and i_owe_you.selected_cohort_set.cohorts.first().academy not in academies
-                ):
-                    print(4, i_owe_you.selected_cohort_set.cohorts.first().academy)
-                    academies.append(i_owe_you.selected_cohort_set.cohorts.first().academy)
-
-                if i_owe_you.selected_cohort_set and i_owe_you.selected_cohort_set.cohorts.first() not in cohorts:
-                    print(5, i_owe_you.selected_cohort_set.cohorts.first())
-                    cohorts.append(i_owe_you.selected_cohort_set.cohorts.first())
-
-                if (
-                    i_owe_you.selected_cohort_set
-                    and i_owe_you.selected_cohort_set.cohorts.first().syllabus_version
-                    and i_owe_you.selected_cohort_set.cohorts.first().syllabus_version.syllabus not in syllabus
-                ):
-                    print(
-                        6,
-                        i_owe_you.selected_cohort_set.cohorts.first().syllabus_version.syllabus,
-                        i_owe_you.selected_cohort_set.cohorts.first().academy,
-                    )
-                    syllabus.append(
-                        {
-                            "syllabus": i_owe_you.selected_cohort_set.cohorts.first().syllabus_version.syllabus,
-                            "academy": i_owe_you.selected_cohort_set.cohorts.first().academy,
-                        }
-                    )
-
-                if i_owe_you.selected_event_type_set and i_owe_you.selected_event_type_set.academy not in academies:
-                    print(7, i_owe_you.selected_event_type_set.academy)
-                    academies.append(i_owe_you.selected_event_type_set.academy)
-
-                if (
-                    i_owe_you.selected_mentorship_service_set
-                    and i_owe_you.selected_mentorship_service_set.academy not in academies
-                ):
-                    print(8, i_owe_you.selected_mentorship_service_set.academy)
-                    academies.append(i_owe_you.selected_mentorship_service_set.academy)
-
-                if i_owe_you.selected_event_type_set:
-                    for event_type in i_owe_you.selected_event_type_set.event_types.all():
-                        if event_type.id not in ids:
-                            print(9, event_type.id)
-                            ids.append(event_type.id)
-
-        syllabus = []
-        academies = []
-        cohorts = []
-        ids = []
-
-        utc_now = timezone.now()
-        statuses = ["CANCELLED", "DEPRECATED"]
-        at_least_one_resource_linked = (
-            Q(selected_cohort_set__isnull=False)
-            | Q(selected_mentorship_service_set__isnull=False)
-            | Q(selected_event_type_set__isnull=False)
+        if academy_id:
+            academy_ids.add(academy_id)
+
+        if syllabus_id:
+            syllabus.add((syllabus_id, academy_id))
+
+    visibility = Q()
+
+    # shared with the whole academy
+    if academy_ids:
+        visibility |= Q(
+            eventtypevisibilitysetting__cohort=None,
+            eventtypevisibilitysetting__syllabus=None,
+            eventtypevisibilitysetting__academy__id__in=academy_ids,
         )
 
-        cohort_users = CohortUser.objects.filter(user=_user)
-        cohort_users_with_syllabus = cohort_users.filter(cohort__syllabus_version__isnull=False)
-
-        subscriptions = Subscription.objects.filter(
-            at_least_one_resource_linked, Q(valid_until=None) | Q(valid_until__gte=utc_now), user=_user
-        ).exclude(status__in=statuses)
-
-        plan_financings = PlanFinancing.objects.filter(
-            at_least_one_resource_linked, valid_until__gte=utc_now, user=_user
-        ).exclude(status__in=statuses)
-
-        for cohort_user in cohort_users_with_syllabus:
-            if cohort_user.cohort.syllabus_version.syllabus not in cohorts:
-                print(1, cohort_user.cohort.syllabus_version.syllabus, cohort_user.cohort.academy)
-                syllabus.append(
-                    {
-                        "syllabus": cohort_user.cohort.syllabus_version.syllabus,
-                        "academy": cohort_user.cohort.academy,
-                    }
-                )
-
-        for cohort_user in cohort_users:
-            if cohort_user.cohort.academy not in cohorts:
-                print(2, cohort_user.cohort.academy)
-                academies.append(cohort_user.cohort.academy)
-
-        for cohort_user in cohort_users:
-            if cohort_user.cohort not in cohorts:
-                print(3, cohort_user.cohort)
-                cohorts.append(cohort_user.cohort)
-
-        process_i_owe_you(subscriptions)
-        process_i_owe_you(plan_financings)
-
-        print(
-            -11,
-            [
-                {
-                    "id": x.id,
-                    "slug": x.slug,
-                    "name": x.name,
-                }
-                for x in academies
-            ],
+    # shared with a specific cohort, the visibility setting belongs to the academy of the cohort
+    if cohort_ids:
+        visibility |= Q(
+            eventtypevisibilitysetting__cohort__id__in=cohort_ids,
+            eventtypevisibilitysetting__syllabus=None,
+            eventtypevisibilitysetting__academy=F("eventtypevisibilitysetting__cohort__academy"),
         )
 
-        print(
-            -22,
-            [
-                {
-                    "id": x.id,
-                    "slug": x.slug,
-                    "name": x.name,
-                }
-                for x in cohorts
-            ],
+    # shared with a specific syllabus
+    for syllabus_id, academy_id in syllabus:
+        visibility |= Q(
+            eventtypevisibilitysetting__cohort=None,
+            eventtypevisibilitysetting__syllabus__id=syllabus_id,
+            eventtypevisibilitysetting__academy__id=academy_id,
         )
 
-        print(
-            -33,
-            [
-                {
-                    "syllabus": {
-                        "id": x["syllabus"].id,
-                        "slug": x["syllabus"].slug,
-                        "name": x["syllabus"].name,
-                    },
-                    "academy": {
-                        "id": x["academy"].id,
-                        "slug": x["academy"].slug,
-                        "name": x["academy"].name,
-                    },
-                }
-                for x in syllabus
-            ],
+    ids = set()
+    if visibility:
+        # the visibility setting must belong to the academy of the event type, unless it allows shared creation
+        same_academy = Q(eventtypevisibilitysetting__academy=F("eventtype__academy"))
+        ids |= set(
+            EventType.visibility_settings.through.objects.filter(
+                visibility, same_academy | Q(eventtype__allow_shared_creation=True)
+            ).values_list("eventtype", flat=True)
         )
-        print(-44, subscriptions)
-        print(-55, plan_financings)
-
-        return academies, cohorts, syllabus, ids
-
-    def my_events():
-
-        query = None
-        academies, cohorts, syllabus, ids = get_related_resources()
-
-        # shared with the whole academy
-        for academy in academies:
-            kwargs = build_query_params(academy=academy)
-            if query:
-                query |= Q(**kwargs, academy=academy) | Q(**kwargs, allow_shared_creation=True)
-            else:
-                query = Q(**kwargs, academy=academy) | Q(**kwargs, allow_shared_creation=True)
-
-        # shared with a specific cohort
-        for cohort in cohorts:
-            kwargs = build_query_params(academy=cohort.academy, cohort=cohort)
-            # is not necessary provided the syllabus
-            if query:
-                query |= Q(**kwargs, academy=cohort.academy) | Q(**kwargs, allow_shared_creation=True)
-            else:
-                query = Q(**kwargs, academy=cohort.academy) | Q(**kwargs, allow_shared_creation=True)
-
-        # shared with a specific syllabus
-        for s in syllabus:
-            kwargs = build_query_params(academy=s["academy"], syllabus=s["syllabus"])
-            if query:
-                query |= Q(**kwargs, academy=s["academy"]) | Q(**kwargs, allow_shared_creation=True)
-            else:
-                query = Q(**kwargs, academy=s["academy"]) | Q(**kwargs, allow_shared_creation=True)
-
-        if ids:
-            if query:
-                query |= Q(id__in=ids)
-            else:
-                query = Q(id__in=ids)
-
-        if query:
-            return EventType.objects.filter(query)
-        else:
-            return EventType.objects.none()
 
-    return my_events()
+    if event_type_set_ids:
+        ids |= set(
+            EventTypeSet.event_types.through.objects.filter(eventtypeset__id__in=event_type_set_ids).values_list(
+                "eventtype", flat=True
+            )
+        )
+
+    return sorted(ids), expires_at
+
+
+def get_my_event_types(_user) -> QuerySet[EventType]:
+    """
+    Get the event types that a user can see, the ids are cached per user.
+
+    The cache expires with the first subscription or plan financing that granted them, expiring is not a write that
+    clears it.
+    """
+
+    key = my_event_types_cache_key(_user.id)
+    ids = cache.get(key)
+
+    if ids is None:
+        ids, expires_at = get_my_event_type_ids(_user.id)
+
+        timeout = MY_EVENT_TYPES_CACHE_TIMEOUT
+        if expires_at is not None:
+            timeout = max(1, min(timeout, math.ceil((expires_at - timezone.now()).total_seconds())))
+
+        cache.set(key, ids, timeout)
+
+    if not ids:
+        return EventType.objects.none()
+
+    return EventType.objects.filter(id__in=ids)
 
 
 def sync_org_venues(org):
@@ -1,12 +1,16 @@
 import logging
 from typing import Any, Type
 
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from breathecode.admissions.models import CohortTimeSlot
+from breathecode.admissions.models import CohortTimeSlot, CohortUser
 from breathecode.admissions.signals import timeslot_saved
-from breathecode.events import tasks
+from breathecode.events import actions, tasks
+from breathecode.payments.models import CohortSetCohort, EventTypeSet, PlanFinancing, Subscription
+
+from .models import EventType, EventTypeVisibilitySetting
 
 logger = logging.getLogger(__name__)
 
@@ -21,3 +25,25 @@ def post_save_cohort_time_slot(sender: Type[CohortTimeSlot], instance: CohortTim
         and instance.cohort.never_ends == False
     ):
         tasks.build_live_classes_from_timeslot.delay(instance.id)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+@receiver(post_save, sender=PlanFinancing)
+@receiver(post_delete, sender=PlanFinancing)
+@receiver(post_save, sender=CohortUser)
+@receiver(post_delete, sender=CohortUser)
+def clear_user_event_types(sender: Type[CohortUser], instance: CohortUser, **kwargs: Any):
+    actions.clear_my_event_types(instance.user_id)
+
+
+@receiver(post_save, sender=EventType)
+@receiver(post_delete, sender=EventType)
+@receiver(post_save, sender=EventTypeVisibilitySetting)
+@receiver(post_delete, sender=EventTypeVisibilitySetting)
+@receiver(post_save, sender=CohortSetCohort)
+@receiver(post_delete, sender=CohortSetCohort)
+@receiver(m2m_changed, sender=EventType.visibility_settings.through)
+@receiver(m2m_changed, sender=EventTypeSet.event_types.through)
+def clear_event_types(sender: Type[EventType], **kwargs: Any):
+    actions.clear_my_event_types()
@@ -0,0 +1,88 @@
+"""
+Test get_my_event_types
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.utils import timezone
+
+from breathecode.events import actions
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.activity.tasks.get_attendancy_log.delay", MagicMock())
+    monkeypatch.setattr("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock())
+
+    yield
+
+
+def test_without_resources(bc: Breathecode):
+    model = bc.database.create(user=1)
+
+    assert list(actions.get_my_event_types(model.user)) == []
+
+
+def test_shared_with_the_academy_and_the_cohort(bc: Breathecode, django_assert_num_queries):
+    visibility_settings = [
+        {"academy_id": 1, "cohort_id": None, "syllabus_id": None},
+        {"academy_id": 1, "cohort_id": 1, "syllabus_id": None},
+        {"academy_id": 2, "cohort_id": None, "syllabus_id": None},
+    ]
+    event_types = [
+        {"academy_id": 1, "visibility_settings": [1], "allow_shared_creation": False},
+        {"academy_id": 1, "visibility_settings": [2], "allow_shared_creation": False},
+        {"academy_id": 2, "visibility_settings": [3], "allow_shared_creation": False},
+        {"academy_id": 2, "visibility_settings": [1], "allow_shared_creation": False},
+    ]
+    model = bc.database.create(
+        user=1,
+        academy=2,
+        cohort={"academy_id": 1},
+        cohort_user={"user_id": 1},
+        event_type_visibility_setting=visibility_settings,
+        event_type=event_types,
+    )
+
+    assert sorted(x.id for x in actions.get_my_event_types(model.user)) == [1, 2]
+
+    with django_assert_num_queries(1):
+        assert sorted(x.id for x in actions.get_my_event_types(model.user)) == [1, 2]
+
+
+def test_the_cache_is_cleared_when_the_user_joins_a_cohort(bc: Breathecode):
+    model = bc.database.create(
+        user=1,
+        cohort=1,
+        event_type_visibility_setting={"cohort_id": None, "syllabus_id": None},
+        event_type={"visibility_settings": [1]},
+    )
+
+    assert list(actions.get_my_event_types(model.user)) == []
+
+    bc.database.create(cohort_user={"user_id": 1, "cohort_id": 1})
+
+    assert [x.id for x in actions.get_my_event_types(model.user)] == [1]
+
+
+def test_the_cache_expires_with_the_subscription(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    utc_now = timezone.now()
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=utc_now))
+
+    model = bc.database.create(
+        user=1,
+        academy=1,
+        event_type=1,
+        event_type_set={"event_types": [1]},
+        subscription={"valid_until": utc_now + timedelta(minutes=10), "selected_event_type_set_id": 1},
+    )
+
+    monkeypatch.setattr(actions.cache, "set", MagicMock(wraps=actions.cache.set))
+
+    assert [x.id for x in actions.get_my_event_types(model.user)] == [1]
+
+    # the subscription expires before the default timeout
+    assert actions.cache.set.call_args.args[2] == 600
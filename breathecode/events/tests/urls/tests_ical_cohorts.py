@@ -1335,3 +1335,33 @@ class AcademyCohortTestSuite(EventTestCase):
 
         self.assertEqual(response.content.decode("utf-8"), expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch("breathecode.events.tasks.build_live_classes_from_timeslot.delay", MagicMock())
+    @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    def test_ical_cohorts__cached__not_modified(self):
+        """Test /academy/cohort with the calendar cached"""
+        device_id_kwargs = {"name": "server"}
+        self.generate_models(academy=True, skip_cohort=True, device_id=True, device_id_kwargs=device_id_kwargs)
+
+        url = reverse_lazy("events:ical_cohorts")
+        args = {"academy": "1"}
+        response = self.client.get(url + "?" + urllib.parse.urlencode(args))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/calendar")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="calendar.ics"')
+
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+
+        cached = self.client.get(url + "?" + urllib.parse.urlencode(args))
+
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(cached["Last-Modified"], last_modified)
+
+        not_modified = self.client.get(url + "?" + urllib.parse.urlencode(args), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -1,14 +1,18 @@
+import hashlib
 import logging
 import os
 import re
 from datetime import datetime, timedelta
+from typing import Optional
 
 import pytz
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from django.db.models.query_utils import Q
 from django.http.response import HttpResponse
 from django.shortcuts import redirect, render
 from django.utils import timezone
+from django.utils.http import http_date, quote_etag
 from icalendar import Calendar as iCalendar
 from icalendar import Event as iEvent
 from icalendar import vCalAddress, vText
@@ -21,6 +25,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 import breathecode.activity.tasks as tasks_activity
+from breathecode.admissions.caches import CohortCache
 from breathecode.admissions.models import Academy, Cohort, CohortTimeSlot, CohortUser, Syllabus
 from breathecode.authenticate.actions import get_user_language, server_id
 from breathecode.events import actions
@@ -35,6 +40,8 @@ from breathecode.utils import (
     response_207,
 )
 from breathecode.utils.api_view_extensions.api_view_extensions import APIViewExtensions
+from breathecode.utils.api_view_extensions.extensions.cache_extension import is_cache_enabled
+from breathecode.utils.cache import Cache
 from breathecode.utils.decorators import consume
 from breathecode.utils.i18n import translation
 from breathecode.utils.multi_status_response import MultiStatusResponse
@@ -84,6 +91,7 @@ from .serializers import (
 from .tasks import async_eventbrite_webhook, mark_live_class_as_started
 
 logger = logging.getLogger(__name__)
+ICAL_CACHE_TIMEOUT = 60 * 60
 MONDAY = 0
 TUESDAY = 1
 WEDNESDAY = 2
@@ -1232,6 +1240,61 @@ class AcademyVenueView(APIView):
         return Response(serializer.data)
 
 
+def get_ical_cache(cache: type[Cache], request) -> Optional[HttpResponse]:
+    """Get the calendar cached for this request, if any."""
+
+    if not is_cache_enabled():
+        return None
+
+    try:
+        res = cache.get(get_ical_cache_params(request))
+
+    except Exception:
+        logger.exception("Error while trying to get the calendar from the cache")
+        return None
+
+    if res is None:
+        return None
+
+    content, headers = res
+    return HttpResponse(content, headers=headers)
+
+
+def set_ical_cache(cache: type[Cache], request, calendar_text: bytes) -> HttpResponse:
+    """
+    Cache the calendar of this request and get its response.
+
+    The ETag and Last-Modified headers are saved with the calendar, so the calendar clients that poll it get a 304
+    from ConditionalGetMiddleware until the cache is cleaned.
+    """
+
+    headers = {
+        "Content-Disposition": 'attachment; filename="calendar.ics"',
+        "ETag": quote_etag(hashlib.md5(calendar_text).hexdigest()),
+        "Last-Modified": http_date(),
+    }
+
+    if is_cache_enabled():
+        try:
+            # the timeout limits how long the upcoming calendars keep the cohorts and events that already started
+            cache.set(
+                calendar_text,
+                format="text/calendar",
+                timeout=ICAL_CACHE_TIMEOUT,
+                params=get_ical_cache_params(request),
+                headers=headers,
+            )
+
+        except Exception:
+            logger.exception("Error while trying to set the calendar in the cache")
+
+    return HttpResponse(calendar_text, content_type="text/calendar", headers=headers)
+
+
+def get_ical_cache_params(request) -> dict:
+    return {**request.GET.dict(), **request.parser_context["kwargs"], "request.path": request.path}
+
+
 def ical_academies_repr(slugs=None, ids=None):
     ret = []
 
@@ -1263,13 +1326,18 @@ class ICalStudentView(APIView):
         if not User.objects.filter(id=user_id).count():
             raise ValidationException("Student not exist", 404, slug="student-not-exist")
 
+        if cache := get_ical_cache(CohortCache, request):
+            return cache
+
         cohort_ids = (
             CohortUser.objects.filter(user__id=user_id, cohort__ending_date__isnull=False, cohort__never_ends=False)
             .values_list("cohort_id", flat=True)
             .exclude(cohort__stage="DELETED")
         )
 
-        items = CohortTimeSlot.objects.filter(cohort__id__in=cohort_ids).order_by("id")
+        items = (
+            CohortTimeSlot.objects.filter(cohort__id__in=cohort_ids).select_related("cohort__academy").order_by("id")
+        )
 
         upcoming = request.GET.get("upcoming")
         if upcoming == "true":
@@ -1292,6 +1360,11 @@ class ICalStudentView(APIView):
 
         calendar.add("version", "2.0")
 
+        teachers = {}
+        cohort_teachers = CohortUser.objects.filter(role="TEACHER", cohort__id__in=cohort_ids).select_related("user")
+        for teacher in cohort_teachers.order_by("id"):
+            teachers.setdefault(teacher.cohort_id, teacher)
+
         for item in items:
             event = iEvent()
 
@@ -1325,7 +1398,7 @@ class ICalStudentView(APIView):
 
                 event.add("rrule", {"freq": item.recurrency_type, "until": until_date + delta})
 
-            teacher = CohortUser.objects.filter(role="TEACHER", cohort__id=item.cohort.id).first()
+            teacher = teachers.get(item.cohort_id)
 
             if teacher:
                 organizer = vCalAddress(f"MAILTO:{teacher.user.email}")
@@ -1349,10 +1422,7 @@ class ICalStudentView(APIView):
             calendar.add_component(event)
 
         calendar_text = calendar.to_ical()
-
-        response = HttpResponse(calendar_text, content_type="text/calendar")
-        response["Content-Disposition"] = 'attachment; filename="calendar.ics"'
-        return response
+        return set_ical_cache(CohortCache, request, calendar_text)
 
 
 class ICalCohortsView(APIView):
@@ -1388,13 +1458,25 @@ class ICalCohortsView(APIView):
         ).count() != len(slugs):
             raise ValidationException("Some academy not exist")
 
-        items = items.exclude(stage="DELETED")
+        if cache := get_ical_cache(CohortCache, request):
+            return cache
+
+        items = items.exclude(stage="DELETED").select_related("academy")
 
         upcoming = request.GET.get("upcoming")
         if upcoming == "true":
             now = timezone.now()
             items = items.filter(kickoff_date__gte=now)
 
+        items = items.prefetch_related(
+            Prefetch("cohorttimeslot_set", queryset=CohortTimeSlot.objects.order_by("id")),
+            Prefetch(
+                "cohortuser_set",
+                queryset=CohortUser.objects.filter(role="TEACHER").select_related("user").order_by("id"),
+                to_attr="teachers",
+            ),
+        )
+
         academies_repr = ical_academies_repr(ids=ids, slugs=slugs)
         key = server_id()
 
@@ -1435,7 +1517,7 @@ class ICalCohortsView(APIView):
             event.add("dtstart", item.kickoff_date)
 
             timeslots = update_timeslots_out_of_range(
-                item.kickoff_date, item.ending_date, CohortTimeSlot.objects.filter(cohort__id=item.id)
+                item.kickoff_date, item.ending_date, item.cohorttimeslot_set.all()
             )
 
             first_timeslot = timeslots[0] if timeslots else None
@@ -1490,7 +1572,7 @@ class ICalCohortsView(APIView):
 
             event.add("dtstamp", item.created_at)
 
-            teacher = CohortUser.objects.filter(role="TEACHER", cohort__id=item.id).first()
+            teacher = item.teachers[0] if item.teachers else None
 
             if teacher:
                 organizer = vCalAddress(f"MAILTO:{teacher.user.email}")
@@ -1532,10 +1614,7 @@ class ICalCohortsView(APIView):
                 calendar.add_component(event_last_day)
 
         calendar_text = calendar.to_ical()
-
-        response = HttpResponse(calendar_text, content_type="text/calendar")
-        response["Content-Disposition"] = 'attachment; filename="calendar.ics"'
-        return response
+        return set_ical_cache(CohortCache, request, calendar_text)
 
 
 class ICalEventView(APIView):
@@ -1569,11 +1648,17 @@ class ICalEventView(APIView):
         ).count() != len(slugs):
             raise ValidationException("Some academy not exist")
 
+        if cache := get_ical_cache(EventCache, request):
+            return cache
+
         upcoming = request.GET.get("upcoming")
         if items and upcoming == "true":
             now = timezone.now()
             items = items.filter(starting_at__gte=now)
 
+        if items:
+            items = items.select_related("academy", "venue", "event_type", "author")
+
         academies_repr = ical_academies_repr(ids=ids, slugs=slugs)
         key = server_id()
 
@@ -1664,7 +1749,4 @@ class ICalEventView(APIView):
             calendar.add_component(event)
 
         calendar_text = calendar.to_ical()
-
-        response = HttpResponse(calendar_text, content_type="text/calendar")
-        response["Content-Disposition"] = 'attachment; filename="calendar.ics"'
-        return response
+        return set_ical_cache(EventCache, request, calendar_text)
@@ -2,7 +2,7 @@ import json
 import logging
 import re
 
-from django.db.models import Avg, QuerySet
+from django.db.models import Avg, Case, CharField, Count, F, Q, Sum, Value, When
 from django.utils import timezone
 
 from breathecode.admissions.models import CohortUser
@@ -47,9 +47,10 @@ def send_survey_group(survey=None, cohort=None):
 
         ucs = CohortUser.objects.filter(cohort=cohort, role="STUDENT").filter()
 
+        user_ids = []
         for uc in ucs:
             if uc.educational_status in ["ACTIVE", "GRADUATED"]:
-                tasks.send_cohort_survey.delay(uc.user.id, survey.id)
+                user_ids.append(uc.user.id)
 
                 logger.debug(f"Survey scheduled to send for {uc.user.email}")
                 result["success"].append(f"Survey scheduled to send for {uc.user.email}")
@@ -58,6 +59,10 @@ def send_survey_group(survey=None, cohort=None):
                 result["error"].append(
                     f"Survey NOT sent to {uc.user.email} because it's not an active or graduated student"
                 )
+
+        if user_ids:
+            tasks.send_cohort_surveys.delay(user_ids, survey.id)
+
         survey.sent_at = timezone.now()
         if len(result["error"]) == 0:
             survey.status = "SENT"
@@ -214,50 +219,75 @@ def create_user_graduation_reviews(user, cohort) -> bool:
 
 
 def calculate_survey_response_rate(survey_id: int) -> float:
-    total_responses = Answer.objects.filter(survey__id=survey_id).count()
-    answered_responses = Answer.objects.filter(survey__id=survey_id, status="ANSWERED").count()
-    response_rate = (answered_responses / total_responses) * 100
+    result = Answer.objects.filter(survey__id=survey_id).aggregate(
+        total_responses=Count("id"), answered_responses=Count("id", filter=Q(status="ANSWERED"))
+    )
+    response_rate = (result["answered_responses"] / result["total_responses"]) * 100
 
     return response_rate
 
 
+def get_title_filter(pattern: list[str]) -> Q:
+    return Q(title__startswith=pattern[0], title__endswith=pattern[1])
+
+
 def calculate_survey_scores(survey_id: int) -> dict:
+    """
+    Get the average scores of a survey.
+
+    The answers are classified by the pattern of their title and grouped by category, and by title for the
+    mentors, so every average is calculated by the same query.
+    """
 
-    def get_average(answers: QuerySet[Answer]) -> float:
-        result = answers.aggregate(Avg("score"))
-        return result["score__avg"]
+    def get_average(groups: list[dict]) -> float:
+        count = sum(x["score_count"] for x in groups)
+        if count == 0:
+            return None
+
+        return sum(x["score_sum"] for x in groups) / count
 
     survey = Survey.objects.filter(id=survey_id).first()
     if not survey:
         raise ValidationException("Survey not found", code=404, slug="not-found")
 
-    answers = Answer.objects.filter(survey=survey, status="ANSWERED")
-    total = get_average(answers)
-
     academy_pattern = strings[survey.lang]["academy"]["title"].split("{}")
     cohort_pattern = strings[survey.lang]["cohort"]["title"].split("{}")
     mentor_pattern = strings[survey.lang]["mentor"]["title"].split("{}")
 
-    academy = get_average(answers.filter(title__startswith=academy_pattern[0], title__endswith=academy_pattern[1]))
-
-    cohort = get_average(answers.filter(title__startswith=cohort_pattern[0], title__endswith=cohort_pattern[1]))
-
-    all_mentors = {
-        x.title for x in answers.filter(title__startswith=mentor_pattern[0], title__endswith=mentor_pattern[1])
-    }
+    category = Case(
+        When(get_title_filter(academy_pattern), then=Value("academy")),
+        When(get_title_filter(cohort_pattern), then=Value("cohort")),
+        When(get_title_filter(mentor_pattern), then=Value("mentor")),
+        default=Value("other"),
+        output_field=CharField(),
+    )
+    mentor = Case(
+        When(get_title_filter(mentor_pattern), then=F("title")),
+        default=Value(None),
+        output_field=CharField(),
+    )
+
+    groups = list(
+        Answer.objects.filter(survey=survey, status="ANSWERED")
+        .annotate(category=category, mentor=mentor)
+        .values("category", "mentor")
+        .annotate(score_sum=Sum("score"), score_count=Count("score"))
+        .order_by()
+    )
 
     full_mentor_pattern = mentor_pattern[0].replace("?", "\\?") + r"([\w ]+)" + mentor_pattern[1].replace("?", "\\?")
 
     mentors = []
-    for mentor in all_mentors:
-        name = re.findall(full_mentor_pattern, mentor)[0]
-        score = get_average(answers.filter(title=mentor))
+    for group in groups:
+        if group["category"] != "mentor":
+            continue
 
-        mentors.append({"name": name, "score": score})
+        name = re.findall(full_mentor_pattern, group["mentor"])[0]
+        mentors.append({"name": name, "score": get_average([group])})
 
     return {
-        "total": total,
-        "academy": academy,
-        "cohort": cohort,
+        "total": get_average(groups),
+        "academy": get_average([x for x in groups if x["category"] == "academy"]),
+        "cohort": get_average([x for x in groups if x["category"] == "cohort"]),
         "mentors": sorted(mentors, key=lambda x: x["name"]),
     }
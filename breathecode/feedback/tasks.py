@@ -154,22 +154,20 @@ def api_url():
     return os.getenv("API_URL", "")
 
 
-@task(bind=False, priority=TaskPriority.NOTIFICATION.value)
-def send_cohort_survey(user_id, survey_id, **_):
-    logger.info("Starting send_cohort_survey")
+def get_cohort_survey(survey_id):
     survey = Survey.objects.filter(id=survey_id).first()
     if survey is None:
         raise RetryTask("Survey not found")
 
-    user = User.objects.filter(id=user_id).first()
-    if user is None:
-        raise AbortTask("User not found")
-
     utc_now = timezone.now()
 
     if utc_now > survey.created_at + survey.duration:
         raise AbortTask("This survey has already expired")
 
+    return survey
+
+
+def prepare_cohort_survey(user, survey):
     cu = CohortUser.objects.filter(
         cohort=survey.cohort, role="STUDENT", user=user, educational_status__in=["ACTIVE", "GRADUATED"]
     ).first()
@@ -188,23 +186,66 @@ def send_cohort_survey(user_id, survey_id, **_):
         raise AbortTask(message)
 
     token, created = Token.get_or_create(user, token_type="temporal", hours_length=48)
-    data = {
+    return {
         "SUBJECT": strings[survey.lang]["survey_subject"],
         "MESSAGE": strings[survey.lang]["survey_message"],
-        "TRACKER_URL": f"{api_url()}/v1/feedback/survey/{survey_id}/tracker.png",
+        "TRACKER_URL": f"{api_url()}/v1/feedback/survey/{survey.id}/tracker.png",
         "BUTTON": strings[survey.lang]["button_label"],
-        "LINK": f"https://nps.4geeks.com/survey/{survey_id}?token={token.key}",
+        "LINK": f"https://nps.4geeks.com/survey/{survey.id}?token={token.key}",
     }
 
-    if user.email:
-        notify_actions.send_email_message("nps_survey", user.email, data, academy=survey.cohort.academy)
 
+def send_cohort_survey_slack(user, survey, data):
     if hasattr(user, "slackuser") and hasattr(survey.cohort.academy, "slackteam"):
         notify_actions.send_slack(
             "nps_survey", user.slackuser, survey.cohort.academy.slackteam, data=data, academy=survey.cohort.academy
         )
 
 
+@task(bind=False, priority=TaskPriority.NOTIFICATION.value)
+def send_cohort_survey(user_id, survey_id, **_):
+    logger.info("Starting send_cohort_survey")
+    survey = get_cohort_survey(survey_id)
+
+    user = User.objects.filter(id=user_id).first()
+    if user is None:
+        raise AbortTask("User not found")
+
+    data = prepare_cohort_survey(user, survey)
+
+    if user.email:
+        notify_actions.send_email_message("nps_survey", user.email, data, academy=survey.cohort.academy)
+
+    send_cohort_survey_slack(user, survey, data)
+
+
+@task(bind=False, priority=TaskPriority.NOTIFICATION.value)
+def send_cohort_surveys(user_ids, survey_id, **_):
+    """Send a survey to many students of its cohort, the emails go in bulk with a personal link per student."""
+
+    logger.info("Starting send_cohort_surveys")
+    survey = get_cohort_survey(survey_id)
+
+    data = None
+    recipients = {}
+    for user in User.objects.filter(id__in=user_ids):
+        try:
+            user_data = prepare_cohort_survey(user, survey)
+
+        except AbortTask as e:
+            logger.error(f"Survey {survey.id} not sent to user {user.id}: {str(e)}")
+            continue
+
+        if user.email:
+            recipients[user.email] = {"LINK": user_data["LINK"]}
+
+        send_cohort_survey_slack(user, survey, user_data)
+        data = {key: value for key, value in user_data.items() if key != "LINK"}
+
+    if recipients:
+        notify_actions.send_email_messages("nps_survey", recipients, data, academy=survey.cohort.academy)
+
+
 @task(bind=False, priority=TaskPriority.ACADEMY.value)
 def process_student_graduation(cohort_id, user_id, **_):
     from .actions import create_user_graduation_reviews
@@ -251,9 +292,12 @@ def process_answer_received(answer_id, **_):
     if answer.survey is None:
         raise AbortTask("No survey connected to answer.")
 
-    answer.survey.response_rate = actions.calculate_survey_response_rate(answer.survey.id)
-    answer.survey.scores = actions.calculate_survey_scores(answer.survey.id)
-    answer.survey.save()
+    # only the snapshot of the scores is written, the rest of the survey could be being edited at the same time
+    Survey.objects.filter(id=answer.survey.id).update(
+        response_rate=actions.calculate_survey_response_rate(answer.survey.id),
+        scores=actions.calculate_survey_scores(answer.survey.id),
+        updated_at=timezone.now(),
+    )
 
     if answer.user and answer.academy and answer.score is not None and answer.score < 8:
         system_email = get_system_email()
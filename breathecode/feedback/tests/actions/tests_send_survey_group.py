@@ -18,7 +18,7 @@ UTC_NOW = timezone.now()
 
 class AnswerTestSuite(FeedbackTestCase):
 
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
     def test_send_survey_group(self):
@@ -26,9 +26,9 @@ class AnswerTestSuite(FeedbackTestCase):
         with self.assertRaisesMessage(ValidationException, "missing-survey-or-cohort"):
 
             send_survey_group()
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
     def test_when_survey_and_cohort_do_not_match(self):
@@ -38,9 +38,9 @@ class AnswerTestSuite(FeedbackTestCase):
         with self.assertRaisesMessage(ValidationException, "survey-does-not-match-cohort"):
 
             send_survey_group(model.survey, model.cohort[1])
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
     def test_when_cohort_does_not_have_teacher_assigned_to_survey(self):
@@ -53,10 +53,10 @@ class AnswerTestSuite(FeedbackTestCase):
             with self.assertRaisesMessage(ValidationException, "cohort-must-have-teacher-assigned-to-survey"):
 
                 send_survey_group(model.survey, model.cohort)
-            self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+            self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock())
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
@@ -92,11 +92,11 @@ class AnswerTestSuite(FeedbackTestCase):
             )
 
             self.bc.database.delete("feedback.Survey")
-            self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [call(model.user.id, model.survey.id)])
-            tasks.send_cohort_survey.delay.call_args_list = []
+            self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [call([model.user.id], model.survey.id)])
+            tasks.send_cohort_surveys.delay.call_args_list = []
 
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock())
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
@@ -135,9 +135,9 @@ class AnswerTestSuite(FeedbackTestCase):
                     }
                 ],
             )
-            self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+            self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
 
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
@@ -178,10 +178,10 @@ class AnswerTestSuite(FeedbackTestCase):
         )
 
         self.bc.database.delete("feedback.Survey")
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [call(model.user.id, model.survey.id)])
-        tasks.send_cohort_survey.delay.call_args_list = []
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [call([model.user.id], model.survey.id)])
+        tasks.send_cohort_surveys.delay.call_args_list = []
 
-    @patch("breathecode.feedback.tasks.send_cohort_survey.delay", MagicMock())
+    @patch("breathecode.feedback.tasks.send_cohort_surveys.delay", MagicMock())
     @patch("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
     @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
     @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
@@ -231,4 +231,4 @@ class AnswerTestSuite(FeedbackTestCase):
                 }
             ],
         )
-        self.assertEqual(tasks.send_cohort_survey.delay.call_args_list, [])
+        self.assertEqual(tasks.send_cohort_surveys.delay.call_args_list, [])
@@ -0,0 +1,108 @@
+"""
+Test send_cohort_surveys
+"""
+
+import logging
+from unittest.mock import MagicMock, call, patch
+
+import breathecode.feedback.tasks as tasks
+import breathecode.notify.actions as actions
+from breathecode.feedback.tasks import send_cohort_surveys
+
+from ..mixins import FeedbackTestCase
+
+
+def apply_get_env(configuration={}):
+
+    def get_env(key, value=None):
+        return configuration.get(key, value)
+
+    return get_env
+
+
+class SendCohortSurveys(FeedbackTestCase):
+    """Test send_cohort_surveys"""
+
+    @patch("os.getenv", MagicMock(side_effect=apply_get_env({"API_URL": "https://hello.com"})))
+    @patch("breathecode.feedback.tasks.generate_user_cohort_survey_answers", MagicMock())
+    @patch("logging.Logger.error", MagicMock())
+    @patch("logging.Logger.info", MagicMock())
+    @patch("breathecode.notify.actions.send_email_messages", MagicMock())
+    @patch("breathecode.notify.utils.hook_manager.HookManagerClass.process_model_event", MagicMock())
+    @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    def test_one_bulk_email_for_the_students(self):
+        cohort_users = [
+            {"role": "STUDENT", "educational_status": "ACTIVE", "user_id": 1},
+            {"role": "STUDENT", "educational_status": "GRADUATED", "user_id": 2},
+        ]
+
+        with patch("breathecode.activity.tasks.get_attendancy_log.delay", MagicMock()):
+            model = self.generate_models(cohort=1, user=2, survey=1, cohort_user=cohort_users)
+            logging.Logger.info.call_args_list = []
+
+        send_cohort_surveys.delay([1, 2], model.survey.id)
+
+        self.assertEqual(logging.Logger.info.call_args_list, [call("Starting send_cohort_surveys")])
+        self.assertEqual(logging.Logger.error.call_args_list, [])
+        self.assertEqual(
+            tasks.generate_user_cohort_survey_answers.call_args_list,
+            [call(model.user[0], model.survey, status="SENT"), call(model.user[1], model.survey, status="SENT")],
+        )
+
+        tokens = self.bc.database.list_of("authenticate.Token")
+        links = {
+            token["user_id"]: f"https://nps.4geeks.com/survey/{model.survey.id}?token={token['key']}"
+            for token in tokens
+        }
+
+        self.assertEqual(
+            actions.send_email_messages.call_args_list,
+            [
+                call(
+                    "nps_survey",
+                    {
+                        model.user[0].email: {"LINK": links[1]},
+                        model.user[1].email: {"LINK": links[2]},
+                    },
+                    {
+                        "SUBJECT": "We need your feedback",
+                        "MESSAGE": "Please take 5 minutes to give us feedback about your experience at the academy so far.",
+                        "TRACKER_URL": f"https://hello.com/v1/feedback/survey/{model.survey.id}/tracker.png",
+                        "BUTTON": "Answer the question",
+                    },
+                    academy=model.academy,
+                )
+            ],
+        )
+
+    @patch("breathecode.feedback.tasks.generate_user_cohort_survey_answers", MagicMock())
+    @patch("logging.Logger.error", MagicMock())
+    @patch("logging.Logger.info", MagicMock())
+    @patch("breathecode.notify.actions.send_email_messages", MagicMock())
+    @patch("breathecode.notify.utils.hook_manager.HookManagerClass.process_model_event", MagicMock())
+    @patch("django.db.models.signals.pre_delete.send_robust", MagicMock(return_value=None))
+    @patch("breathecode.admissions.signals.student_edu_status_updated.send_robust", MagicMock(return_value=None))
+    def test_skip_the_students_that_does_not_belong_to_the_cohort(self):
+        cohort_users = [
+            {"role": "STUDENT", "educational_status": "ACTIVE", "user_id": 1},
+            {"role": "STUDENT", "educational_status": "DROPPED", "user_id": 2},
+        ]
+
+        with patch("breathecode.activity.tasks.get_attendancy_log.delay", MagicMock()):
+            model = self.generate_models(cohort=1, user=2, survey=1, cohort_user=cohort_users)
+            logging.Logger.info.call_args_list = []
+
+        send_cohort_surveys.delay([1, 2], model.survey.id)
+
+        self.assertEqual(
+            logging.Logger.error.call_args_list,
+            [call(f"Survey {model.survey.id} not sent to user 2: This student does not belong to this cohort")],
+        )
+        self.assertEqual(
+            tasks.generate_user_cohort_survey_answers.call_args_list,
+            [call(model.user[0], model.survey, status="SENT")],
+        )
+
+        self.assertEqual(len(actions.send_email_messages.call_args_list), 1)
+        self.assertEqual(list(actions.send_email_messages.call_args_list[0].args[1]), [model.user[0].email])
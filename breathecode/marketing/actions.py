@@ -1,13 +1,16 @@
 import json
 import os
 import re
+from datetime import datetime
 from itertools import chain
 from typing import Optional
 
 import numpy as np
 import requests
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import F, Q
 from django.utils import timezone
+from django_redis import get_redis_connection
 from rest_framework.exceptions import APIException
 from task_manager.core.exceptions import RetryTask
 
@@ -18,7 +21,9 @@ from breathecode.utils import getLogger
 from breathecode.utils.i18n import translation
 from capyc.rest_framework.exceptions import ValidationException
 
-from .models import AcademyAlias, ActiveCampaignAcademy, Automation, FormEntry, Tag
+from .models import AcademyAlias, ActiveCampaignAcademy, Automation, FormEntry, ShortLink, Tag
+
+IS_DJANGO_REDIS = hasattr(cache, "delete_pattern")
 
 logger = getLogger(__name__)
 
@@ -755,3 +760,66 @@ def convert_data_frame(item):
         if isinstance(item[key], np.ndarray):
             item[key] = item[key].tolist()
     return item
+
+
+SHORT_LINK_CACHE_TIMEOUT = 60 * 5
+SHORT_LINK_HITS_KEY = "marketing:short-link:hits"
+SHORT_LINK_LAST_CLICKS_KEY = "marketing:short-link:last-clicks"
+
+
+def get_short_link_cache_key(slug: str) -> str:
+    return f"marketing:short-link:{slug}"
+
+
+def get_short_link(slug: str) -> Optional[dict]:
+    """Get the destination and the utm params of an active short link, they are cached by slug."""
+
+    key = get_short_link_cache_key(slug)
+    if (short_link := cache.get(key)) is not None:
+        return short_link
+
+    short_link = (
+        ShortLink.objects.filter(slug=slug, active=True)
+        .values("slug", "destination", "utm_source", "utm_content", "utm_medium", "utm_campaign")
+        .first()
+    )
+
+    if short_link is not None:
+        cache.set(key, short_link, SHORT_LINK_CACHE_TIMEOUT)
+
+    return short_link
+
+
+def count_short_link_click(slug: str) -> None:
+    """Count a click of a short link, it is buffered in redis until `flush_short_link_hits` saves it."""
+
+    now = timezone.now()
+
+    if not IS_DJANGO_REDIS:
+        ShortLink.objects.filter(slug=slug).update(hits=F("hits") + 1, lastclick_at=now)
+        return
+
+    client = get_redis_connection("default")
+    pipe = client.pipeline()
+    pipe.hincrby(SHORT_LINK_HITS_KEY, slug, 1)
+    pipe.hset(SHORT_LINK_LAST_CLICKS_KEY, slug, now.isoformat())
+    pipe.execute()
+
+
+def pop_short_link_hits() -> tuple[dict[str, int], dict[str, datetime]]:
+    """Get and reset the buffered clicks, it returns the hits and the last click of each slug."""
+
+    if not IS_DJANGO_REDIS:
+        return {}, {}
+
+    client = get_redis_connection("default")
+    pipe = client.pipeline(transaction=True)
+    pipe.hgetall(SHORT_LINK_HITS_KEY)
+    pipe.hgetall(SHORT_LINK_LAST_CLICKS_KEY)
+    pipe.delete(SHORT_LINK_HITS_KEY, SHORT_LINK_LAST_CLICKS_KEY)
+    hits, last_clicks, _ = pipe.execute()
+
+    hits = {k.decode(): int(v) for k, v in hits.items()}
+    last_clicks = {k.decode(): datetime.fromisoformat(v.decode()) for k, v in last_clicks.items()}
+
+    return hits, last_clicks
@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from breathecode.marketing import tasks
+
+
+def get_short_link_flush_rate():
+    env = os.getenv("SHORT_LINK_FLUSH_RATE")
+    if env:
+        return int(env)
+
+    return 60
+
+
+class Command(BaseCommand):
+    help = "Schedule the flush of the buffered short link hits for the next 10 minutes"
+
+    def handle(self, *args, **options):
+        utc_now = timezone.now()
+        flush_rate = get_short_link_flush_rate()
+
+        ends = utc_now + timezone.timedelta(minutes=10)
+
+        cursor = utc_now
+        while cursor < ends:
+            cursor += timezone.timedelta(seconds=flush_rate)
+            tasks.flush_short_link_hits.apply_async(args=(), eta=cursor)
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
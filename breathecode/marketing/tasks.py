@@ -1,8 +1,14 @@
+import hashlib
 import os
 import re
+import uuid
 from typing import Any, Optional
 
+import pandas as pd
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce, Concat, Lower
 from django.utils import timezone
 from requests.exceptions import Timeout
 from task_manager.core.exceptions import AbortTask, RetryTask
@@ -18,6 +24,8 @@ from breathecode.utils.decorators import TaskPriority
 
 from .actions import (
     bind_formentry_with_webhook,
+    count_short_link_click,
+    pop_short_link_hits,
     register_new_lead,
     save_get_geolocal,
     update_deal_custom_fields,
@@ -36,6 +44,13 @@ from .serializers import PostFormEntrySerializer
 logger = getLogger(__name__)
 is_test_env = os.getenv("ENV") == "test"
 
+IMPORT_BATCH_SIZE = 1000
+PERSIST_MAX_ATTEMPTS = 3
+PERSIST_RETRY_DELAY = 60
+SHORT_LINK_CHECK_INTERVAL = 60 * 60
+NAME_PATTERN = r"^[A-Za-zÀ-ÖØ-öø-ÿ ]+$"
+EMAIL_PATTERN = r'(?:[a-z0-9!#$%&\'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&\'*+/=?^_`{|}~-]+)*|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])'
+
 
 @task(priority=TaskPriority.MARKETING.value)
 def persist_single_lead(form_data, **_: Any):
@@ -79,28 +94,53 @@ def persist_single_lead(form_data, **_: Any):
 
 @task(priority=TaskPriority.MARKETING.value)
 def update_link_viewcount(slug, **_: Any):
+    """Kept for the tasks that were enqueued before the clicks were buffered."""
+
     logger.info("Starting update_link_viewcount")
+    count_short_link_click(slug)
+
+
+@task(priority=TaskPriority.MARKETING.value)
+def flush_short_link_hits(**_: Any):
+    logger.info("Starting flush_short_link_hits")
+
+    hits, last_clicks = pop_short_link_hits()
+    if not hits:
+        return
+
+    # every buffered click is saved in one update instead of one read-modify-write per click
+    now = timezone.now()
+    ShortLink.objects.filter(slug__in=hits).update(
+        hits=Case(*[When(slug=slug, then=F("hits") + n) for slug, n in hits.items()], default=F("hits")),
+        lastclick_at=Case(
+            *[When(slug=slug, then=Value(last_clicks.get(slug, now))) for slug in hits],
+            default=F("lastclick_at"),
+        ),
+    )
+
+    # the destinations are checked at most once per interval, only if the link was clicked
+    for slug in hits:
+        if cache.add(f"marketing:short-link:checked:{slug}", True, timeout=SHORT_LINK_CHECK_INTERVAL):
+            check_short_link_destination.delay(slug)
+
+    logger.info(f"{sum(hits.values())} hits saved for {len(hits)} short links")
+
+
+@task(priority=TaskPriority.MARKETING.value)
+def check_short_link_destination(slug, **_: Any):
+    logger.info("Starting check_short_link_destination")
 
     sl = ShortLink.objects.filter(slug=slug).first()
     if sl is None:
-        raise RetryTask(f"ShortLink with slug {slug} not found")
-
-    sl.hits = sl.hits + 1
-    sl.lastclick_at = timezone.now()
-    sl.save()
+        raise AbortTask(f"ShortLink with slug {slug} not found")
 
     result = test_link(url=sl.destination)
-    if result["status_code"] < 200 or result["status_code"] > 299:
-        sl.destination_status_text = result["status_text"]
-        sl.destination_status = "ERROR"
-        sl.save()
-
-        raise Exception(result["status_text"])
+    sl.destination_status_text = result["status_text"]
+    sl.destination_status = "ERROR" if result["status_code"] < 200 or result["status_code"] > 299 else "ACTIVE"
+    sl.save()
 
-    else:
-        sl.destination_status = "ACTIVE"
-        sl.destination_status_text = result["status_text"]
-        sl.save()
+    if sl.destination_status == "ERROR":
+        raise AbortTask(result["status_text"])
 
 
 @task(priority=TaskPriority.MARKETING.value)
@@ -376,7 +416,7 @@ def create_form_entry(csv_upload_id, **item):
         error_message += f"{message}, "
         logger.error(message)
 
-    if form_entry.first_name and not re.findall(r"^[A-Za-zÀ-ÖØ-öø-ÿ ]+$", form_entry.first_name):
+    if form_entry.first_name and not re.findall(NAME_PATTERN, form_entry.first_name):
         message = "first name has incorrect characters"
         error_message += f"{message}, "
         logger.error(message)
@@ -386,7 +426,7 @@ def create_form_entry(csv_upload_id, **item):
         error_message += f"{message}, "
         logger.error(message)
 
-    if form_entry.last_name and not re.findall(r"^[A-Za-zÀ-ÖØ-öø-ÿ ]+$", form_entry.last_name):
+    if form_entry.last_name and not re.findall(NAME_PATTERN, form_entry.last_name):
         message = "last name has incorrect characters"
         error_message += f"{message}, "
         logger.error(message)
@@ -396,9 +436,7 @@ def create_form_entry(csv_upload_id, **item):
         error_message += f"{message}, "
         logger.error(message)
 
-    email_pattern = r'(?:[a-z0-9!#$%&\'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&\'*+/=?^_`{|}~-]+)*|"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])'
-
-    if form_entry.email and not re.findall(email_pattern, form_entry.email, re.IGNORECASE):
+    if form_entry.email and not re.findall(EMAIL_PATTERN, form_entry.email, re.IGNORECASE):
         message = "email has incorrect format"
         error_message += f"{message}, "
         logger.error(message)
@@ -435,3 +473,139 @@ def create_form_entry(csv_upload_id, **item):
 
     else:
         raise Exception(error_message)
+
+
+@task(priority=TaskPriority.MARKETING.value)
+def import_form_entries(csv_upload_id: int, rows: list[dict[str, Any]], start: int = 0, **_: Any):
+    """Import a chunk of the rows of a CSVUpload, they are validated and saved in bulk."""
+
+    logger.info(f"Starting import_form_entries for CSVUpload {csv_upload_id}, rows {start + 1}-{start + len(rows)}")
+
+    csv_upload = CSVUpload.objects.filter(id=csv_upload_id).first()
+    if not csv_upload:
+        raise RetryTask("No CSVUpload found with this id")
+
+    df = pd.DataFrame(rows, index=range(start + 1, start + len(rows) + 1))
+    for field in ["first_name", "last_name", "email", "location", "academy"]:
+        if field not in df:
+            df[field] = ""
+
+        df[field] = df[field].fillna("").astype(str).str.strip()
+
+    first_names, last_names, emails = df["first_name"], df["last_name"], df["email"]
+
+    academy_slugs = set(df["academy"]) - {""}
+    academies = dict(Academy.objects.filter(slug__in=academy_slugs).values_list("slug", "id"))
+    academies.update(AcademyAlias.objects.filter(slug__in=academy_slugs).values_list("slug", "academy_id"))
+    df["academy_id"] = df["academy"].map(academies)
+    df.loc[df["academy"] == "", "academy_id"] = csv_upload.academy_id
+
+    locations = set(df["location"]) - {""}
+    locations = set(
+        AcademyAlias.objects.filter(active_campaign_slug__in=locations).values_list("active_campaign_slug", flat=True)
+    ) | set(Academy.objects.filter(active_campaign_slug__in=locations).values_list("active_campaign_slug", flat=True))
+    valid_locations = df["location"].isin(locations)
+
+    checks = pd.DataFrame(
+        {
+            "No first name in form entry": first_names == "",
+            "first name has incorrect characters": (first_names != "") & ~first_names.str.match(NAME_PATTERN),
+            "No last name in form entry": last_names == "",
+            "last name has incorrect characters": (last_names != "") & ~last_names.str.match(NAME_PATTERN),
+            "No email in form entry": emails == "",
+            "email has incorrect format": (emails != "") & ~emails.str.contains(EMAIL_PATTERN, case=False, regex=True),
+            "No academy exists with this location": (df["location"] != "") & ~valid_locations,
+            "No academy exists with this academy slug": (df["academy"] != "") & df["academy_id"].isna(),
+            "No location or academy in form entry": ~valid_locations | df["academy_id"].isna(),
+        }
+    )
+
+    # every row gets the comma separated list of the checks that it failed
+    errors = checks.dot(checks.columns + ", ").str.removesuffix(", ")
+    valid = errors == ""
+
+    # the emails are deduplicated inside of the file and against the existing entries
+    normalized_emails = emails.str.lower()
+    existing = set(
+        FormEntry.objects.annotate(normalized_email=Lower("email"))
+        .filter(normalized_email__in=set(normalized_emails[valid]))
+        .values_list("normalized_email", flat=True)
+    )
+    duplicated = valid & (normalized_emails.isin(existing) | normalized_emails.duplicated())
+    valid &= ~duplicated
+
+    entries = [
+        FormEntry(
+            first_name=row.first_name,
+            last_name=row.last_name,
+            email=row.email,
+            location=row.location,
+            academy_id=int(row.academy_id),
+            attribution_id=hashlib.sha256(uuid.uuid4().bytes).hexdigest()[:30],
+        )
+        for row in df[valid].itertuples()
+    ]
+
+    entries = FormEntry.objects.bulk_create(entries, batch_size=IMPORT_BATCH_SIZE)
+
+    log = [f"Row {n}: {message}." for n, message in errors[errors != ""].items()]
+    log += [f"Row {n}: email already registered, skipped." for n in duplicated[duplicated].index]
+
+    update = {"processed_rows": F("processed_rows") + len(df)}
+    if log:
+        update["status_message"] = Concat(Coalesce("status_message", Value("")), Value("\n".join(log) + "\n"))
+
+    if not errors.eq("").all():
+        update["status"] = "ERROR"
+
+    CSVUpload.objects.filter(id=csv_upload_id).update(**update)
+    CSVUpload.objects.filter(id=csv_upload_id, status="PENDING", processed_rows__gte=F("total_rows")).update(
+        status="DONE"
+    )
+
+    if entries:
+        persist_form_entries.delay([x.id for x in entries])
+
+    logger.info(f"import_form_entries created {len(entries)} form entries")
+
+
+@task(priority=TaskPriority.MARKETING.value)
+def persist_form_entries(form_entry_ids: list[int], attempt: int = 0, **_: Any):
+    """
+    Push a batch of form entries to ActiveCampaign, one failed lead does not stop the rest.
+
+    The entries that timed out are retried in a new batch with a growing delay, until `PERSIST_MAX_ATTEMPTS`.
+    """
+
+    logger.info(f"Starting persist_form_entries for {len(form_entry_ids)} form entries")
+
+    failures = 0
+    timed_out = []
+    for entry in FormEntry.objects.filter(id__in=form_entry_ids, storage_status="PENDING"):
+        form_data = PostFormEntrySerializer(entry).data
+
+        try:
+            lead = register_new_lead(form_data)
+
+        except Exception as e:
+            failures += 1
+            entry.storage_status = "ERROR"
+            entry.storage_status_text = str(e)
+
+            if isinstance(e, Timeout) and attempt + 1 < PERSIST_MAX_ATTEMPTS:
+                entry.storage_status = "PENDING"
+                timed_out.append(entry.id)
+
+            entry.save()
+            continue
+
+        if lead and not is_test_env and not form_data.get("city"):
+            save_get_geolocal(lead, form_data)
+
+    if timed_out:
+        persist_form_entries.apply_async(
+            args=[timed_out], kwargs={"attempt": attempt + 1}, countdown=PERSIST_RETRY_DELAY * 2**attempt
+        )
+
+    if failures:
+        logger.error(f"{failures} form entries could not be persisted in ActiveCampaign")
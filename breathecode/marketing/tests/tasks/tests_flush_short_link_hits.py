@@ -0,0 +1,68 @@
+"""
+Test flush_short_link_hits
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from breathecode.marketing import tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+UTC_NOW = timezone.now()
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("logging.Logger.info", MagicMock())
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    monkeypatch.setattr("breathecode.marketing.tasks.check_short_link_destination.delay", MagicMock())
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_nothing_buffered(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.marketing.tasks.pop_short_link_hits", MagicMock(return_value=({}, {})))
+    model = bc.database.create(short_link={"hits": 5})
+
+    tasks.flush_short_link_hits.delay()
+
+    assert bc.database.list_of("marketing.ShortLink") == [bc.format.to_dict(model.short_link)]
+    assert tasks.check_short_link_destination.delay.call_args_list == []
+
+
+def test_hits_are_saved_in_bulk(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    last_click = UTC_NOW - timezone.timedelta(seconds=30)
+    hits = {"kenny": 3, "kyle": 2}
+    monkeypatch.setattr(
+        "breathecode.marketing.tasks.pop_short_link_hits", MagicMock(return_value=(hits, {"kenny": last_click}))
+    )
+    model = bc.database.create(short_link=[{"slug": "kenny", "hits": 5}, {"slug": "kyle"}, {"slug": "stan"}])
+
+    with CaptureQueriesContext(connection) as ctx:
+        tasks.flush_short_link_hits.delay()
+
+    assert len([x for x in ctx.captured_queries if "marketing_shortlink" in x["sql"]]) == 1
+
+    assert bc.database.list_of("marketing.ShortLink") == [
+        {**bc.format.to_dict(model.short_link[0]), "hits": 8, "lastclick_at": last_click},
+        {**bc.format.to_dict(model.short_link[1]), "hits": model.short_link[1].hits + 2, "lastclick_at": UTC_NOW},
+        bc.format.to_dict(model.short_link[2]),
+    ]
+    assert tasks.check_short_link_destination.delay.call_args_list == [call("kenny"), call("kyle")]
+
+
+def test_destinations_are_checked_once_per_interval(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.marketing.tasks.pop_short_link_hits", MagicMock(return_value=({"kenny": 1}, {})))
+    bc.database.create(short_link={"slug": "kenny", "hits": 0})
+
+    tasks.flush_short_link_hits.delay()
+    tasks.flush_short_link_hits.delay()
+
+    assert bc.database.get("marketing.ShortLink", 1, dict=False).hits == 2
+    assert tasks.check_short_link_destination.delay.call_args_list == [call("kenny")]
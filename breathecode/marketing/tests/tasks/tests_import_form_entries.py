@@ -0,0 +1,108 @@
+"""
+Test import_form_entries
+"""
+
+import logging
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.marketing import tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("logging.Logger.info", MagicMock())
+    monkeypatch.setattr("logging.Logger.error", MagicMock())
+    monkeypatch.setattr("breathecode.marketing.tasks.persist_form_entries.delay", MagicMock())
+    yield
+
+
+def row(**kwargs):
+    return {
+        "first_name": "Rene",
+        "last_name": "Descartes",
+        "email": "rene@descartes.com",
+        "location": "downtown-miami",
+        "phone": "123456789",
+        "language": "en",
+        **kwargs,
+    }
+
+
+def test_no_csv_upload(bc: Breathecode):
+    tasks.import_form_entries.delay(1, [row()])
+
+    assert bc.database.list_of("marketing.FormEntry") == []
+    assert tasks.persist_form_entries.delay.call_args_list == []
+
+
+def test_rows_are_imported_in_bulk(bc: Breathecode):
+    academy = {"slug": "downtown-miami", "active_campaign_slug": "downtown-miami"}
+    model = bc.database.create(academy=academy, csv_upload={"total_rows": 2, "status": "PENDING"})
+
+    rows = [row(), row(first_name="Albert", last_name="Camus", email="albert@camus.com")]
+    tasks.import_form_entries.delay(model.csv_upload.id, rows)
+
+    entries = bc.database.list_of("marketing.FormEntry")
+    assert [(x["first_name"], x["email"], x["location"], x["academy_id"]) for x in entries] == [
+        ("Rene", "rene@descartes.com", "downtown-miami", 1),
+        ("Albert", "albert@camus.com", "downtown-miami", 1),
+    ]
+    assert all(len(x["attribution_id"]) == 30 for x in entries)
+
+    csv_upload = bc.database.get("monitoring.CSVUpload", 1, dict=False)
+    assert csv_upload.status == "DONE"
+    assert csv_upload.processed_rows == 2
+    assert csv_upload.status_message is None
+
+    assert tasks.persist_form_entries.delay.call_args_list == [call([1, 2])]
+
+
+def test_invalid_and_duplicated_rows(bc: Breathecode):
+    academy = {"slug": "downtown-miami", "active_campaign_slug": "downtown-miami"}
+    model = bc.database.create(
+        academy=academy,
+        csv_upload={"total_rows": 5, "status": "PENDING"},
+        form_entry={"email": "immanuel@kant.com", "academy_id": 1},
+    )
+
+    rows = [
+        row(),
+        row(first_name="R3n3", email="rene"),
+        row(email="RENE@descartes.com"),
+        row(email="immanuel@kant.com"),
+        row(location="nowhere"),
+    ]
+    tasks.import_form_entries.delay(model.csv_upload.id, rows, start=10)
+
+    entries = bc.database.list_of("marketing.FormEntry")
+    assert [x["email"] for x in entries] == ["immanuel@kant.com", "rene@descartes.com"]
+
+    csv_upload = bc.database.get("monitoring.CSVUpload", 1, dict=False)
+    assert csv_upload.status == "ERROR"
+    assert csv_upload.processed_rows == 5
+    assert csv_upload.status_message == (
+        "Row 12: first name has incorrect characters, email has incorrect format.\n"
+        "Row 15: No academy exists with this location, No location or academy in form entry.\n"
+        "Row 13: email already registered, skipped.\n"
+        "Row 14: email already registered, skipped.\n"
+    )
+
+    assert tasks.persist_form_entries.delay.call_args_list == [call([2])]
+    assert logging.Logger.info.call_args_list[-1] == call("import_form_entries created 1 form entries")
+
+
+def test_registered_emails_are_compared_case_insensitive(bc: Breathecode):
+    model = bc.database.create(
+        academy={"slug": "downtown-miami", "active_campaign_slug": "downtown-miami"},
+        csv_upload={"total_rows": 1, "status": "PENDING"},
+        form_entry={"email": "Rene@Descartes.com", "academy_id": 1},
+    )
+
+    tasks.import_form_entries.delay(model.csv_upload.id, [row()], start=0)
+
+    entries = bc.database.list_of("marketing.FormEntry")
+    assert [x["email"] for x in entries] == ["Rene@Descartes.com"]
+    assert tasks.persist_form_entries.delay.call_args_list == []
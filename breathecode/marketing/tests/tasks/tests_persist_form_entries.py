@@ -0,0 +1,51 @@
+"""
+Test persist_form_entries
+"""
+
+import logging
+from unittest.mock import MagicMock, call
+
+import pytest
+from requests.exceptions import Timeout
+
+from breathecode.marketing import tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("logging.Logger.info", MagicMock())
+    monkeypatch.setattr("logging.Logger.error", MagicMock())
+    monkeypatch.setattr("breathecode.marketing.tasks.persist_form_entries.apply_async", MagicMock())
+    yield
+
+
+def test_timed_out_entries_are_retried(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    side_effect = [Timeout("Kenny timed out"), Exception("Kyle is invalid"), None]
+    monkeypatch.setattr("breathecode.marketing.tasks.register_new_lead", MagicMock(side_effect=side_effect))
+
+    bc.database.create(form_entry=[{"storage_status": "PENDING"} for _ in range(3)])
+
+    tasks.persist_form_entries.delay([1, 2, 3], attempt=1)
+
+    entries = bc.database.list_of("marketing.FormEntry")
+    assert [(x["storage_status"], x["storage_status_text"]) for x in entries[:2]] == [
+        ("PENDING", "Kenny timed out"),
+        ("ERROR", "Kyle is invalid"),
+    ]
+    assert tasks.persist_form_entries.apply_async.call_args_list == [
+        call(args=[[1]], kwargs={"attempt": 2}, countdown=tasks.PERSIST_RETRY_DELAY * 2),
+    ]
+    assert logging.Logger.error.call_args_list == [call("2 form entries could not be persisted in ActiveCampaign")]
+
+
+def test_timed_out_entries_fail_after_the_last_attempt(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.marketing.tasks.register_new_lead", MagicMock(side_effect=Timeout("Timeout")))
+
+    bc.database.create(form_entry={"storage_status": "PENDING"})
+
+    tasks.persist_form_entries.delay([1], attempt=tasks.PERSIST_MAX_ATTEMPTS - 1)
+
+    entries = bc.database.list_of("marketing.FormEntry")
+    assert [x["storage_status"] for x in entries] == ["ERROR"]
+    assert tasks.persist_form_entries.apply_async.call_args_list == []
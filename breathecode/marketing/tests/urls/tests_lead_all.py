@@ -2,6 +2,8 @@
 Test /academy/lead
 """
 
+import csv
+import json
 import re
 import string
 from datetime import timedelta
@@ -493,3 +495,87 @@ class CohortUserTestSuite(MarketingTestCase):
         self.assertEqual(json, expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(self.all_form_entry_dict(), [{**self.model_to_dict(model, "form_entry")}])
+
+    """
+    🔽🔽🔽 Streaming
+    """
+
+    @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
+    @patch(GOOGLE_CLOUD_PATH["bucket"], apply_google_cloud_bucket_mock())
+    @patch(GOOGLE_CLOUD_PATH["blob"], apply_google_cloud_blob_mock())
+    def test_lead_all__stream_ndjson(self):
+        """Test /lead/all?stream=ndjson"""
+        self.headers(academy=1)
+        url = reverse_lazy("marketing:lead_all") + "?stream=ndjson"
+        model = self.generate_models(
+            authenticate=True,
+            profile_academy=True,
+            capability="read_lead",
+            role="potato",
+            form_entry=(2, generate_form_entry_kwargs()),
+        )
+
+        response = self.client.get(url)
+        content = b"".join(response.streaming_content).decode("utf-8")
+        lines = [json.loads(x) for x in content.splitlines()]
+
+        self.assertEqual([x["id"] for x in lines], [x.id for x in model.form_entry])
+        self.assertEqual(
+            [x["academy"] for x in lines],
+            [
+                {
+                    "id": x.academy.id,
+                    "name": x.academy.name,
+                    "slug": x.academy.slug,
+                }
+                for x in model.form_entry
+            ],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="leads.ndjson"')
+
+    @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
+    @patch(GOOGLE_CLOUD_PATH["bucket"], apply_google_cloud_bucket_mock())
+    @patch(GOOGLE_CLOUD_PATH["blob"], apply_google_cloud_blob_mock())
+    def test_lead_all__stream_json(self):
+        """Test /lead/all?stream=json"""
+        self.headers(academy=1)
+        url = reverse_lazy("marketing:lead_all") + "?stream=json"
+        model = self.generate_models(
+            authenticate=True,
+            profile_academy=True,
+            capability="read_lead",
+            role="potato",
+            form_entry=(2, generate_form_entry_kwargs()),
+        )
+
+        response = self.client.get(url)
+        data = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual([x["id"] for x in data], [x.id for x in model.form_entry])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
+    @patch(GOOGLE_CLOUD_PATH["bucket"], apply_google_cloud_bucket_mock())
+    @patch(GOOGLE_CLOUD_PATH["blob"], apply_google_cloud_blob_mock())
+    def test_lead_all__stream_csv(self):
+        """Test /lead/all?stream=csv"""
+        self.headers(academy=1)
+        url = reverse_lazy("marketing:lead_all") + "?stream=csv"
+        model = self.generate_models(
+            authenticate=True,
+            profile_academy=True,
+            capability="read_lead",
+            role="potato",
+            form_entry=(2, generate_form_entry_kwargs()),
+        )
+
+        response = self.client.get(url)
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode("utf-8").splitlines()))
+
+        self.assertEqual([int(x["id"]) for x in rows], [x.id for x in model.form_entry])
+        self.assertEqual([x["academy.slug"] for x in rows], [x.academy.slug for x in model.form_entry])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
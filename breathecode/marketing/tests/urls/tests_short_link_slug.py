@@ -0,0 +1,84 @@
+"""
+Test /s/<slug>
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+from django.urls.base import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+UTC_NOW = timezone.now()
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_not_found(bc: Breathecode, client):
+    url = reverse_lazy("marketing_shortner:slug", kwargs={"link_slug": "they-killed-kenny"})
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert bc.database.list_of("marketing.ShortLink") == []
+
+
+def test_inactive(bc: Breathecode, client):
+    model = bc.database.create(short_link={"slug": "they-killed-kenny", "active": False})
+
+    url = reverse_lazy("marketing_shortner:slug", kwargs={"link_slug": "they-killed-kenny"})
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert bc.database.list_of("marketing.ShortLink") == [bc.format.to_dict(model.short_link)]
+
+
+def test_redirect(bc: Breathecode, client):
+    short_link = {
+        "slug": "they-killed-kenny",
+        "active": True,
+        "hits": 0,
+        "destination": "https://4geeks.com/kenny?a=1",
+        "utm_source": "fb",
+        "utm_content": None,
+        "utm_medium": None,
+        "utm_campaign": "south-park",
+    }
+    model = bc.database.create(short_link=short_link)
+
+    url = reverse_lazy("marketing_shortner:slug", kwargs={"link_slug": "they-killed-kenny"})
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_302_FOUND
+    assert response.url == "https://4geeks.com/kenny?a=1&utm_source=fb&utm_campaign=south-park"
+    assert bc.database.list_of("marketing.ShortLink") == [
+        {
+            **bc.format.to_dict(model.short_link),
+            "hits": 1,
+            "lastclick_at": UTC_NOW,
+        },
+    ]
+
+
+def test_destination_is_cached(bc: Breathecode, client, django_assert_num_queries):
+    short_link = {"slug": "they-killed-kenny", "active": True, "hits": 0, "destination": "https://4geeks.com/kenny"}
+    model = bc.database.create(short_link=short_link)
+
+    url = reverse_lazy("marketing_shortner:slug", kwargs={"link_slug": "they-killed-kenny"})
+    client.get(url)
+
+    # just the update of the hits
+    with django_assert_num_queries(1):
+        response = client.get(url)
+
+    assert response.status_code == status.HTTP_302_FOUND
+    assert response.url == "https://4geeks.com/kenny?"
+    assert bc.database.get("marketing.ShortLink", 1, dict=False).hits == 2
@@ -106,7 +106,7 @@ class MarketingTestSuite(MarketingTestCase):
         self.assertEqual(File.upload.call_args_list, [])
         self.assertEqual(File.url.call_args_list, [])
 
-    @patch("breathecode.marketing.tasks.create_form_entry.delay", MagicMock())
+    @patch("breathecode.marketing.tasks.import_form_entries.delay", MagicMock())
     @patch.multiple(
         "breathecode.services.google_cloud.Storage",
         __init__=MagicMock(return_value=None),
@@ -125,7 +125,7 @@ class MarketingTestSuite(MarketingTestCase):
     @patch("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
     def test_upload_random(self):
         from breathecode.services.google_cloud import Storage, File
-        from breathecode.marketing.tasks import create_form_entry
+        from breathecode.marketing.tasks import import_form_entries
 
         self.headers(academy=1)
 
@@ -174,40 +174,22 @@ class MarketingTestSuite(MarketingTestCase):
             self.assertEqual(json, expected)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(
-                create_form_entry.delay.call_args_list,
+                import_form_entries.delay.call_args_list,
                 [
                     call(
                         1,
-                        **{
-                            "first_name": df.iloc[0]["first_name"],
-                            "last_name": df.iloc[0]["last_name"],
-                            "email": df.iloc[0]["email"],
-                            "location": df.iloc[0]["location"],
-                            "phone": df.iloc[0]["phone"],
-                            "language": df.iloc[0]["language"],
-                        }
-                    ),
-                    call(
-                        1,
-                        **{
-                            "first_name": df.iloc[1]["first_name"],
-                            "last_name": df.iloc[1]["last_name"],
-                            "email": df.iloc[1]["email"],
-                            "location": df.iloc[1]["location"],
-                            "phone": df.iloc[1]["phone"],
-                            "language": df.iloc[1]["language"],
-                        }
-                    ),
-                    call(
-                        1,
-                        **{
-                            "first_name": df.iloc[2]["first_name"],
-                            "last_name": df.iloc[2]["last_name"],
-                            "email": df.iloc[2]["email"],
-                            "location": df.iloc[2]["location"],
-                            "phone": df.iloc[2]["phone"],
-                            "language": df.iloc[2]["language"],
-                        }
+                        [
+                            {
+                                "first_name": df.iloc[n]["first_name"],
+                                "last_name": df.iloc[n]["last_name"],
+                                "email": df.iloc[n]["email"],
+                                "location": df.iloc[n]["location"],
+                                "phone": df.iloc[n]["phone"],
+                                "language": df.iloc[n]["language"],
+                            }
+                            for n in range(0, 3)
+                        ],
+                        start=0,
                     ),
                 ],
             )
@@ -225,6 +207,8 @@ class MarketingTestSuite(MarketingTestCase):
                         "log": "",
                         "status_message": None,
                         "url": "https://storage.cloud.google.com/media-breathecode/hardcoded_url",
+                        "total_rows": 3,
+                        "processed_rows": 0,
                     }
                 ],
             )
@@ -246,3 +230,47 @@ class MarketingTestSuite(MarketingTestCase):
             self.assertEqual(kwargs, {"content_type": "text/csv"})
 
             self.assertEqual(File.url.call_args_list, [call()])
+
+    @patch("breathecode.marketing.tasks.import_form_entries.delay", MagicMock())
+    @patch.multiple(
+        "breathecode.services.google_cloud.Storage",
+        __init__=MagicMock(return_value=None),
+        client=PropertyMock(),
+        create=True,
+    )
+    @patch.multiple(
+        "breathecode.services.google_cloud.File",
+        __init__=MagicMock(return_value=None),
+        bucket=PropertyMock(),
+        file_name=PropertyMock(),
+        upload=MagicMock(),
+        url=MagicMock(return_value="https://storage.cloud.google.com/media-breathecode/hardcoded_url"),
+        create=True,
+    )
+    def test_upload_missing_field(self):
+        from breathecode.services.google_cloud import Storage, File
+        from breathecode.marketing.tasks import import_form_entries
+
+        self.headers(academy=1)
+
+        model = self.generate_models(authenticate=True, profile_academy=True, capability="crud_media", role="potato")
+
+        url = reverse_lazy("marketing:upload")
+
+        file = tempfile.NamedTemporaryFile(suffix=".csv", delete=False, mode="w+")
+        self.file_name = file.name
+
+        df = pd.DataFrame({"first_name": [self.bc.fake.first_name()], "email": [self.bc.fake.email()]})
+        df.to_csv(file.name)
+
+        with open(file.name, "rb") as data:
+            response = self.client.put(url, {"name": file.name, "file": data})
+            json = response.json()
+
+            expected = {"detail": "missing-field", "status_code": 400}
+
+            self.assertEqual(json, expected)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(import_form_entries.delay.call_args_list, [])
+            self.assertEqual(self.bc.database.list_of("monitoring.CSVUpload"), [])
+            self.assertEqual(File.upload.call_args_list, [])
@@ -1,6 +1,7 @@
 import csv
 import datetime
 import hashlib
+import io
 import json
 import logging
 import os
@@ -31,14 +32,21 @@ from breathecode.marketing.caches import CourseCache
 from breathecode.monitoring.models import CSVUpload
 from breathecode.renderers import PlainTextRenderer
 from breathecode.services.activecampaign import ActiveCampaign
-from breathecode.utils import GenerateLookupsMixin, HeaderLimitOffsetPagination, capable_of, localize_query
+from breathecode.utils import (
+    GenerateLookupsMixin,
+    HeaderLimitOffsetPagination,
+    StreamingListResponse,
+    capable_of,
+    get_streaming_format,
+    localize_query,
+)
 from breathecode.utils.api_view_extensions.api_view_extensions import APIViewExtensions
 from breathecode.utils.decorators import validate_captcha, validate_captcha_challenge
 from breathecode.utils.find_by_full_name import query_like_by_full_name
 from breathecode.utils.i18n import translation
 from capyc.rest_framework.exceptions import ValidationException
 
-from .actions import convert_data_frame, sync_automations, sync_tags, validate_email
+from .actions import count_short_link_click, get_short_link, sync_automations, sync_tags, validate_email
 from .models import (
     AcademyAlias,
     ActiveCampaignAcademy,
@@ -71,7 +79,7 @@ from .serializers import (
     TagSmallSerializer,
     UTMSmallSerializer,
 )
-from .tasks import async_activecampaign_webhook, persist_single_lead, update_link_viewcount
+from .tasks import async_activecampaign_webhook, persist_single_lead
 
 logger = logging.getLogger(__name__)
 MIME_ALLOW = "text/csv"
@@ -381,24 +389,24 @@ def sync_automations_with_active_campaign(request, academy_id):
 
 
 def redirect_link(request, link_slug):
-    short_link = ShortLink.objects.filter(slug=link_slug, active=True).first()
+    short_link = get_short_link(link_slug)
     if short_link is None:
         return HttpResponseNotFound("URL not found")
 
-    update_link_viewcount.delay(short_link.slug)
+    count_short_link_click(link_slug)
 
     params = {}
-    if short_link.utm_source is not None:
-        params["utm_source"] = short_link.utm_source
-    if short_link.utm_content is not None:
-        params["utm_content"] = short_link.utm_content
-    if short_link.utm_medium is not None:
-        params["utm_medium"] = short_link.utm_medium
-    if short_link.utm_campaign is not None:
-        params["utm_campaign"] = short_link.utm_campaign
+    if short_link["utm_source"] is not None:
+        params["utm_source"] = short_link["utm_source"]
+    if short_link["utm_content"] is not None:
+        params["utm_content"] = short_link["utm_content"]
+    if short_link["utm_medium"] is not None:
+        params["utm_medium"] = short_link["utm_medium"]
+    if short_link["utm_campaign"] is not None:
+        params["utm_campaign"] = short_link["utm_campaign"]
 
     destination_params = {}
-    url_parts = short_link.destination.split("?")
+    url_parts = short_link["destination"].split("?")
     if len(url_parts) > 1:
         destination_params = dict(parse.parse_qsl(url_parts[1]))
 
@@ -428,6 +436,11 @@ def get_leads(request, id=None):
         items = items.filter(created_at__lte=end_date)
 
     items = items.order_by("created_at")
+
+    if stream := get_streaming_format(request):
+        items = items.select_related("academy")
+        return StreamingListResponse(items, format=stream, serializer=FormEntrySerializer, filename="leads")
+
     serializer = FormEntrySerializer(items, many=True)
     return Response(serializer.data)
 
@@ -468,6 +481,10 @@ def get_leads_report(request, id=None):
             created_date=Func(F("created_at"), Value("YYYYMMDD"), function="to_char", output_field=CharField())
         )
     # items = items.order_by('created_at')
+
+    if stream := get_streaming_format(request):
+        return StreamingListResponse(items, format=stream, filename="leads-report")
+
     return Response(items)
 
 
@@ -1051,18 +1068,15 @@ class UploadView(APIView):
 
         file_name = hashlib.sha256(file_bytes).hexdigest()
 
-        file_bytes = file_bytes.decode("utf-8")
-
-        with open(file.name, "w") as f:
-            f.write(file_bytes)
-        df = pd.read_csv(file.name)
-        os.remove(file.name)
+        # the file is read from memory, the rows are kept as strings to be validated by the import task
+        df = pd.read_csv(io.BytesIO(file_bytes), dtype=str, keep_default_na=False)
+        df = df.drop(columns=["Unnamed: 0"], errors="ignore")
         required_fields = ["first_name", "last_name", "email", "location", "phone", "language"]
 
         # Think about uploading correct files and leaving out incorrect ones
         for item in required_fields:
-            if item not in df.keys():
-                return ValidationException(f"{item} field missing inside of csv")
+            if item not in df.columns:
+                raise ValidationException(f"{item} field missing inside of csv", slug="missing-field")
 
         data = {"file_name": file.name, "status": "PENDING", "message": "Despues"}
 
@@ -1077,6 +1091,7 @@ class UploadView(APIView):
             csv_upload.name = file.name
             csv_upload.hash = file_name
             csv_upload.academy_id = academy_id
+            csv_upload.total_rows = len(df)
             csv_upload.save()
 
         except CircuitBreakerError:
@@ -1093,11 +1108,10 @@ class UploadView(APIView):
                 code=503,
             )
 
-        for num in range(len(df)):
-            value = df.iloc[num]
-            logger.info(dict(value))
-            parsed = convert_data_frame(dict(value))
-            tasks.create_form_entry.delay(csv_upload.id, **parsed)
+        # the rows are imported in chunks instead of one task per row
+        for start in range(0, len(df), tasks.IMPORT_BATCH_SIZE):
+            rows = df.iloc[start : start + tasks.IMPORT_BATCH_SIZE].to_dict("records")
+            tasks.import_form_entries.delay(csv_upload.id, rows, start=start)
 
         return data
 
@@ -0,0 +1,142 @@
+import hashlib
+import threading
+from typing import Optional
+
+import requests
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import F, Q
+from django_redis import get_redis_connection
+
+from breathecode.utils import getLogger, num_to_roman
+
+from .models import Media, MediaResolution
+
+IS_DJANGO_REDIS = hasattr(cache, "delete_pattern")
+
+logger = getLogger(__name__)
+
+MEDIA_HITS_KEY = "media:hits"
+MEDIA_RESOLUTION_HITS_KEY = "media:resolution:hits"
+MEDIA_RESIZE_LOCK_TIMEOUT = 60 * 5
+MEDIA_PROXY_MAX_CONNECTIONS = 20
+MEDIA_HASH_CHUNK_SIZE = 1024 * 1024
+
+session_lock = threading.Lock()
+session: Optional[requests.Session] = None
+
+
+def get_media_session() -> requests.Session:
+    """Get the session used to proxy the masked files, it keeps a pool of connections to the bucket."""
+
+    global session
+
+    if session is None:
+        with session_lock:
+            if session is None:
+                s = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=MEDIA_PROXY_MAX_CONNECTIONS, pool_maxsize=MEDIA_PROXY_MAX_CONNECTIONS
+                )
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                session = s
+
+    return session
+
+
+def get_resize_lock_key(hash: str, width: Optional[str], height: Optional[str]) -> str:
+    return f"media:resize:{hash}:{width or ''}x{height or ''}"
+
+
+def request_media_resize(media: Media, width: Optional[str] = None, height: Optional[str] = None) -> bool:
+    """Schedule the resize of a media, it returns False if the same resize is already pending."""
+
+    from . import tasks
+
+    # the lock is not released after the resize, if the cloud function failed it works as a backoff
+    if not cache.add(get_resize_lock_key(media.hash, width, height), True, timeout=MEDIA_RESIZE_LOCK_TIMEOUT):
+        return False
+
+    tasks.resize_image.delay(media.hash, width=width, height=height)
+    return True
+
+
+def count_media_hit(media_id: int, resolution_id: Optional[int] = None) -> None:
+    """Count a hit of a media, it is buffered in redis until `flush_media_hits` saves it."""
+
+    if not IS_DJANGO_REDIS:
+        Media.objects.filter(id=media_id).update(hits=F("hits") + 1)
+        if resolution_id:
+            MediaResolution.objects.filter(id=resolution_id).update(hits=F("hits") + 1)
+        return
+
+    client = get_redis_connection("default")
+    pipe = client.pipeline()
+    pipe.hincrby(MEDIA_HITS_KEY, media_id, 1)
+    if resolution_id:
+        pipe.hincrby(MEDIA_RESOLUTION_HITS_KEY, resolution_id, 1)
+    pipe.execute()
+
+
+def pop_media_hits() -> tuple[dict[int, int], dict[int, int]]:
+    """Get and reset the buffered hits, it returns the hits of each media and of each resolution."""
+
+    if not IS_DJANGO_REDIS:
+        return {}, {}
+
+    client = get_redis_connection("default")
+    pipe = client.pipeline(transaction=True)
+    pipe.hgetall(MEDIA_HITS_KEY)
+    pipe.hgetall(MEDIA_RESOLUTION_HITS_KEY)
+    pipe.delete(MEDIA_HITS_KEY, MEDIA_RESOLUTION_HITS_KEY)
+    media_hits, resolution_hits, _ = pipe.execute()
+
+    media_hits = {int(k): int(v) for k, v in media_hits.items()}
+    resolution_hits = {int(k): int(v) for k, v in resolution_hits.items()}
+
+    return media_hits, resolution_hits
+
+
+def hash_media_file(file: UploadedFile) -> str:
+    """Get the sha256 of an uploaded file, it is read one chunk at a time."""
+
+    hash = hashlib.sha256()
+    for chunk in file.chunks(chunk_size=MEDIA_HASH_CHUNK_SIZE):
+        hash.update(chunk)
+
+    return hash.hexdigest()
+
+
+def allocate_media_slugs(items: list[tuple[str, str]]) -> list[str]:
+    """
+    Get an available slug for each (slug, hash) pair.
+
+    A slug used by the media of another file gets a roman suffix, the taken slugs are read in one query.
+    """
+
+    if not items:
+        return []
+
+    query = Q()
+    for slug, _ in items:
+        query |= Q(slug__startswith=slug)
+
+    existing = list(Media.objects.filter(query).values_list("slug", "hash"))
+    taken = {slug for slug, _ in existing}
+
+    slugs = []
+    for slug, hash in items:
+        slug_number = len([x for x, y in existing if x.startswith(slug) and y != hash]) + 1
+        result = slug
+
+        if slug_number > 1 or slug in slugs:
+            slug_number = max(slug_number, 2)
+            result = f"{slug}-{num_to_roman(slug_number, lower=True)}"
+            while result in taken or result in slugs:
+                slug_number += 1
+                result = f"{slug}-{num_to_roman(slug_number, lower=True)}"
+
+        slugs.append(result)
+
+    return slugs
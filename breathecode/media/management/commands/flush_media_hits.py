@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from breathecode.media import tasks
+
+
+def get_media_hits_flush_rate():
+    env = os.getenv("MEDIA_HITS_FLUSH_RATE")
+    if env:
+        return int(env)
+
+    return 60
+
+
+class Command(BaseCommand):
+    help = "Schedule the flush of the buffered media hits for the next 10 minutes"
+
+    def handle(self, *args, **options):
+        utc_now = timezone.now()
+        flush_rate = get_media_hits_flush_rate()
+
+        ends = utc_now + timezone.timedelta(minutes=10)
+
+        cursor = utc_now
+        while cursor < ends:
+            cursor += timezone.timedelta(seconds=flush_rate)
+            tasks.flush_media_hits.apply_async(args=(), eta=cursor)
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
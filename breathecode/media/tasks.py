@@ -0,0 +1,68 @@
+import os
+from typing import Any, Optional
+
+from django.db.models import Case, F, When
+from task_manager.core.exceptions import AbortTask
+from task_manager.django.decorators import task
+
+from breathecode.services.google_cloud import FunctionV1
+from breathecode.utils import getLogger
+from breathecode.utils.decorators import TaskPriority
+
+from .actions import pop_media_hits
+from .models import Media, MediaResolution
+
+logger = getLogger(__name__)
+
+
+@task(priority=TaskPriority.CONTENT.value)
+def resize_image(hash: str, width: Optional[str] = None, height: Optional[str] = None, **_: Any):
+    logger.info("Starting resize_image")
+
+    resolution = MediaResolution.objects.filter(hash=hash)
+    if width and resolution.filter(width=width).exists():
+        return
+
+    if height and resolution.filter(height=height).exists():
+        return
+
+    func = FunctionV1(region="us-central1", project_id=os.getenv("GOOGLE_PROJECT_ID", ""), name="resize-image")
+
+    func_request = func.call(
+        {
+            "width": width,
+            "height": height,
+            "filename": hash,
+            "bucket": os.getenv("MEDIA_GALLERY_BUCKET"),
+        }
+    )
+
+    res = func_request.json()
+
+    if not res["status_code"] == 200 or not res["message"] == "Ok":
+        if "message" in res:
+            raise AbortTask(res["message"])
+
+        raise AbortTask("Unhandled request from cloud functions")
+
+    MediaResolution.objects.get_or_create(width=res["width"], height=res["height"], hash=hash)
+
+
+@task(priority=TaskPriority.CONTENT.value)
+def flush_media_hits(**_: Any):
+    logger.info("Starting flush_media_hits")
+
+    media_hits, resolution_hits = pop_media_hits()
+
+    # every buffered hit is saved in one update per table instead of one save per request
+    if media_hits:
+        Media.objects.filter(id__in=media_hits).update(
+            hits=Case(*[When(id=id, then=F("hits") + n) for id, n in media_hits.items()], default=F("hits"))
+        )
+
+    if resolution_hits:
+        MediaResolution.objects.filter(id__in=resolution_hits).update(
+            hits=Case(*[When(id=id, then=F("hits") + n) for id, n in resolution_hits.items()], default=F("hits"))
+        )
+
+    logger.info(f"{sum(media_hits.values())} hits saved for {len(media_hits)} media")
@@ -0,0 +1,41 @@
+"""
+Test allocate_media_slugs
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from breathecode.media.actions import allocate_media_slugs
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db):
+    yield
+
+
+def test_no_items(bc: Breathecode):
+    with CaptureQueriesContext(connection) as ctx:
+        assert allocate_media_slugs([]) == []
+
+    assert len(ctx.captured_queries) == 0
+
+
+def test_available_slugs(bc: Breathecode):
+    bc.database.create(media={"slug": "kenny-png", "hash": "a"})
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert allocate_media_slugs([("kyle-png", "b"), ("kenny-png", "a")]) == ["kyle-png", "kenny-png"]
+
+    assert len(ctx.captured_queries) == 1
+
+
+def test_taken_slugs(bc: Breathecode):
+    bc.database.create(media=[{"slug": "kenny-png", "hash": "a"}, {"slug": "kenny-png-iii", "hash": "b"}])
+
+    with CaptureQueriesContext(connection) as ctx:
+        slugs = allocate_media_slugs([("kenny-png", "c"), ("kenny-png", "d"), ("kyle-png", "e"), ("kyle-png", "f")])
+
+    assert slugs == ["kenny-png-iv", "kenny-png-v", "kyle-png", "kyle-png-ii"]
+    assert len(ctx.captured_queries) == 1
@@ -0,0 +1,52 @@
+"""
+Test flush_media_hits
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from breathecode.media import tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("logging.Logger.info", MagicMock())
+    yield
+
+
+def test_nothing_buffered(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.media.tasks.pop_media_hits", MagicMock(return_value=({}, {})))
+    model = bc.database.create(media={"hits": 5}, media_resolution={"hits": 3})
+
+    tasks.flush_media_hits.delay()
+
+    assert bc.database.list_of("media.Media") == [bc.format.to_dict(model.media)]
+    assert bc.database.list_of("media.MediaResolution") == [bc.format.to_dict(model.media_resolution)]
+
+
+def test_hits_are_saved_in_bulk(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.media.tasks.pop_media_hits", MagicMock(return_value=({1: 3, 2: 2}, {2: 4})))
+    model = bc.database.create(
+        media=[{"hits": 5}, {"hits": 0}, {"hits": 1}],
+        media_resolution=[{"hits": 1}, {"hits": 2}],
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        tasks.flush_media_hits.delay()
+
+    assert len([x for x in ctx.captured_queries if 'UPDATE "media_media"' in x["sql"]]) == 1
+    assert len([x for x in ctx.captured_queries if 'UPDATE "media_mediaresolution"' in x["sql"]]) == 1
+
+    assert bc.database.list_of("media.Media") == [
+        {**bc.format.to_dict(model.media[0]), "hits": 8},
+        {**bc.format.to_dict(model.media[1]), "hits": 2},
+        bc.format.to_dict(model.media[2]),
+    ]
+    assert bc.database.list_of("media.MediaResolution") == [
+        bc.format.to_dict(model.media_resolution[0]),
+        {**bc.format.to_dict(model.media_resolution[1]), "hits": 6},
+    ]
@@ -0,0 +1,85 @@
+"""
+Test resize_image
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.media import tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+from breathecode.tests.mocks.requests import apply_requests_request_mock
+
+RESIZE_IMAGE_URL = "https://us-central1-labor-day-story.cloudfunctions.net/resize-image"
+ENV = {"GOOGLE_PROJECT_ID": "labor-day-story", "MEDIA_GALLERY_BUCKET": "bucket-name"}
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("logging.Logger.info", MagicMock())
+    monkeypatch.setattr("logging.Logger.error", MagicMock())
+    monkeypatch.setattr("os.getenv", MagicMock(side_effect=lambda key, value=None: ENV.get(key, value)))
+    monkeypatch.setattr("google.oauth2.id_token.fetch_id_token", MagicMock(return_value="blablabla"))
+    yield
+
+
+def resize_call(width=None, height=None):
+    width = f'"{width}"' if width else "null"
+    height = f'"{height}"' if height else "null"
+
+    return call(
+        "POST",
+        RESIZE_IMAGE_URL,
+        data=f'{{"width": {width}, "height": {height}, "filename": "harcoded", "bucket": "bucket-name"}}',
+        headers={
+            "Authorization": "Bearer blablabla",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        },
+        params={},
+        timeout=2,
+    )
+
+
+def test_resolution_exists(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    model = bc.database.create(media_resolution={"width": 1000, "height": 500, "hash": "harcoded"})
+    mock = apply_requests_request_mock([(200, RESIZE_IMAGE_URL, {})])
+    monkeypatch.setattr("requests.request", mock)
+
+    tasks.resize_image.delay("harcoded", width="1000")
+
+    assert mock.call_args_list == []
+    assert bc.database.list_of("media.MediaResolution") == [bc.format.to_dict(model.media_resolution)]
+
+
+@pytest.mark.parametrize("width, height", [("1000", None), (None, "500")])
+def test_resolution_is_created(bc: Breathecode, monkeypatch: pytest.MonkeyPatch, width, height):
+    data = {"message": "Ok", "status_code": 200, "width": 1000, "height": 500}
+    mock = apply_requests_request_mock([(200, RESIZE_IMAGE_URL, data)])
+    monkeypatch.setattr("requests.request", mock)
+
+    tasks.resize_image.delay("harcoded", width=width, height=height)
+
+    assert mock.call_args_list == [resize_call(width=width, height=height)]
+    assert bc.database.list_of("media.MediaResolution") == [
+        {
+            "hash": "harcoded",
+            "height": 500,
+            "hits": 0,
+            "id": 1,
+            "width": 1000,
+            "created_at": bc.database.get("media.MediaResolution", 1, dict=False).created_at,
+            "updated_at": bc.database.get("media.MediaResolution", 1, dict=False).updated_at,
+        },
+    ]
+
+
+def test_cloud_function_error(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    data = {"message": "Incorrect width or height", "status_code": 400}
+    mock = apply_requests_request_mock([(400, RESIZE_IMAGE_URL, data)])
+    monkeypatch.setattr("requests.request", mock)
+
+    tasks.resize_image.delay("harcoded", width="1000")
+
+    assert mock.call_args_list == [resize_call(width="1000")]
+    assert bc.database.list_of("media.MediaResolution") == []
@@ -135,7 +135,7 @@ class MediaTestSuite(MediaTestCase):
             )
         ),
     )
-    @patch(REQUESTS_PATH["get"], apply_requests_get_mock([(200, "https://potato.io", "ok")]))
+    @patch("requests.Session.get", apply_requests_get_mock([(200, "https://potato.io", "ok")]))
     def test_file_id_with_mask_true(self):
         """Test /answer without auth"""
         self.headers(academy=1)
@@ -157,6 +157,46 @@ class MediaTestSuite(MediaTestCase):
         )
         self.assertEqual(self.all_media_resolution_dict(), [])
 
+    @patch(
+        "os.getenv",
+        MagicMock(
+            side_effect=apply_get_env(
+                {
+                    "GOOGLE_PROJECT_ID": "labor-day-story",
+                    "MEDIA_GALLERY_BUCKET": "bucket-name",
+                }
+            )
+        ),
+    )
+    def test_file_id_with_mask_true__with_range(self):
+        """Test /answer without auth"""
+        self.headers(academy=1)
+        media_kwargs = {"url": "https://potato.io"}
+        model = self.generate_models(academy=True, media=True, media_kwargs=media_kwargs)
+        headers = {"Content-Type": "text/plain", "Content-Range": "bytes 0-1/2", "Accept-Ranges": "bytes"}
+
+        url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?mask=true"
+        mock = apply_requests_get_mock([(206, "https://potato.io", "ok", headers)])
+
+        with patch("requests.Session.get", mock):
+            response = self.client.get(url, HTTP_RANGE="bytes=0-1")
+
+        self.assertEqual(response.getvalue().decode("utf-8"), "ok")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], "bytes 0-1/2")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(mock.call_args_list, [call("https://potato.io", headers={"Range": "bytes=0-1"}, stream=True)])
+        self.assertEqual(
+            self.all_media_dict(),
+            [
+                {
+                    **self.model_to_dict(model, "media"),
+                    "hits": model["media"].hits + 1,
+                }
+            ],
+        )
+        self.assertEqual(self.all_media_resolution_dict(), [])
+
     """
     🔽🔽🔽 Width in querystring
     """
@@ -218,8 +258,8 @@ class MediaTestSuite(MediaTestCase):
                 url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?width=1000"
                 response = self.client.get(url)
 
-        self.assertEqual(response.url, "https://potato.io/harcoded-1000x1000")
-        self.assertEqual(response.status_code, status.HTTP_301_MOVED_PERMANENTLY)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -255,7 +295,7 @@ class MediaTestSuite(MediaTestCase):
                 {
                     "hash": model.media.hash,
                     "height": 1000,
-                    "hits": 1,
+                    "hits": 0,
                     "id": 1,
                     "width": 1000,
                 }
@@ -337,15 +377,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_size_response()])) as mock:
                 url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?width=1000"
                 response = self.client.get(url)
-                json = response.json()
 
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
-
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -400,15 +434,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_server_response()])) as mock:
                 url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?width=1000"
                 response = self.client.get(url)
-                json = response.json()
 
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
-
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -440,6 +468,47 @@ class MediaTestSuite(MediaTestCase):
 
         self.assertEqual(self.all_media_resolution_dict(), [])
 
+    @patch(
+        "os.getenv",
+        MagicMock(
+            side_effect=apply_get_env(
+                {
+                    "GOOGLE_PROJECT_ID": "labor-day-story",
+                    "MEDIA_GALLERY_BUCKET": "bucket-name",
+                }
+            )
+        ),
+    )
+    def test_file_id__with_width_in_querystring__resize_requested_once(self):
+        """Test /answer without auth"""
+        self.headers(academy=1)
+        media_kwargs = {"url": "https://potato.io/harcoded", "mime": "image/png", "hash": "harcoded"}
+        model = self.generate_models(academy=True, media=True, media_kwargs=media_kwargs)
+
+        with patch("google.oauth2.id_token.fetch_id_token") as token_mock:
+            token_mock.return_value = "blablabla"
+
+            with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_server_response()])) as mock:
+                url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?width=1000"
+                responses = [self.client.get(url), self.client.get(url)]
+
+        for response in responses:
+            self.assertEqual(response.url, "https://potato.io/harcoded")
+            self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+        self.assertEqual(len(mock.call_args_list), 1)
+        self.assertEqual(
+            self.all_media_dict(),
+            [
+                {
+                    **self.model_to_dict(model, "media"),
+                    "hits": model["media"].hits + 2,
+                }
+            ],
+        )
+
+        self.assertEqual(self.all_media_resolution_dict(), [])
+
     """
     🔽🔽🔽 Height in querystring
     """
@@ -501,8 +570,8 @@ class MediaTestSuite(MediaTestCase):
                 url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?height=1000"
                 response = self.client.get(url)
 
-        self.assertEqual(response.url, "https://potato.io/harcoded-1000x1000")
-        self.assertEqual(response.status_code, status.HTTP_301_MOVED_PERMANENTLY)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -538,7 +607,7 @@ class MediaTestSuite(MediaTestCase):
                 {
                     "hash": model.media.hash,
                     "height": 1000,
-                    "hits": 1,
+                    "hits": 0,
                     "id": 1,
                     "width": 1000,
                 }
@@ -620,15 +689,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_size_response()])) as mock:
                 url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?height=1000"
                 response = self.client.get(url)
-                json = response.json()
 
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
-
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -683,15 +746,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_server_response()])) as mock:
                 url = reverse_lazy("media:file_id", kwargs={"media_id": 1}) + "?height=1000"
                 response = self.client.get(url)
-                json = response.json()
 
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
-
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
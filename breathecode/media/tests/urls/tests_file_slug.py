@@ -120,7 +120,7 @@ class MediaTestSuite(MediaTestCase):
         )
         self.assertEqual(self.all_media_resolution_dict(), [])
 
-    @patch(REQUESTS_PATH["get"], apply_requests_get_mock([(200, "https://potato.io", "ok")]))
+    @patch("requests.Session.get", apply_requests_get_mock([(200, "https://potato.io", "ok")]))
     @patch(
         "os.getenv",
         MagicMock(
@@ -214,8 +214,8 @@ class MediaTestSuite(MediaTestCase):
                 url = reverse_lazy("media:file_slug", kwargs={"media_slug": model["media"].slug}) + "?width=1000"
                 response = self.client.get(url)
 
-        self.assertEqual(response.url, "https://potato.io/harcoded-1000x1000")
-        self.assertEqual(response.status_code, status.HTTP_301_MOVED_PERMANENTLY)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -251,7 +251,7 @@ class MediaTestSuite(MediaTestCase):
                 {
                     "hash": model.media.hash,
                     "height": 1000,
-                    "hits": 1,
+                    "hits": 0,
                     "id": 1,
                     "width": 1000,
                 }
@@ -333,15 +333,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_size_response()])) as mock:
                 url = reverse_lazy("media:file_slug", kwargs={"media_slug": model["media"].slug}) + "?width=1000"
                 response = self.client.get(url)
-                json = response.json()
-
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
 
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -396,15 +390,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_server_response()])) as mock:
                 url = reverse_lazy("media:file_slug", kwargs={"media_slug": model["media"].slug}) + "?width=1000"
                 response = self.client.get(url)
-                json = response.json()
-
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
 
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             str(mock.call_args_list),
@@ -499,8 +487,8 @@ class MediaTestSuite(MediaTestCase):
                 url = reverse_lazy("media:file_slug", kwargs={"media_slug": model["media"].slug}) + "?height=1000"
                 response = self.client.get(url)
 
-        self.assertEqual(response.url, "https://potato.io/harcoded-1000x1000")
-        self.assertEqual(response.status_code, status.HTTP_301_MOVED_PERMANENTLY)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -536,7 +524,7 @@ class MediaTestSuite(MediaTestCase):
                 {
                     "hash": model.media.hash,
                     "height": 1000,
-                    "hits": 1,
+                    "hits": 0,
                     "id": 1,
                     "width": 1000,
                 }
@@ -618,15 +606,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_size_response()])) as mock:
                 url = reverse_lazy("media:file_slug", kwargs={"media_slug": model["media"].slug}) + "?height=1000"
                 response = self.client.get(url)
-                json = response.json()
-
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
 
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
@@ -681,15 +663,9 @@ class MediaTestSuite(MediaTestCase):
             with patch(REQUESTS_PATH["request"], apply_requests_request_mock([bad_server_response()])) as mock:
                 url = reverse_lazy("media:file_slug", kwargs={"media_slug": model["media"].slug}) + "?height=1000"
                 response = self.client.get(url)
-                json = response.json()
-
-        expected = {
-            "detail": "cloud-function-bad-input",
-            "status_code": 500,
-        }
 
-        self.assertEqual(json, expected)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.url, "https://potato.io/harcoded")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
 
         self.assertEqual(
             mock.call_args_list,
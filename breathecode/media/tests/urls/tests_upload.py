@@ -659,7 +659,7 @@ class MediaTestSuite(MediaTestCase):
             ],
         )
 
-        self.assertEqual(Storage.__init__.call_args_list, [call(), call()])
+        self.assertEqual(Storage.__init__.call_args_list, [call()])
         self.assertEqual(
             File.__init__.call_args_list,
             [
@@ -668,8 +668,10 @@ class MediaTestSuite(MediaTestCase):
             ],
         )
 
-        args1, kwargs1 = File.upload.call_args_list[0]
-        args2, kwargs2 = File.upload.call_args_list[1]
+        # the files are uploaded concurrently
+        calls = sorted(File.upload.call_args_list, key=lambda x: x[0][0].name != os.path.basename(file1.name))
+        args1, kwargs1 = calls[0]
+        args2, kwargs2 = calls[1]
 
         self.assertEqual(len(File.upload.call_args_list), 2)
         self.assertEqual(len(args1), 1)
@@ -1,10 +1,9 @@
 # from breathecode.media.schemas import MediaSchema
 import datetime
-import hashlib
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from slugify import slugify
-import requests
 from circuitbreaker import CircuitBreakerError
 from django.db.models import Q
 from django.http import StreamingHttpResponse
@@ -17,6 +16,7 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import ViewSet
 
 from breathecode.authenticate.actions import get_user_language
+from breathecode.media import actions
 from breathecode.media.models import Category, Media, MediaResolution
 from breathecode.media.schemas import FileSchema, MediaSchema
 from breathecode.media.serializers import (
@@ -27,8 +27,7 @@ from breathecode.media.serializers import (
     MediaPUTSerializer,
     MediaSerializer,
 )
-from breathecode.services.google_cloud import FunctionV1
-from breathecode.utils import GenerateLookupsMixin, capable_of, num_to_roman
+from breathecode.utils import GenerateLookupsMixin, capable_of
 from breathecode.utils.api_view_extensions.api_view_extensions import APIViewExtensions
 from breathecode.utils.i18n import translation
 from capyc.rest_framework.exceptions import ValidationException
@@ -46,16 +45,14 @@ MIME_ALLOW = [
     "image/jpg",
     "application/octet-stream",
 ]
+MEDIA_PROXY_CHUNK_SIZE = 64 * 1024
+UPLOAD_MAX_WORKERS = 4
 
 
 def media_gallery_bucket():
     return os.getenv("MEDIA_GALLERY_BUCKET")
 
 
-def google_project_id():
-    return os.getenv("GOOGLE_PROJECT_ID", "")
-
-
 class MediaView(ViewSet, GenerateLookupsMixin):
     """
     get:
@@ -449,7 +446,6 @@ class UploadView(APIView):
         }
 
         file = request.data.get("file")
-        slugs = []
 
         if not file:
             raise ValidationException("Missing file in request", code=400)
@@ -473,23 +469,23 @@ class UploadView(APIView):
                     code=400,
                 )
 
-        for index in range(0, len(files)):
-            file = files[index]
-            name = names[index] if len(names) else file.name
-            file_bytes = file.read()
-            hash = hashlib.sha256(file_bytes).hexdigest()
-            slug = slugify(name)
-
-            slug_number = Media.objects.filter(slug__startswith=slug).exclude(hash=hash).count() + 1
-            if slug_number > 1:
-                while True:
-                    roman_number = num_to_roman(slug_number, lower=True)
-                    slug = f"{slug}-{roman_number}"
-                    if not slug in slugs:
-                        break
-                    slug_number = slug_number + 1
-
-            slugs.append(slug)
+        # the files are hashed concurrently, reading one chunk at a time to bound the memory per upload
+        with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+            hashes = list(executor.map(actions.hash_media_file, files))
+
+        slugs = actions.allocate_media_slugs([(slugify(name), hash) for name, hash in zip(names, hashes)])
+
+        media_ids = {}
+        urls = {}
+        for media in Media.objects.filter(hash__in=hashes).values("id", "hash", "url", "academy__id"):
+            if academy_id and media["academy__id"] == int(academy_id):
+                media_ids[media["hash"]] = media["id"]
+
+            if media["url"]:
+                urls.setdefault(media["hash"], media["url"])
+
+        pending = {}
+        for file, name, hash, slug in zip(files, names, hashes, slugs):
             data = {
                 "hash": hash,
                 "slug": slug,
@@ -505,43 +501,47 @@ class UploadView(APIView):
             elif "Categories" in request.headers:
                 data["categories"] = request.headers["Categories"].split(",")
 
-            media = Media.objects.filter(hash=hash, academy__id=academy_id).first()
-            if media:
-                data["id"] = media.id
+            if hash in media_ids:
+                data["id"] = media_ids[hash]
 
-                url = Media.objects.filter(hash=hash).values_list("url", flat=True).first()
-                if url:
-                    data["url"] = url
+            if hash in urls:
+                data["url"] = urls[hash]
 
-            else:
-                url = Media.objects.filter(hash=hash).values_list("url", flat=True).first()
-                if url:
-                    data["url"] = url
+            elif hash not in media_ids:
+                pending.setdefault(hash, (file, []))[1].append(data)
 
-                else:
-                    # upload file section
-                    try:
-                        storage = Storage()
-                        cloud_file = storage.file(media_gallery_bucket(), hash)
-                        cloud_file.upload(file, content_type=file.content_type)
-                        data["url"] = cloud_file.url()
-                        data["thumbnail"] = data["url"] + "-thumbnail"
+            result["data"].append(data)
 
-                    except CircuitBreakerError:
-                        raise ValidationException(
-                            translation(
-                                lang,
-                                en="The circuit breaker is open due to an error, please try again later",
-                                es="El circuit breaker está abierto debido a un error, por favor intente más tarde",
-                                slug="circuit-breaker-open",
-                            ),
-                            slug="circuit-breaker-open",
-                            data={"service": "Google Cloud Storage"},
-                            silent=True,
-                            code=503,
-                        )
+        # upload file section
+        if pending:
+            try:
+                storage = Storage()
+                cloud_files = {hash: storage.file(media_gallery_bucket(), hash) for hash in pending}
 
-            result["data"].append(data)
+                def upload_file(hash):
+                    file = pending[hash][0]
+                    cloud_files[hash].upload(file, content_type=file.content_type)
+                    return hash, cloud_files[hash].url()
+
+                with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+                    for hash, url in executor.map(upload_file, pending):
+                        for data in pending[hash][1]:
+                            data["url"] = url
+                            data["thumbnail"] = url + "-thumbnail"
+
+            except CircuitBreakerError:
+                raise ValidationException(
+                    translation(
+                        lang,
+                        en="The circuit breaker is open due to an error, please try again later",
+                        es="El circuit breaker está abierto debido a un error, por favor intente más tarde",
+                        slug="circuit-breaker-open",
+                    ),
+                    slug="circuit-breaker-open",
+                    data={"service": "Google Cloud Storage"},
+                    silent=True,
+                    code=503,
+                )
 
         from django.db.models import Q
 
@@ -606,62 +606,52 @@ class MaskingUrlView(APIView):
         if (width or height) and not media.mime.startswith("image/"):
             raise ValidationException("cannot resize this resource", code=400, slug="cannot-resize-media")
 
-        # register click
-        media.hits = media.hits + 1
-        media.save()
+        resolution = None
+        if width or height:
+            resolution = MediaResolution.objects.filter(Q(width=width) | Q(height=height), hash=media.hash).first()
 
-        resolution = MediaResolution.objects.filter(Q(width=width) | Q(height=height), hash=media.hash).first()
+        # register click
+        actions.count_media_hit(media.id, resolution_id=resolution.id if resolution else None)
 
+        # the resize runs in background, the original is served until the resolution exists
         if (width or height) and not resolution:
-            func = FunctionV1(region="us-central1", project_id=google_project_id(), name="resize-image")
-
-            func_request = func.call(
-                {
-                    "width": width,
-                    "height": height,
-                    "filename": media.hash,
-                    "bucket": media_gallery_bucket(),
-                }
-            )
+            actions.request_media_resize(media, width=width, height=height)
+            return self.serve(request, url, permanent=False)
 
-            res = func_request.json()
+        if resolution:
+            url = f"{url}-{resolution.width}x{resolution.height}"
 
-            if not res["status_code"] == 200 or not res["message"] == "Ok":
-                if "message" in res:
-                    raise ValidationException(res["message"], code=500, slug="cloud-function-bad-input")
+        return self.serve(request, url)
 
-                raise ValidationException(
-                    "Unhandled request from cloud functions", code=500, slug="unhandled-cloud-function"
-                )
-
-            width = res["width"]
-            height = res["height"]
-            resolution = MediaResolution(width=width, height=height, hash=media.hash)
-            resolution.save()
+    def serve(self, request, url, permanent=True):
+        if request.GET.get("mask") != "true":
+            return redirect(url, permanent=permanent)
 
-        if width or height:
-            width = resolution.width
-            height = resolution.height
+        headers = {}
+        for header in ["Range", "If-Range"]:
+            if value := request.headers.get(header):
+                headers[header] = value
 
-            url = f"{url}-{width}x{height}"
-            resolution.hits = resolution.hits + 1
-            resolution.save()
+        response = actions.get_media_session().get(url, headers=headers, stream=True)
 
-        if request.GET.get("mask") != "true":
-            return redirect(url, permanent=True)
+        def stream():
+            try:
+                yield from response.iter_content(chunk_size=MEDIA_PROXY_CHUNK_SIZE)
+            finally:
+                response.close()
 
-        response = requests.get(url, stream=True)
         resource = StreamingHttpResponse(
-            response.raw,
+            stream(),
             status=response.status_code,
             reason=response.reason,
         )
 
-        header_keys = [
-            x
-            for x in response.headers.keys()
-            if x != "Transfer-Encoding" and x != "Content-Encoding" and x != "Keep-Alive" and x != "Connection"
-        ]
+        # iter_content decodes the body, so its encoded length must not be forwarded
+        skip_headers = ["Transfer-Encoding", "Content-Encoding", "Keep-Alive", "Connection"]
+        if "Content-Encoding" in response.headers:
+            skip_headers.append("Content-Length")
+
+        header_keys = [x for x in response.headers.keys() if x not in skip_headers]
 
         for header in header_keys:
             resource[header] = response.headers[header]
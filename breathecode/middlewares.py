@@ -1,13 +1,14 @@
 import functools
 import gzip
 import os
-import sys
+import threading
 import zlib
 
 import brotli
 import zstandard
 from asgiref.sync import iscoroutinefunction
 from django.http import HttpResponseRedirect
+from django.utils.cache import patch_vary_headers
 from django.utils.decorators import sync_and_async_middleware
 from django.utils.deprecation import MiddlewareMixin
 
@@ -16,6 +17,9 @@ IS_TEST = ENV not in ["production", "staging", "development"]
 IS_DEV = ENV != "production"
 ENABLE_LIST_OPTIONS = ["true", "1", "yes", "y"]
 
+# the compressor contexts are not thread safe, each thread keeps its own ones
+contexts = threading.local()
+
 
 @functools.lru_cache(maxsize=1)
 def is_compression_enabled():
@@ -27,12 +31,51 @@ def min_compression_size():
     return int(os.getenv("MIN_COMPRESSION_SIZE", "10"))
 
 
-def must_compress(data):
+@functools.lru_cache(maxsize=1)
+def compression_levels():
+    # the defaults favor the speed over the ratio, the payloads are dynamic and compressed on each request
+    return {
+        "zstd": int(os.getenv("ZSTD_COMPRESSION_LEVEL", "3")),
+        "br": int(os.getenv("BROTLI_COMPRESSION_LEVEL", "4")),
+        "deflate": int(os.getenv("DEFLATE_COMPRESSION_LEVEL", "6")),
+        "gzip": int(os.getenv("GZIP_COMPRESSION_LEVEL", "6")),
+    }
+
+
+# these formats are already compressed, compressing them again costs cpu and saves nothing
+INCOMPRESSIBLE_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/x-bzip2",
+)
+
+# the text based images are compressible
+COMPRESSIBLE_IMAGE_TYPES = ("image/svg+xml",)
+
+
+def is_compressible_content_type(content_type: str) -> bool:
+    content_type = content_type.split(";")[0].strip().lower()
+
+    if content_type in COMPRESSIBLE_IMAGE_TYPES:
+        return True
+
+    return not content_type.startswith(INCOMPRESSIBLE_CONTENT_TYPES)
+
+
+def must_compress(data: bytes):
     size = min_compression_size()
     if size == 0:
         return True
 
-    return sys.getsizeof(data) / 1024 > size
+    return len(data) / 1024 > size
 
 
 @functools.lru_cache(maxsize=1)
@@ -40,57 +83,147 @@ def use_gzip():
     return os.getenv("USE_GZIP", "0").lower() in ENABLE_LIST_OPTIONS
 
 
+def get_zstd_compressor() -> zstandard.ZstdCompressor:
+    if not hasattr(contexts, "zstd"):
+        contexts.zstd = zstandard.ZstdCompressor(level=compression_levels()["zstd"])
+
+    return contexts.zstd
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    level = compression_levels()[encoding]
+
+    if encoding == "zstd":
+        return get_zstd_compressor().compress(data)
+
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    return brotli.compress(data, quality=level)
+
+
+def get_stream_compressor(encoding: str):
+    """Get a compressor with a `compress` and `flush` interface, it must be used for just one response."""
+
+    level = compression_levels()[encoding]
+
+    # a stream can be interleaved with another one in the same thread, so it does not share the zstd context
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compressobj()
+
+    if encoding == "deflate":
+        return zlib.compressobj(level)
+
+    if encoding == "gzip":
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    return BrotliStreamCompressor(level)
+
+
+class BrotliStreamCompressor:
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def compress_stream(chunks, encoding: str):
+    compressor = get_stream_compressor(encoding)
+
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+
+    yield compressor.flush()
+
+
+async def acompress_stream(chunks, encoding: str):
+    compressor = get_stream_compressor(encoding)
+
+    async for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+
+    yield compressor.flush()
+
+
 class CompressResponseMiddleware(MiddlewareMixin):
 
-    def _compress(self, response, encoding, alg):
-        if self._has_content:
-            compressed_content = alg(response.content)
-            response.content = compressed_content
+    def _compress(self, response, encoding):
+        if response.streaming:
+            # the chunks are compressed as they are produced, the content is never fully buffered
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+
+            del response.headers["Content-Length"]
 
         else:
-            compressed_content = alg(response.streaming_content)
-            response.streaming_content = compressed_content
+            response.content = compress(response.content, encoding)
+
+            if response.has_header("Content-Length"):
+                response.headers["Content-Length"] = str(len(response.content))
 
         response["Content-Encoding"] = encoding
-        # response['Content-Length'] = str(len(compressed_content))
+        patch_vary_headers(response, ("Accept-Encoding",))
 
     def _must_compress(self, response):
-        self._has_content = hasattr(response, "content")
+        # a partial content must keep the byte offsets of the original representation
+        if response.status_code == 206 or response.has_header("Content-Range"):
+            return False
 
-        if self._has_content:
-            return must_compress(response.content)
+        if not is_compressible_content_type(response.get("Content-Type", "")):
+            return False
 
-        else:
-            return must_compress(response.streaming_content)
+        # the size of a stream is unknown, it is assumed to be large
+        if response.streaming:
+            return True
+
+        return bool(response.content) and must_compress(response.content)
+
+    def _get_encoding(self, request):
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+
+        dont_force_gzip = not use_gzip()
+
+        # sort by compression ratio and speed
+        if "zstd" in accept_encoding and dont_force_gzip:
+            return "zstd"
+
+        if ("deflate" in accept_encoding or "*" in accept_encoding) and dont_force_gzip:
+            return "deflate"
+
+        if "gzip" in accept_encoding:
+            return "gzip"
+
+        if IS_DEV and "br" in accept_encoding and "PostmanRuntime" in request.META.get("HTTP_USER_AGENT", ""):
+            return "br"
+
+        return None
 
     def process_response(self, request, response):
         # If the response is already compressed, do nothing
         if (
             "Content-Encoding" in response.headers
             or is_compression_enabled() is False
-            or self._must_compress(response) is False
             or IS_TEST
+            or self._must_compress(response) is False
         ):
             return response
 
         # Compress the response if it's large enough
-        if response.content:
-            accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
-
-            dont_force_gzip = not use_gzip()
-
-            # sort by compression ratio and speed
-            if "zstd" in accept_encoding and dont_force_gzip:
-                self._compress(response, "zstd", zstandard.compress)
-
-            elif ("deflate" in accept_encoding or "*" in accept_encoding) and dont_force_gzip:
-                self._compress(response, "deflate", zlib.compress)
-
-            elif "gzip" in accept_encoding:
-                self._compress(response, "gzip", gzip.compress)
-
-            elif IS_DEV and "br" in accept_encoding and "PostmanRuntime" in request.META.get("HTTP_USER_AGENT", ""):
-                self._compress(response, "br", brotli.compress)
+        if encoding := self._get_encoding(request):
+            self._compress(response, encoding)
 
         return response
 
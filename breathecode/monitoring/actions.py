@@ -1,13 +1,20 @@
+import contextlib
+import contextvars
 import csv
+import ctypes
+import functools
 import json
 import logging
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 
 import requests
+import requests.adapters
 from django.utils import timezone
 
 from breathecode.admissions.models import Academy
@@ -23,20 +30,59 @@ from .models import CSVDownload, Endpoint, RepositorySubscription, RepositoryWeb
 logger = logging.getLogger(__name__)
 
 USER_AGENT = "BreathecodeMonitoring/1.0"
-SCRIPT_HEADER = """
-# from django.conf import settings
-# import breathecode.settings as app_settings
+PROBE_TIMEOUT = 2
+PROBE_MAX_WORKERS = 10
+PROBE_CHUNK_SIZE = 64 * 1024
+PROBE_MAX_PAYLOAD_SIZE = 3 * 1024 * 1024
+PROBE_FIELDS = ["status", "status_code", "status_text", "severity_level", "response_text", "last_check"]
 
-# settings.configure(INSTALLED_APPS=app_settings.INSTALLED_APPS,DATABASES=app_settings.DATABASES)
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "scripts")
 
-# import django
-# django.setup()
-"""
+script_output = contextvars.ContextVar("script_output", default=None)
 
+session_lock = threading.Lock()
+session: requests.Session | None = None
 
-def test_link(url, test_pattern=None):
+
+def get_probe_session() -> requests.Session:
+    """Get the session used to probe the endpoints, its pool of connections is reused across runs."""
+
+    global session
+
+    if session is None:
+        with session_lock:
+            if session is None:
+                s = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=PROBE_MAX_WORKERS, pool_maxsize=PROBE_MAX_WORKERS
+                )
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                session = s
+
+    return session
+
+
+def read_payload(response, test_pattern=None):
+    """Read the body until the test_pattern is found or PROBE_MAX_PAYLOAD_SIZE is reached."""
+
+    payload = ""
+    size = 0
+
+    for chunk in response.iter_content(chunk_size=PROBE_CHUNK_SIZE):
+        size += len(chunk)
+        payload += chunk.decode(response.encoding or "utf-8", errors="replace")
+
+        if (test_pattern and re.search(test_pattern, payload)) or size >= PROBE_MAX_PAYLOAD_SIZE:
+            break
+
+    return payload
+
+
+def test_link(url, test_pattern=None, session=None, ping=False):
 
     headers = {"User-Agent": USER_AGENT}
+    client = session or requests
 
     result = {
         "url": url,
@@ -46,14 +92,25 @@ def test_link(url, test_pattern=None):
     }
 
     try:
-        r = requests.get(url, headers=headers, timeout=2)
+        # the body is not needed to ping an url, unless it fails
+        if ping and test_pattern is None:
+            r = client.head(url, headers=headers, timeout=PROBE_TIMEOUT, allow_redirects=True)
+            if r.status_code >= 200 and r.status_code <= 299:
+                result["status_code"] = r.status_code
+                logger.debug(f'Tested {url} {result["status_text"]} with {result["status_code"]}')
+                return result
+
+        r = client.get(url, headers=headers, timeout=PROBE_TIMEOUT, stream=True)
         length = 0
         if "content-length" in r.headers:
             length = r.headers["content-length"]
         result["status_code"] = r.status_code
 
         # if status is one error, we should need see the status text
-        result["payload"] = r.text
+        try:
+            result["payload"] = read_payload(r, test_pattern)
+        finally:
+            r.close()
 
         if (
             test_pattern is None
@@ -109,10 +166,10 @@ def subscribe_repository(subs_id, settings=None):
     return subscription
 
 
-def get_website_text(endp):
+def get_website_text(endp, session=None, ping=False, save=True):
     """Make a request to get the content of the given URL."""
 
-    res = test_link(endp.url, endp.test_pattern)
+    res = test_link(endp.url, endp.test_pattern, session=session, ping=ping)
     status_code = res["status_code"]
     payload = res["payload"]
 
@@ -153,39 +210,69 @@ def get_website_text(endp):
         endp.response_text = None
 
     endp.status_code = status_code
-    endp.save()
+
+    if save:
+        endp.save()
 
     return endp
 
 
+def probe_endpoints(endpoints):
+    """Test the endpoints concurrently, the results are written in the instances but they are not saved."""
+
+    def probe(endpoint):
+        logger.debug(f"Testing endpoint: {endpoint.url}")
+
+        try:
+            return get_website_text(endpoint, session=get_probe_session(), ping=True, save=False)
+
+        # an unexpected error, like an invalid url, only fails its own endpoint
+        except Exception as e:
+            logger.exception(f"Error testing endpoint: {endpoint.url}")
+
+            endpoint.last_check = timezone.now()
+            endpoint.status = "CRITICAL"
+            endpoint.severity_level = 100
+            endpoint.status_code = 500
+            endpoint.status_text = f"Error testing the endpoint: {e}"
+            endpoint.response_text = None
+            return endpoint
+
+    with ThreadPoolExecutor(max_workers=PROBE_MAX_WORKERS) as executor:
+        return list(executor.map(probe, endpoints))
+
+
 def run_app_diagnostic(app, report=False):
 
     failed_endpoints = []  # data to be send to slack
     results = {"severity_level": 0, "details": ""}
     logger.debug(f"Testing application {app.title}")
     now = timezone.now()
-    _endpoints = app.endpoint_set.all()
-    for endpoint in _endpoints:
+
+    ignored = []
+    to_probe = []
+    for endpoint in app.endpoint_set.all():
         if endpoint.last_check is not None and endpoint.last_check > now - timezone.timedelta(
             minutes=endpoint.frequency_in_minutes
         ):
             logger.debug(f"Ignoring {endpoint.url} because frequency hast not been met")
             endpoint.status_text = "Ignored because its paused"
-            endpoint.save()
+            ignored.append(endpoint)
             continue
 
         if endpoint.paused_until is not None and endpoint.paused_until > now:
             logger.debug(f"Ignoring endpoint:{endpoint.url} monitor because its paused")
             endpoint.status_text = "Ignored because its paused"
-            endpoint.save()
+            ignored.append(endpoint)
             continue
 
-        # Starting the test
-        logger.debug(f"Testing endpoint: {endpoint.url}")
-        endpoint.status = "LOADING"
-        endpoint.save()
+        to_probe.append(endpoint)
 
-        e = get_website_text(endpoint)
+    probed = probe_endpoints(to_probe)
+
+    Endpoint.objects.bulk_update(ignored + probed, PROBE_FIELDS)
+
+    for e in probed:
         if e.status != "OPERATIONAL":
             if e.severity_level > results["severity_level"]:
                 results["severity_level"] = e.severity_level
@@ -209,7 +296,6 @@ def run_app_diagnostic(app, report=False):
     results["details"] = json.dumps(results, indent=4)
 
     app.status = results["status"]
-    app.response_text = results["text"]
     app.save()
 
     return results
@@ -234,12 +320,8 @@ def run_endpoint_diagnostic(endpoint_id):
         endpoint.save()
         return False
 
-    # Starting the test
-    logger.debug(f"Testing endpoint: {endpoint.url}")
-    endpoint.status = "LOADING"
-    endpoint.save()
-
-    e = get_website_text(endpoint)
+    # the endpoint is probed like the endpoints of an app and saved once
+    e = probe_endpoints([endpoint])[0]
     results["text"] = e.response_text
     if e.status != "OPERATIONAL":
         if e.severity_level > results["severity_level"]:
@@ -266,113 +348,229 @@ def run_endpoint_diagnostic(endpoint_id):
     return results
 
 
-def run_script(script):
-    results = {
-        "severity_level": 0,
-    }
+def get_script_timeout():
+    return int(os.getenv("MONITOR_SCRIPT_TIMEOUT", "300"))
+
+
+class ScriptStdout:
+    """Proxy of `sys.stdout` that writes in the output of the script running in the current context."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, data):
+        return (script_output.get() or self._stream).write(data)
+
+    def flush(self):
+        return (script_output.get() or self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+stdout_lock = threading.Lock()
+stdout_captures = 0
+
+
+@contextlib.contextmanager
+def capture_script_output():
+    """
+    Capture what is printed in the current context, the other threads keep writing in the real stdout.
+
+    The proxy is installed while at least one capture is active, the original stdout is restored after the last one.
+    """
 
-    import contextlib
-    from io import StringIO
+    global stdout_captures
 
-    @contextlib.contextmanager
-    def stdout_io(stdout=None):
-        old = sys.stdout
-        if stdout is None:
-            stdout = StringIO()
-        sys.stdout = stdout
-        yield stdout
-        sys.stdout = old
+    with stdout_lock:
+        if stdout_captures == 0:
+            sys.stdout = ScriptStdout(sys.stdout)
+
+        stdout_captures += 1
+
+    output = StringIO()
+    token = script_output.set(output)
+
+    try:
+        yield output
+
+    finally:
+        script_output.reset(token)
+
+        with stdout_lock:
+            stdout_captures -= 1
+
+            if stdout_captures == 0 and isinstance(sys.stdout, ScriptStdout):
+                sys.stdout = sys.stdout._stream
+
+
+@functools.lru_cache(maxsize=256)
+def compile_script_body(body):
+    return compile(body, "<script_body>", "exec")
+
+
+def read_script_file(path):
+    with open(path) as f:
+        return compile(f.read(), path, "exec")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_script_file(path, mtime):
+    # the mtime is part of the key, so the code is compiled again when the file changes
+    return read_script_file(path)
+
+
+def get_script_code(script):
+    """Get the code object of a script, it is compiled once."""
 
-    content = None
-    exception = None
     if script.script_slug and script.script_slug != "other":
-        dir_path = os.path.dirname(os.path.realpath(__file__))
-        header = SCRIPT_HEADER
-        content = header + open(f"{dir_path}/scripts/{script.script_slug}.py").read()
+        path = os.path.join(SCRIPTS_PATH, f"{script.script_slug}.py")
 
-    elif script.script_body:
-        content = script.script_body
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            # it is not cached without a mtime
+            return read_script_file(path)
 
-    else:
-        exception = WrongScriptConfiguration(f"Script not found or its body is empty: {script.script_slug}")
-
-    if content or exception:
-        local = {"result": {"status": "OPERATIONAL"}}
-        with stdout_io() as s:
-            try:
-                if exception:
-                    raise exception
-
-                if script.application is None:
-                    raise Exception(f"Script {script.script_slug} does not belong to any application")
-
-                exec(
-                    content,
-                    {
-                        "academy": script.application.academy,
-                        "ADMIN_URL": os.getenv("ADMIN_URL", ""),
-                        "API_URL": os.getenv("API_URL", ""),
-                    },
-                    local,
-                )
-                script.status_code = 0
-                script.status = "OPERATIONAL"
-                script.special_status_text = "OK"
-                results["severity_level"] = 5
-                script.response_text = s.getvalue()
-
-            except ScriptNotification as e:
-                script.status_code = 1
-                script.response_text = str(e)
-                if e.title is not None:
-                    script.special_status_text = e.title
-
-                if e.btn_url is not None:
-                    results["btn"] = {"url": e.btn_url, "label": "More details"}
-                    if e.btn_label is not None:
-                        results["btn"]["label"] = e.btn_label
-                else:
-                    results["btn"] = None
-
-                if e.status is not None:
-                    script.status = e.status
-                    results["severity_level"] = 5 if e.status != "CRITICAL" else 100
-                else:
-                    script.status = "MINOR"
-                    results["severity_level"] = 5
-                results["error_slug"] = e.slug
-
-            except WrongScriptConfiguration as e:
-                script.special_status_text = str(e)[:255]
-                script.response_text = str(e)
-                script.status_code = 1
-                script.status = "CRITICAL"
-                results["error_slug"] = "wrong-configuration"
-                results["btn"] = None
-                results["severity_level"] = 100
+        return compile_script_file(path, mtime)
 
-            except Exception as e:
-                import traceback
+    if script.script_body:
+        return compile_script_body(script.script_body)
+
+    raise WrongScriptConfiguration(f"Script not found or its body is empty: {script.script_slug}")
 
-                script.special_status_text = str(e)[:255]
-                script.response_text = "".join(traceback.format_exception(None, e, e.__traceback__))
-                script.status_code = 1
-                script.status = "CRITICAL"
-                results["error_slug"] = "unknown"
-                results["btn"] = None
-                results["severity_level"] = 100
 
-        script.last_run = timezone.now()
-        script.save()
+class ScriptTimeout(BaseException):
+    """Raised inside of a script that exceeded its timeout, it is not an `Exception` so the script can't catch it."""
 
-        results["status"] = script.status
-        results["text"] = script.response_text
-        results["title"] = script.special_status_text
-        results["slack_payload"] = render_snooze_script([script])  # converting to json to send to slack
 
-        return results
+def exec_script(code, globals, locals, timeout=None):
+    """
+    Execute a script in the current thread, it is interrupted if it takes longer than the timeout.
 
-    return content is not None and script.status_code == 0
+    The interruption is raised in the thread at its next Python instruction, a blocking call, like a slow query,
+    finishes before the script stops. The script keeps using the database connection of the current thread.
+    """
+
+    if timeout is None:
+        exec(code, globals, locals)
+        return
+
+    thread_id = threading.get_ident()
+    lock = threading.Lock()
+    done = False
+
+    def interrupt():
+        with lock:
+            if not done:
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(ScriptTimeout))
+
+    timer = threading.Timer(timeout, interrupt)
+    timer.daemon = True
+    timer.start()
+
+    try:
+        try:
+            exec(code, globals, locals)
+
+        finally:
+            with lock:
+                done = True
+
+            timer.cancel()
+
+    except ScriptTimeout:
+        raise TimeoutError(f"Script timed out after {timeout} seconds")
+
+
+def run_script(script, timeout=None):
+    results = {
+        "severity_level": 0,
+    }
+
+    local = {"result": {"status": "OPERATIONAL"}}
+    with capture_script_output() as s:
+        try:
+            code = get_script_code(script)
+
+            if script.application is None:
+                raise Exception(f"Script {script.script_slug} does not belong to any application")
+
+            exec_script(
+                code,
+                {
+                    "academy": script.application.academy,
+                    "ADMIN_URL": os.getenv("ADMIN_URL", ""),
+                    "API_URL": os.getenv("API_URL", ""),
+                },
+                local,
+                timeout=timeout,
+            )
+            script.status_code = 0
+            script.status = "OPERATIONAL"
+            script.special_status_text = "OK"
+            results["severity_level"] = 5
+            script.response_text = s.getvalue()
+
+        except ScriptNotification as e:
+            script.status_code = 1
+            script.response_text = str(e)
+            if e.title is not None:
+                script.special_status_text = e.title
+
+            if e.btn_url is not None:
+                results["btn"] = {"url": e.btn_url, "label": "More details"}
+                if e.btn_label is not None:
+                    results["btn"]["label"] = e.btn_label
+            else:
+                results["btn"] = None
+
+            if e.status is not None:
+                script.status = e.status
+                results["severity_level"] = 5 if e.status != "CRITICAL" else 100
+            else:
+                script.status = "MINOR"
+                results["severity_level"] = 5
+            results["error_slug"] = e.slug
+
+        except WrongScriptConfiguration as e:
+            script.special_status_text = str(e)[:255]
+            script.response_text = str(e)
+            script.status_code = 1
+            script.status = "CRITICAL"
+            results["error_slug"] = "wrong-configuration"
+            results["btn"] = None
+            results["severity_level"] = 100
+
+        except TimeoutError as e:
+            script.special_status_text = str(e)[:255]
+            script.response_text = s.getvalue()
+            script.status_code = 1
+            script.status = "CRITICAL"
+            results["error_slug"] = "timeout"
+            results["btn"] = None
+            results["severity_level"] = 100
+
+        except Exception as e:
+            import traceback
+
+            script.special_status_text = str(e)[:255]
+            script.response_text = "".join(traceback.format_exception(None, e, e.__traceback__))
+            script.status_code = 1
+            script.status = "CRITICAL"
+            results["error_slug"] = "unknown"
+            results["btn"] = None
+            results["severity_level"] = 100
+
+    script.last_run = timezone.now()
+    script.save()
+
+    results["status"] = script.status
+    results["text"] = script.response_text
+    results["title"] = script.special_status_text
+    results["slack_payload"] = render_snooze_script([script])  # converting to json to send to slack
+
+    return results
 
 
 def download_csv(module, model_name, ids_to_download, academy_id=None):
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitoring", "0023_repositorysubscription_last_call"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="csvupload",
+            name="processed_rows",
+            field=models.PositiveIntegerField(default=0, help_text="Rows already imported or rejected"),
+        ),
+        migrations.AddField(
+            model_name="csvupload",
+            name="total_rows",
+            field=models.PositiveIntegerField(default=0, help_text="Rows found in the file"),
+        ),
+    ]
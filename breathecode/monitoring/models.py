@@ -167,6 +167,8 @@ class CSVUpload(models.Model):
     log = models.CharField(max_length=50)
     academy = models.ForeignKey(Academy, on_delete=models.CASCADE, null=True, blank=True, default=None)
     hash = models.CharField(max_length=64)
+    total_rows = models.PositiveIntegerField(default=0, help_text="Rows found in the file")
+    processed_rows = models.PositiveIntegerField(default=0, help_text="Rows already imported or rejected")
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     finished_at = models.DateTimeField(auto_now=True, editable=False)
 
@@ -10,13 +10,53 @@ from task_manager.django.decorators import task
 from breathecode.notify.actions import send_email_message, send_slack_raw
 from breathecode.utils import TaskPriority
 
-from .actions import download_csv, run_endpoint_diagnostic, run_script, subscribe_repository, unsubscribe_repository
-from .models import Endpoint, MonitorScript, Supervisor, SupervisorIssue
+from .actions import (
+    download_csv,
+    get_script_timeout,
+    run_app_diagnostic,
+    run_endpoint_diagnostic,
+    run_script,
+    subscribe_repository,
+    unsubscribe_repository,
+)
+from .models import Application, Endpoint, MonitorScript, Supervisor, SupervisorIssue
 
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
 
 
+def notify_diagnostic(app, subject, result):
+    if app.notify_email:
+
+        send_email_message(
+            "diagnostic",
+            app.notify_email,
+            {
+                "subject": subject,
+                "details": result["details"],
+            },
+            academy=app.academy,
+        )
+
+    if (
+        app.notify_slack_channel
+        and app.academy
+        and hasattr(app.academy, "slackteam")
+        and hasattr(app.academy.slackteam.owner, "credentialsslack")
+    ):
+
+        send_slack_raw(
+            "diagnostic",
+            app.academy.slackteam.owner.credentialsslack.token,
+            app.notify_slack_channel.slack_id,
+            {
+                "subject": subject,
+                **result,
+            },
+            academy=app.academy,
+        )
+
+
 @shared_task(bind=True, priority=TaskPriority.MONITORING.value)
 def test_endpoint(self, endpoint_id):
     logger.debug("Starting monitor_app")
@@ -34,43 +74,20 @@ def test_endpoint(self, endpoint_id):
         return False
 
     if result["status"] != "OPERATIONAL":
-        if endpoint.application.notify_email:
-
-            send_email_message(
-                "diagnostic",
-                endpoint.application.notify_email,
-                {
-                    "subject": f"Errors found on app {endpoint.application.title} endpoint {endpoint.url}",
-                    "details": result["details"],
-                },
-                academy=endpoint.application.academy,
-            )
-
-        if (
-            endpoint.application.notify_slack_channel
-            and endpoint.application.academy
-            and hasattr(endpoint.application.academy, "slackteam")
-            and hasattr(endpoint.application.academy.slackteam.owner, "credentialsslack")
-        ):
-
-            send_slack_raw(
-                "diagnostic",
-                endpoint.application.academy.slackteam.owner.credentialsslack.token,
-                endpoint.application.notify_slack_channel.slack_id,
-                {
-                    "subject": f"Errors found on app {endpoint.application.title} endpoint {endpoint.url}",
-                    **result,
-                },
-                academy=endpoint.application.academy,
-            )
+        app = endpoint.application
+        notify_diagnostic(app, f"Errors found on app {app.title} endpoint {endpoint.url}", result)
 
 
 @shared_task(bind=True, priority=TaskPriority.MONITORING.value)
 def monitor_app(self, app_id):
     logger.debug("Starting monitor_app")
-    endpoints = Endpoint.objects.filter(application__id=app_id).values_list("id", flat=True)
-    for endpoint_id in endpoints:
-        test_endpoint.delay(endpoint_id)
+    app = Application.objects.get(id=app_id)
+
+    # the endpoints of the app are probed concurrently with the pooled session and saved in bulk
+    result = run_app_diagnostic(app)
+
+    if result["status"] != "OPERATIONAL":
+        notify_diagnostic(app, f"Errors found on app {app.title}", result)
 
 
 @shared_task(bind=True, priority=TaskPriority.MONITORING.value)
@@ -84,7 +101,7 @@ def execute_scripts(self, script_id):
         logger.debug("Ignoring script exec because its paused")
         return True
 
-    result = run_script(script)
+    result = run_script(script, timeout=get_script_timeout())
     if result["status"] != "OPERATIONAL":
         logger.debug("Errors found, sending script report to ")
         subject = f"Errors have been found on {app.title} script {script.id} (slug: {script.script_slug})"
@@ -0,0 +1,123 @@
+"""
+Test run_app_diagnostic
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+import requests
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from breathecode.monitoring import actions
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+UTC_NOW = timezone.now()
+
+
+def link(status_code, payload=None):
+    return {"url": "", "status_code": status_code, "status_text": "", "payload": payload}
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    yield
+
+
+def test_endpoints_are_probed_concurrently(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    responses = {
+        "https://4geeks.com/ok": link(200),
+        "https://4geeks.com/pattern": link(200, "they killed kenny"),
+        "https://4geeks.com/down": link(500, "error"),
+    }
+    test_link = MagicMock(side_effect=lambda url, test_pattern, session, ping: responses[url])
+    monkeypatch.setattr("breathecode.monitoring.actions.test_link", test_link)
+
+    endpoints = [
+        {"url": "https://4geeks.com/ok"},
+        {"url": "https://4geeks.com/pattern", "test_pattern": "kyle"},
+        {"url": "https://4geeks.com/down"},
+        {"url": "https://4geeks.com/paused", "paused_until": UTC_NOW + timezone.timedelta(days=1)},
+    ]
+    model = bc.database.create(application=1, endpoint=endpoints)
+
+    with CaptureQueriesContext(connection) as ctx:
+        results = actions.run_app_diagnostic(model.application)
+
+    # the select of the endpoints and one bulk update of the results
+    assert len([x for x in ctx.captured_queries if "monitoring_endpoint" in x["sql"]]) == 2
+
+    assert sorted(x.args[0] for x in test_link.call_args_list) == [
+        "https://4geeks.com/down",
+        "https://4geeks.com/ok",
+        "https://4geeks.com/pattern",
+    ]
+
+    assert results["status"] == "CRITICAL"
+    assert results["MINOR"] == ["https://4geeks.com/pattern"]
+    assert results["CRITICAL"] == ["https://4geeks.com/down"]
+
+    endpoints = {x["url"]: x for x in bc.database.list_of("monitoring.Endpoint")}
+    assert endpoints["https://4geeks.com/ok"]["status"] == "OPERATIONAL"
+    assert endpoints["https://4geeks.com/ok"]["last_check"] == UTC_NOW
+    assert endpoints["https://4geeks.com/pattern"]["status"] == "MINOR"
+    assert endpoints["https://4geeks.com/pattern"]["response_text"] == "they killed kenny"
+    assert endpoints["https://4geeks.com/down"]["status"] == "CRITICAL"
+    assert endpoints["https://4geeks.com/down"]["status_code"] == 500
+    assert endpoints["https://4geeks.com/paused"]["status_text"] == "Ignored because its paused"
+    assert endpoints["https://4geeks.com/paused"]["last_check"] is None
+
+    assert bc.database.get("monitoring.Application", 1, dict=False).status == "CRITICAL"
+
+
+def test_unexpected_errors_only_fail_their_endpoint(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    def test_link(url, test_pattern, session, ping):
+        if url == "https://4geeks.com/invalid":
+            raise requests.exceptions.InvalidURL("Invalid URL")
+
+        return link(200)
+
+    monkeypatch.setattr("breathecode.monitoring.actions.test_link", test_link)
+
+    model = bc.database.create(
+        application=1, endpoint=[{"url": "https://4geeks.com/ok"}, {"url": "https://4geeks.com/invalid"}]
+    )
+
+    results = actions.run_app_diagnostic(model.application)
+
+    assert results["CRITICAL"] == ["https://4geeks.com/invalid"]
+
+    endpoints = {x["url"]: x for x in bc.database.list_of("monitoring.Endpoint")}
+    assert endpoints["https://4geeks.com/ok"]["status"] == "OPERATIONAL"
+    assert endpoints["https://4geeks.com/ok"]["last_check"] == UTC_NOW
+    assert endpoints["https://4geeks.com/invalid"]["status"] == "CRITICAL"
+    assert endpoints["https://4geeks.com/invalid"]["status_text"] == "Error testing the endpoint: Invalid URL"
+    assert endpoints["https://4geeks.com/invalid"]["last_check"] == UTC_NOW
+
+
+def test_the_session_is_shared_across_runs():
+    assert actions.get_probe_session() is actions.get_probe_session()
+
+
+def test_read_payload_stops_when_the_pattern_is_found():
+    response = MagicMock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = iter([b"they ", b"killed ", b"kenny", b"!!!"])
+
+    assert actions.read_payload(response, "kill+ed ken") == "they killed kenny"
+    assert response.iter_content.call_args_list == [call(chunk_size=actions.PROBE_CHUNK_SIZE)]
+
+
+def test_test_link_pings_with_head(monkeypatch: pytest.MonkeyPatch):
+    session = MagicMock()
+    session.head.return_value = MagicMock(status_code=200)
+
+    assert actions.test_link("https://4geeks.com", session=session, ping=True) == {
+        "url": "https://4geeks.com",
+        "status_code": 200,
+        "status_text": "",
+        "payload": None,
+    }
+    assert session.get.call_args_list == []
@@ -0,0 +1,44 @@
+"""
+Test run_endpoint_diagnostic
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from breathecode.monitoring import actions
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+UTC_NOW = timezone.now()
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    yield
+
+
+def test_the_endpoint_is_probed_with_the_pooled_session(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    response = {"url": "", "status_code": 500, "status_text": "", "payload": "error"}
+    test_link = MagicMock(return_value=response)
+    monkeypatch.setattr("breathecode.monitoring.actions.test_link", test_link)
+
+    model = bc.database.create(endpoint={"url": "https://4geeks.com/down"})
+
+    with CaptureQueriesContext(connection) as ctx:
+        results = actions.run_endpoint_diagnostic(model.endpoint.id)
+
+    # the endpoint is saved once, after the probe
+    assert len([x for x in ctx.captured_queries if x["sql"].startswith('UPDATE "monitoring_endpoint"')]) == 1
+
+    assert test_link.call_args.kwargs["session"] is actions.get_probe_session()
+    assert results["status"] == "CRITICAL"
+    assert results["CRITICAL"] == ["https://4geeks.com/down"]
+
+    endpoint = bc.database.get("monitoring.Endpoint", 1, dict=False)
+    assert endpoint.status == "CRITICAL"
+    assert endpoint.status_code == 500
+    assert endpoint.response_text == "error"
@@ -0,0 +1,113 @@
+"""
+Test run_script
+"""
+
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from django.utils import timezone
+
+from breathecode.monitoring import actions
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+UTC_NOW = timezone.now()
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    actions.compile_script_body.cache_clear()
+    yield
+
+
+def test_output_is_captured(bc: Breathecode):
+    model = bc.database.create(monitor_script={"script_body": "print('they killed kenny')"})
+
+    result = actions.run_script(model.monitor_script)
+
+    assert result["status"] == "OPERATIONAL"
+    assert result["text"] == "they killed kenny\n"
+    assert bc.database.get("monitoring.MonitorScript", 1, dict=False).response_text == "they killed kenny\n"
+
+
+def test_body_is_compiled_once(bc: Breathecode):
+    model = bc.database.create(monitor_script={"script_body": "print('they killed kenny')"})
+
+    actions.run_script(model.monitor_script)
+    actions.run_script(model.monitor_script)
+
+    info = actions.compile_script_body.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_timeout(bc: Breathecode):
+    body = "import time\nprint('waiting')\nwhile True:\n    time.sleep(0.01)"
+    model = bc.database.create(monitor_script={"script_body": body})
+
+    result = actions.run_script(model.monitor_script, timeout=0.1)
+
+    # the loop never ends by itself, it was interrupted
+    assert result["status"] == "CRITICAL"
+    assert result["error_slug"] == "timeout"
+    assert result["title"] == "Script timed out after 0.1 seconds"
+    assert result["text"] == "waiting\n"
+
+
+def test_timeout_can_not_be_caught_by_the_script(bc: Breathecode):
+    body = "import time\ntry:\n    time.sleep(1)\nexcept Exception:\n    print('caught')"
+    model = bc.database.create(monitor_script={"script_body": body})
+
+    result = actions.run_script(model.monitor_script, timeout=0.1)
+
+    assert result["error_slug"] == "timeout"
+    assert result["text"] == ""
+
+
+def test_script_with_timeout_uses_the_database(bc: Breathecode):
+    tags = [{"tag_type": "DISCOVERY"}, {"tag_type": "SOFT"}]
+    model = bc.database.create(
+        academy=1, application=1, tag=tags, monitor_script={"script_slug": "alert_tags_with_no_type"}
+    )
+
+    result = actions.run_script(model.monitor_script, timeout=5)
+
+    assert result["status"] == "OPERATIONAL"
+    assert result["text"] == "No tags without a type from 2 records\n"
+
+
+def test_stdout_is_restored():
+    stdout = sys.stdout
+
+    with actions.capture_script_output():
+        assert isinstance(sys.stdout, actions.ScriptStdout)
+
+        with actions.capture_script_output():
+            pass
+
+        assert isinstance(sys.stdout, actions.ScriptStdout)
+
+    assert sys.stdout is stdout
+
+
+def test_output_is_local_to_each_thread():
+    outputs = {}
+    barrier = threading.Barrier(2)
+
+    def target(name):
+        with actions.capture_script_output() as output:
+            barrier.wait()
+            print(name)
+            barrier.wait()
+
+        outputs[name] = output.getvalue()
+
+    threads = [threading.Thread(target=target, args=(x,)) for x in ["kenny", "kyle"]]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert outputs == {"kenny": "kenny\n", "kyle": "kyle\n"}
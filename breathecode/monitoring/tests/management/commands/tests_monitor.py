@@ -393,7 +393,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
 
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -452,7 +452,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -514,7 +514,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -574,7 +574,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -635,7 +635,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -696,7 +696,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -759,7 +759,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -820,7 +820,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -887,7 +887,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -958,7 +958,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -1024,7 +1024,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(mock_slack.call_args_list, [])
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     @patch(GOOGLE_CLOUD_PATH["client"], apply_google_cloud_client_mock())
@@ -1096,7 +1096,7 @@ class AcademyCohortTestSuite(MonitoringTestCase):
         self.assertEqual(len(mock_slack.call_args_list), 1)
         self.assertEqual(
             mock_breathecode.call_args_list,
-            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2)],
+            [call("https://potato.io", headers={"User-Agent": "BreathecodeMonitoring/1.0"}, timeout=2, stream=True)],
         )
 
     """
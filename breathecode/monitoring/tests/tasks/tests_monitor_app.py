@@ -0,0 +1,49 @@
+"""
+Test monitor_app
+"""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from breathecode.monitoring import tasks
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("breathecode.monitoring.tasks.send_email_message", MagicMock())
+    monkeypatch.setattr("breathecode.monitoring.tasks.test_endpoint.delay", MagicMock())
+    yield
+
+
+def test_the_app_is_diagnosed_once(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    result = {"status": "CRITICAL", "details": "{}", "severity_level": 100}
+    monkeypatch.setattr("breathecode.monitoring.tasks.run_app_diagnostic", MagicMock(return_value=result))
+
+    model = bc.database.create(application={"notify_email": "kenny@4geeks.com"}, endpoint=2)
+
+    tasks.monitor_app.delay(model.application.id)
+
+    assert tasks.run_app_diagnostic.call_args_list == [call(model.application)]
+    assert tasks.test_endpoint.delay.call_args_list == []
+    assert tasks.send_email_message.call_args_list == [
+        call(
+            "diagnostic",
+            "kenny@4geeks.com",
+            {"subject": f"Errors found on app {model.application.title}", "details": "{}"},
+            academy=model.application.academy,
+        )
+    ]
+
+
+def test_operational_app(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    result = {"status": "OPERATIONAL", "details": "{}", "severity_level": 0}
+    monkeypatch.setattr("breathecode.monitoring.tasks.run_app_diagnostic", MagicMock(return_value=result))
+
+    model = bc.database.create(application={"notify_email": "kenny@4geeks.com"}, endpoint=1)
+
+    tasks.monitor_app.delay(model.application.id)
+
+    assert tasks.run_app_diagnostic.call_args_list == [call(model.application)]
+    assert tasks.send_email_message.call_args_list == []
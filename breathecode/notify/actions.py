@@ -1,10 +1,14 @@
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 
 import requests
+from django.core.serializers.json import DjangoJSONEncoder
 from django.template.loader import get_template
 from django.utils import timezone
+from django.utils.html import escape
 from premailer import transform
 from pyfcm import FCMNotification
 from rest_framework.exceptions import APIException
@@ -23,6 +27,28 @@ if FIREBASE_KEY is not None and FIREBASE_KEY != "":
 
 logger = logging.getLogger(__name__)
 
+MAILGUN_BATCH_SIZE = 1000
+BULK_TEMPLATE_CACHE_SIZE = 64
+
+bulk_template_lock = threading.Lock()
+bulk_template_cache = OrderedDict()
+
+
+def post_mailgun_message(to, template, **kwargs):
+    return requests.post(
+        f"https://api.mailgun.net/v3/{os.environ.get('MAILGUN_DOMAIN')}/messages",
+        auth=("api", os.environ.get("MAILGUN_API_KEY", "")),
+        data={
+            "from": f"4Geeks <mailgun@{os.environ.get('MAILGUN_DOMAIN')}>",
+            "to": to,
+            "subject": template["subject"],
+            "text": template["text"],
+            "html": template["html"],
+            **kwargs,
+        },
+        timeout=2,
+    )
+
 
 def send_email_message(template_slug, to, data=None, force=False, inline_css=False, academy=None):
 
@@ -38,18 +64,7 @@ def send_email_message(template_slug, to, data=None, force=False, inline_css=Fal
     if os.getenv("EMAIL_NOTIFICATIONS_ENABLED", False) == "TRUE" or force:
         template = get_template_content(template_slug, data, ["email"], inline_css=inline_css, academy=academy)
 
-        result = requests.post(
-            f"https://api.mailgun.net/v3/{os.environ.get('MAILGUN_DOMAIN')}/messages",
-            auth=("api", os.environ.get("MAILGUN_API_KEY", "")),
-            data={
-                "from": f"4Geeks <mailgun@{os.environ.get('MAILGUN_DOMAIN')}>",
-                "to": to,
-                "subject": template["subject"],
-                "text": template["text"],
-                "html": template["html"],
-            },
-            timeout=2,
-        )
+        result = post_mailgun_message(to, template)
 
         if result.status_code != 200:
             logger.error(f"Error sending email, mailgun status code: {str(result.status_code)}")
@@ -63,6 +78,54 @@ def send_email_message(template_slug, to, data=None, force=False, inline_css=Fal
         return True
 
 
+def send_email_messages(template_slug, recipients, data=None, force=False, inline_css=False, academy=None):
+    """
+    Send a personalized email to many recipients, up to MAILGUN_BATCH_SIZE per request.
+
+    `recipients` is a dict of email to its own variables, like {"a@b.c": {"LINK": "..."}}, the template is
+    rendered and inlined once with mailgun placeholders (%recipient.LINK%) for those variables, so they only can
+    be printed by the template, not used in its tags. Mailgun replaces them after the render, so the html gets
+    its own escaped copy of each variable.
+    """
+
+    if data is None:
+        data = {}
+
+    if not recipients:
+        raise ValidationException(f"Invalid emails to send notification to {str(recipients)}")
+
+    emails = list(recipients.keys())
+
+    if os.getenv("EMAIL_NOTIFICATIONS_ENABLED", False) == "TRUE" or force:
+        recipient_keys = sorted({key for variables in recipients.values() for key in variables})
+        template = get_bulk_template_content(
+            template_slug, data, recipient_keys, inline_css=inline_css, academy=academy
+        )
+
+        success = True
+        for i in range(0, len(emails), MAILGUN_BATCH_SIZE):
+            chunk = emails[i : i + MAILGUN_BATCH_SIZE]
+            recipient_variables = {email: get_recipient_variables(recipients[email], recipient_keys) for email in chunk}
+
+            result = post_mailgun_message(
+                chunk,
+                template,
+                **{"recipient-variables": json.dumps(recipient_variables, cls=DjangoJSONEncoder)},
+            )
+
+            if result.status_code != 200:
+                logger.error(f"Error sending emails, mailgun status code: {str(result.status_code)}")
+                logger.error(result.text)
+                success = False
+            else:
+                logger.debug(f"Email notification {template_slug} sent to {len(chunk)} recipients")
+
+        return success
+    else:
+        logger.warning(f"Emails to {emails} not sent because EMAIL_NOTIFICATIONS_ENABLED != TRUE")
+        return True
+
+
 def send_sms(slug, phone_number, data=None, academy=None):
 
     if data is None:
@@ -204,6 +267,80 @@ def send_fcm_notification(slug, user_id, data=None):
     send_fcm(slug, registration_ids, data)
 
 
+def get_academy_branding(academy, data):
+    if not academy:
+        return {}
+
+    branding = {
+        "COMPANY_INFO_EMAIL": academy.feedback_email,
+        "COMPANY_LEGAL_NAME": academy.legal_name or academy.name,
+        "COMPANY_LOGO": academy.logo_url,
+        "COMPANY_NAME": academy.name,
+    }
+
+    if "heading" not in data:
+        branding["heading"] = academy.name
+
+    return branding
+
+
+def get_escaped_recipient_key(key):
+    return f"{key}__html"
+
+
+def get_recipient_variables(variables, recipient_keys):
+    result = {}
+    for key in recipient_keys:
+        value = variables.get(key, "")
+        result[key] = value
+        result[get_escaped_recipient_key(key)] = escape(value)
+
+    return result
+
+
+def render_bulk_template_content(slug, data, recipient_keys, inline_css=False):
+    text_data = {**data, **{key: f"%recipient.{key}%" for key in recipient_keys}}
+    html_data = {**data, **{key: f"%recipient.{get_escaped_recipient_key(key)}%" for key in recipient_keys}}
+
+    template = get_template_content(slug, text_data, ["email"])
+    template["html"] = get_template_content(slug, html_data, ["html"], inline_css=inline_css)["html"]
+
+    return template
+
+
+def get_bulk_template_content(slug, data, recipient_keys, inline_css=False, academy=None):
+    """
+    Get the email template of a bulk send, the `recipient_keys` are replaced by mailgun placeholders.
+
+    The output is cached per slug, data and academy branding, then every batch of a campaign renders and inlines
+    the template once. The template is always rendered from `data` itself, the json is just the cache key, and
+    data that cannot be serialized is rendered without cache.
+    """
+
+    data = {**data}
+    data.update(get_academy_branding(academy, data))
+
+    try:
+        key = (slug, json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder), tuple(recipient_keys), inline_css)
+
+    except TypeError:
+        return render_bulk_template_content(slug, data, recipient_keys, inline_css=inline_css)
+
+    with bulk_template_lock:
+        if key in bulk_template_cache:
+            bulk_template_cache.move_to_end(key)
+            return dict(bulk_template_cache[key])
+
+    template = render_bulk_template_content(slug, data, recipient_keys, inline_css=inline_css)
+
+    with bulk_template_lock:
+        bulk_template_cache[key] = template
+        while len(bulk_template_cache) > BULK_TEMPLATE_CACHE_SIZE:
+            bulk_template_cache.popitem(last=False)
+
+    return dict(template)
+
+
 def get_template_content(slug, data=None, formats=None, inline_css=False, academy=None):
 
     if data is None:
@@ -223,18 +360,10 @@ def get_template_content(slug, data=None, formats=None, inline_css=False, academ
 
     z = con.copy()  # start with x's keys and values
     z.update(data)
+    z.update(get_academy_branding(academy, z))
 
     templates = {}
 
-    if academy:
-        z["COMPANY_INFO_EMAIL"] = academy.feedback_email
-        z["COMPANY_LEGAL_NAME"] = academy.legal_name or academy.name
-        z["COMPANY_LOGO"] = academy.logo_url
-        z["COMPANY_NAME"] = academy.name
-
-        if "heading" not in z:
-            z["heading"] = academy.name
-
     if formats is None or "email" in formats:
         if "SUBJECT" in z:
             templates["SUBJECT"] = z["SUBJECT"]
@@ -19,7 +19,7 @@ from breathecode.marketing.signals import form_entry_won_or_lost, new_form_entry
 from breathecode.mentorship.models import MentorshipSession
 from breathecode.mentorship.serializers import SessionHookSerializer
 from breathecode.mentorship.signals import mentorship_session_status
-from breathecode.notify.models import HookError
+from breathecode.notify.models import Hook, HookError
 from breathecode.payments.models import PlanFinancing, Subscription
 from breathecode.payments.serializers import GetPlanFinancingSerializer, GetSubscriptionHookSerializer
 from breathecode.payments.signals import planfinancing_created, subscription_created
@@ -202,3 +202,9 @@ def new_subscription_created(sender, instance, **kwargs):
 def update_updated_at(sender, instance, **kwargs):
     instance.updated_at = timezone.now()
     instance.save()
+
+
+@receiver(post_save, sender=Hook)
+@receiver(post_delete, sender=Hook)
+def clear_hook_index(sender, instance, **kwargs):
+    HookManager.clear_hook_index()
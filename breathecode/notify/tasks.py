@@ -1,19 +1,15 @@
-import json
 import logging
 import os
-from datetime import datetime
-from decimal import Decimal
 
-import requests
 from celery import shared_task
-from django.core.serializers.json import DjangoJSONEncoder
-from django.utils import timezone
+from django.core.exceptions import ObjectDoesNotExist
 from task_manager.core.exceptions import AbortTask
 from task_manager.django.decorators import task
 
 from breathecode.authenticate.models import Token
 from breathecode.mentorship.models import MentorshipSession
 from breathecode.notify import actions
+from breathecode.notify.utils import hook_delivery
 from breathecode.services.slack.client import Slack
 from breathecode.utils.decorators import TaskPriority
 
@@ -114,80 +110,67 @@ def async_deliver_hook(target, payload, hook_id=None, **kwargs):
 
     from .utils.hook_manager import HookManager
 
-    def parse_payload(payload: dict):
-        if not isinstance(payload, dict):
-            return payload
-
-        for key in payload.keys():
-            # TypeError("string indices must be integers, not 'str'")
-            if isinstance(payload[key], datetime):
-                payload[key] = payload[key].isoformat().replace("+00:00", "Z")
-
-            elif isinstance(payload[key], Decimal):
-                payload[key] = str(payload[key])
-
-            elif isinstance(payload[key], list) or isinstance(payload[key], tuple) or isinstance(payload[key], set):
-                l = []
-                for item in payload[key]:
-                    l.append(parse_payload(item))
-
-                payload[key] = l
-
-            elif isinstance(payload[key], dict):
-                payload[key] = parse_payload(payload[key])
-
-        return payload
-
     logger.info("Starting async_deliver_hook")
 
     has_response = False
 
     try:
-        if isinstance(payload, dict):
-            payload = parse_payload(payload)
+        payload, encoded_payload = hook_delivery.encode_payload(payload)
+        response = hook_delivery.post_hook(target, encoded_payload)
+        has_response = True
+
+        if hook_id:
+            result = {
+                "hook_id": hook_id,
+                "payload": payload,
+                "encoded_payload": encoded_payload,
+                "response": response,
+            }
+            if hook_id not in hook_delivery.flush_hook_stats([result]):
+                hook_model_cls = HookManager.get_hook_model()
+                raise hook_model_cls.DoesNotExist("Hook matching query does not exist.")
+
+    except Exception as e:
+        logger.error(payload)
+        if has_response and not isinstance(e, ObjectDoesNotExist):
+            raise AbortTask(f"Error while trying to save hook call with status code {response.status_code}. {payload}")
 
-        elif isinstance(payload, list):
-            l = []
-            for item in payload:
-                l.append(parse_payload(item))
+        raise e
 
-            payload = l
 
-        encoded_payload = json.dumps(payload, cls=DjangoJSONEncoder)
-        response = requests.post(
-            url=target, data=encoded_payload, headers={"Content-Type": "application/json"}, timeout=2
-        )
-        has_response = True
+@task(priority=TaskPriority.DEFAULT.value)
+def async_deliver_hooks(deliveries, **kwargs):
+    """
+    Deliver a batch of hooks in parallel.
 
-        if hook_id:
-            hook_model_cls = HookManager.get_hook_model()
-            hook = hook_model_cls.objects.get(id=hook_id)
-            if response.status_code == 410:
-                hook.delete()
+    deliveries: a list of dicts with the `hook_id`, the `target`, the `payload` and the `attempt`.
 
-            else:
+    The deliveries that failed because of the network or a 5xx are retried with exponential backoff, after
+    HOOK_MAX_ATTEMPTS they are recorded as a HookError of their hook.
+    """
 
-                data = hook.sample_data
-                if not isinstance(data, list):
-                    data = []
+    logger.info(f"Starting async_deliver_hooks for {len(deliveries)} deliveries")
 
-                if "data" in payload and isinstance(payload["data"], dict):
-                    data.append(payload["data"])
-                elif isinstance(payload, dict):
-                    data.append(json.loads(encoded_payload))
+    results = hook_delivery.fan_out(deliveries)
+    hook_delivery.flush_hook_stats(results)
 
-                if len(data) > 10:
-                    data = data[1:10]
+    retries = {}
+    for result in results:
+        if not hook_delivery.is_retryable(result):
+            continue
 
-                hook.last_response_code = response.status_code
-                hook.last_call_at = timezone.now()
-                hook.sample_data = data
-                hook.total_calls = hook.total_calls + 1
-                hook.save()
+        attempt = result.get("attempt", 1)
+        if attempt >= hook_delivery.HOOK_MAX_ATTEMPTS:
+            hook_delivery.dead_letter(result)
+            continue
 
-    except Exception as e:
-        logger.error(payload)
-        if has_response:
-            raise AbortTask(f"Error while trying to save hook call with status code {response.status_code}. {payload}")
+        delivery = {
+            "hook_id": result.get("hook_id"),
+            "target": result["target"],
+            "payload": result["payload"],
+            "attempt": attempt + 1,
+        }
+        retries.setdefault(attempt, []).append(delivery)
 
-        raise e
+    for attempt, pending in retries.items():
+        hook_delivery.schedule_retry(pending, attempt)
@@ -0,0 +1,141 @@
+"""
+Test send_email_messages
+"""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from breathecode.notify import actions
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("EMAIL_NOTIFICATIONS_ENABLED", "TRUE")
+    monkeypatch.setattr("requests.post", MagicMock(return_value=MagicMock(status_code=200)))
+    monkeypatch.setattr(actions, "transform", MagicMock(side_effect=lambda html: html))
+    actions.bulk_template_cache.clear()
+
+    yield
+
+    actions.bulk_template_cache.clear()
+
+
+def get_data():
+    return {"SUBJECT": "Rate us", "MESSAGE": "How was it?", "BUTTON": "Vote"}
+
+
+def test_without_recipients():
+    with pytest.raises(Exception, match="Invalid emails to send notification to"):
+        actions.send_email_messages("nps_survey", {}, get_data())
+
+
+def test_one_request_per_batch(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    import requests
+
+    monkeypatch.setattr(actions, "MAILGUN_BATCH_SIZE", 2)
+
+    recipients = {f"user{n}@4geeks.com": {"LINK": f"https://4geeks.com/{n}"} for n in range(3)}
+
+    assert actions.send_email_messages("nps_survey", recipients, get_data(), inline_css=True) is True
+
+    assert len(requests.post.call_args_list) == 2
+
+    first = requests.post.call_args_list[0].kwargs["data"]
+    second = requests.post.call_args_list[1].kwargs["data"]
+
+    assert first["to"] == ["user0@4geeks.com", "user1@4geeks.com"]
+    assert second["to"] == ["user2@4geeks.com"]
+
+    assert json.loads(first["recipient-variables"]) == {
+        "user0@4geeks.com": {"LINK": "https://4geeks.com/0", "LINK__html": "https://4geeks.com/0"},
+        "user1@4geeks.com": {"LINK": "https://4geeks.com/1", "LINK__html": "https://4geeks.com/1"},
+    }
+    assert json.loads(second["recipient-variables"]) == {
+        "user2@4geeks.com": {"LINK": "https://4geeks.com/2", "LINK__html": "https://4geeks.com/2"},
+    }
+
+    assert first["subject"] == "Rate us"
+    assert "%recipient.LINK%" in first["text"]
+    assert "%recipient.LINK__html%" in first["html"]
+    assert first["html"] == second["html"]
+
+    # the template was rendered and inlined once
+    assert len(actions.bulk_template_cache) == 1
+    assert len(actions.transform.call_args_list) == 1
+
+
+def test_recipient_variables_are_escaped_in_the_html(bc: Breathecode):
+    import requests
+
+    link = 'https://4geeks.com/?a=1&b="2"'
+    recipients = {"user@4geeks.com": {"LINK": link}}
+
+    assert actions.send_email_messages("nps_survey", recipients, get_data()) is True
+
+    data = requests.post.call_args_list[0].kwargs["data"]
+
+    assert json.loads(data["recipient-variables"]) == {
+        "user@4geeks.com": {"LINK": link, "LINK__html": "https://4geeks.com/?a=1&amp;b=&quot;2&quot;"},
+    }
+    assert "%recipient.LINK%" in data["text"]
+    assert "%recipient.LINK%" not in data["html"]
+    assert "%recipient.LINK__html%" in data["html"]
+
+
+def test_data_is_rendered_without_serializing_it(bc: Breathecode):
+    import requests
+
+    model = bc.database.create(academy=1)
+    data = {**get_data(), "MESSAGE": model.academy}
+    recipients = {"user@4geeks.com": {"LINK": "https://4geeks.com"}}
+
+    assert actions.send_email_messages("nps_survey", recipients, data) is True
+
+    html = requests.post.call_args_list[0].kwargs["data"]["html"]
+    assert str(model.academy) in html
+
+    # a model instance cannot be part of the cache key
+    assert len(actions.bulk_template_cache) == 0
+
+
+def test_template_is_cached_per_academy(bc: Breathecode):
+    import requests
+
+    model = bc.database.create(academy=2)
+    recipients = {"user@4geeks.com": {"LINK": "https://4geeks.com"}}
+
+    actions.send_email_messages("nps_survey", recipients, get_data(), academy=model.academy[0])
+    actions.send_email_messages("nps_survey", recipients, get_data(), academy=model.academy[0])
+    actions.send_email_messages("nps_survey", recipients, get_data(), academy=model.academy[1])
+
+    assert len(requests.post.call_args_list) == 3
+    assert len(actions.bulk_template_cache) == 2
+
+    html = [x.kwargs["data"]["html"] for x in requests.post.call_args_list]
+    assert model.academy[0].name in html[0]
+    assert model.academy[1].name in html[2]
+
+
+def test_mailgun_error(bc: Breathecode):
+    import requests
+
+    requests.post.return_value = MagicMock(status_code=400, text="bad request")
+
+    recipients = {"user@4geeks.com": {"LINK": "https://4geeks.com"}}
+
+    assert actions.send_email_messages("nps_survey", recipients, get_data()) is False
+
+
+def test_notifications_disabled(monkeypatch: pytest.MonkeyPatch):
+    import requests
+
+    monkeypatch.setenv("EMAIL_NOTIFICATIONS_ENABLED", "FALSE")
+
+    recipients = {"user@4geeks.com": {"LINK": "https://4geeks.com"}}
+
+    assert actions.send_email_messages("nps_survey", recipients, get_data()) is True
+    assert requests.post.call_args_list == []
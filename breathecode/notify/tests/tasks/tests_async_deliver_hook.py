@@ -36,7 +36,7 @@ class TestAsyncDeliverHook(LegacyAPITestCase):
         }
 
         url = fake.url()
-        with patch("requests.post", apply_requests_post_mock([(201, url, {})])):
+        with patch("requests.Session.post", apply_requests_post_mock([(201, url, {})])):
             res = async_deliver_hook(url, data)
 
         assert res == None
@@ -55,7 +55,7 @@ class TestAsyncDeliverHook(LegacyAPITestCase):
         }
 
         url = fake.url()
-        with patch("requests.post", apply_requests_post_mock([(201, url, {})])):
+        with patch("requests.Session.post", apply_requests_post_mock([(201, url, {})])):
             with self.assertRaisesMessage(Hook.DoesNotExist, "Hook matching query does not exist."):
                 async_deliver_hook(url, data, hook_id=1)
 
@@ -77,7 +77,7 @@ class TestAsyncDeliverHook(LegacyAPITestCase):
         model = self.bc.database.create(hook=1)
 
         url = fake.url()
-        with patch("requests.post", apply_requests_post_mock([(201, url, {})])):
+        with patch("requests.Session.post", apply_requests_post_mock([(201, url, {})])):
             res = async_deliver_hook(url, data, hook_id=1)
 
         assert res == None
@@ -112,7 +112,7 @@ class TestAsyncDeliverHook(LegacyAPITestCase):
         model = self.bc.database.create(hook=1)
 
         url = fake.url()
-        with patch("requests.post", apply_requests_post_mock([(410, url, {})])):
+        with patch("requests.Session.post", apply_requests_post_mock([(410, url, {})])):
             res = async_deliver_hook(url, data, hook_id=1)
 
         assert res == None
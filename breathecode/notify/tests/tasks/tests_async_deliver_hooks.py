@@ -0,0 +1,122 @@
+"""
+Test async_deliver_hooks
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, call
+
+import pytest
+import requests
+from django.utils import timezone
+
+from breathecode.notify.tasks import async_deliver_hooks
+from breathecode.notify.utils import hook_delivery
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+UTC_NOW = timezone.now()
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    monkeypatch.setattr(hook_delivery, "schedule_retry", MagicMock())
+
+    yield
+
+
+def response(status_code):
+    return MagicMock(status_code=status_code)
+
+
+def delivery(hook, payload, attempt=1):
+    return {"hook_id": hook.id, "target": hook.target, "payload": payload, "attempt": attempt}
+
+
+def test_stats_are_aggregated_per_hook(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    post = MagicMock(return_value=response(201))
+    monkeypatch.setattr(requests.Session, "post", post)
+
+    model = bc.database.create(hook=(2, {"sample_data": [{"n": 0}], "total_calls": 3}))
+
+    async_deliver_hooks(
+        [
+            delivery(model.hook[0], {"n": 1}),
+            delivery(model.hook[0], {"n": 2}),
+            delivery(model.hook[1], {"data": {"n": 3}}),
+        ]
+    )
+
+    assert len(post.call_args_list) == 3
+    assert bc.database.list_of("notify.Hook") == [
+        {
+            **bc.format.to_dict(model.hook[0]),
+            "total_calls": 5,
+            "last_call_at": UTC_NOW,
+            "last_response_code": 201,
+            "sample_data": [{"n": 0}, {"n": 1}, {"n": 2}],
+        },
+        {
+            **bc.format.to_dict(model.hook[1]),
+            "total_calls": 4,
+            "last_call_at": UTC_NOW,
+            "last_response_code": 201,
+            "sample_data": [{"n": 0}, {"n": 3}],
+        },
+    ]
+    assert hook_delivery.schedule_retry.call_args_list == []
+
+
+def test_gone_hooks_are_removed(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(requests.Session, "post", MagicMock(return_value=response(410)))
+
+    model = bc.database.create(hook=1)
+
+    async_deliver_hooks([delivery(model.hook, {"n": 1})])
+
+    assert bc.database.list_of("notify.Hook") == []
+    assert hook_delivery.schedule_retry.call_args_list == []
+
+
+@pytest.mark.parametrize("status_code, side_effect", [(503, None), (None, requests.ConnectionError("down"))])
+def test_failures_are_retried_with_backoff(bc: Breathecode, monkeypatch: pytest.MonkeyPatch, status_code, side_effect):
+    monkeypatch.setattr(
+        requests.Session,
+        "post",
+        MagicMock(return_value=response(status_code), side_effect=side_effect),
+    )
+
+    model = bc.database.create(hook=1)
+
+    async_deliver_hooks([delivery(model.hook, {"n": 1}, attempt=3)])
+
+    assert hook_delivery.schedule_retry.call_args_list == [
+        call([delivery(model.hook, {"n": 1}, attempt=4)], 3),
+    ]
+    assert bc.database.list_of("notify.HookError") == []
+
+
+def test_backoff_is_exponential():
+    assert [hook_delivery.get_backoff(attempt) for attempt in range(1, 5)] == [
+        timedelta(seconds=30),
+        timedelta(minutes=1),
+        timedelta(minutes=2),
+        timedelta(minutes=4),
+    ]
+
+
+def test_last_attempt_goes_to_the_dead_letter(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(requests.Session, "post", MagicMock(return_value=response(500)))
+
+    model = bc.database.create(hook={"event": "survey.created"})
+
+    async_deliver_hooks([delivery(model.hook, {"n": 1}, attempt=5)])
+
+    assert hook_delivery.schedule_retry.call_args_list == []
+    assert bc.database.list_of("notify.HookError") == [
+        {
+            "id": 1,
+            "message": "Hook delivery failed after 5 attempts with status code 500",
+            "event": "survey.created",
+        },
+    ]
+    assert [x.id for x in bc.database.get("notify.HookError", 1, dict=False).hooks.all()] == [1]
@@ -11,7 +11,7 @@ from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
 @pytest.fixture(autouse=True)
 def mocks(db, monkeypatch):
     m1 = MagicMock()
-    monkeypatch.setattr(tasks.async_deliver_hook, "delay", m1)
+    monkeypatch.setattr(tasks.async_deliver_hooks, "delay", m1)
     yield m1
 
 
@@ -61,14 +61,19 @@ def test_transform_timedeltas(bc: Breathecode, enable_signals, enable_hook_manag
 
     assert mock.call_args_list == [
         call(
-            model.hook.target,
-            {
-                "delta": 259200.0,
-                "children": [
-                    {"delta": 345600.0},
-                    {"delta": 432000.0},
-                ],
-            },
-            hook_id=1,
+            [
+                {
+                    "hook_id": 1,
+                    "target": model.hook.target,
+                    "payload": {
+                        "delta": 259200.0,
+                        "children": [
+                            {"delta": 345600.0},
+                            {"delta": 432000.0},
+                        ],
+                    },
+                    "attempt": 1,
+                },
+            ]
         ),
     ]
@@ -0,0 +1,226 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Optional
+
+import requests
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HOOK_TIMEOUT = 2
+HOOK_MAX_WORKERS = 10
+HOOK_MAX_ATTEMPTS = 5
+HOOK_BACKOFF = 30
+HOOK_SAMPLE_SIZE = 10
+HOOK_RETRYABLE_STATUS_CODES = (408, 425, 429)
+
+session_lock = threading.Lock()
+session: Optional[requests.Session] = None
+
+
+def get_hook_session() -> requests.Session:
+    """Get the session of the worker, it keeps a pool of connections per target host."""
+
+    global session
+
+    if session is None:
+        with session_lock:
+            if session is None:
+                s = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=HOOK_MAX_WORKERS, pool_maxsize=HOOK_MAX_WORKERS
+                )
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                session = s
+
+    return session
+
+
+def parse_payload(payload: Any) -> Any:
+    if not isinstance(payload, dict):
+        return payload
+
+    for key in payload.keys():
+        # TypeError("string indices must be integers, not 'str'")
+        if isinstance(payload[key], datetime):
+            payload[key] = payload[key].isoformat().replace("+00:00", "Z")
+
+        elif isinstance(payload[key], Decimal):
+            payload[key] = str(payload[key])
+
+        elif isinstance(payload[key], list) or isinstance(payload[key], tuple) or isinstance(payload[key], set):
+            payload[key] = [parse_payload(item) for item in payload[key]]
+
+        elif isinstance(payload[key], dict):
+            payload[key] = parse_payload(payload[key])
+
+    return payload
+
+
+def encode_payload(payload: Any) -> tuple[Any, str]:
+    """Get the payload parsed to primitives and its json representation."""
+
+    if isinstance(payload, dict):
+        payload = parse_payload(payload)
+
+    elif isinstance(payload, list):
+        payload = [parse_payload(item) for item in payload]
+
+    return payload, json.dumps(payload, cls=DjangoJSONEncoder)
+
+
+def post_hook(target: str, encoded_payload: str) -> requests.Response:
+    return get_hook_session().post(
+        url=target, data=encoded_payload, headers={"Content-Type": "application/json"}, timeout=HOOK_TIMEOUT
+    )
+
+
+def deliver(delivery: dict) -> dict:
+    """Send a delivery, it never raises, the response or the error is attached to the result."""
+
+    result = {**delivery, "response": None, "error": None}
+
+    try:
+        result["payload"], result["encoded_payload"] = encode_payload(delivery["payload"])
+        result["response"] = post_hook(delivery["target"], result["encoded_payload"])
+
+    except Exception as e:
+        logger.error(f"Error delivering hook {delivery.get('hook_id')} to {delivery['target']}: {e}")
+        result["error"] = str(e)
+
+    return result
+
+
+def fan_out(deliveries: list[dict]) -> list[dict]:
+    """Send the deliveries in parallel, each target is reached through the pooled session."""
+
+    if len(deliveries) == 1:
+        return [deliver(deliveries[0])]
+
+    with ThreadPoolExecutor(max_workers=min(HOOK_MAX_WORKERS, len(deliveries))) as executor:
+        return list(executor.map(deliver, deliveries))
+
+
+def get_sample(payload: Any, encoded_payload: str) -> Any:
+    if isinstance(payload, dict) and "data" in payload and isinstance(payload["data"], dict):
+        return payload["data"]
+
+    if isinstance(payload, dict):
+        return json.loads(encoded_payload)
+
+    return None
+
+
+def flush_hook_stats(results: list[dict]) -> set[int]:
+    """
+    Save the stats of the calls of each hook, the counters are aggregated per hook and incremented with F().
+
+    The hooks that answered 410 are removed. It returns the ids of the hooks that were found.
+    """
+
+    from .hook_manager import HookManager
+
+    hook_model_cls = HookManager.get_hook_model()
+
+    stats = {}
+    gone = set()
+    for result in results:
+        hook_id = result.get("hook_id")
+        response = result["response"]
+        if not hook_id or response is None:
+            continue
+
+        if response.status_code == 410:
+            gone.add(hook_id)
+            continue
+
+        stat = stats.setdefault(hook_id, {"calls": 0, "samples": []})
+        stat["calls"] += 1
+        stat["last_response_code"] = response.status_code
+
+        sample = get_sample(result["payload"], result["encoded_payload"])
+        if sample is not None:
+            stat["samples"].append(sample)
+
+    found = set()
+    if gone:
+        found |= set(hook_model_cls.objects.filter(id__in=gone).values_list("id", flat=True))
+        hook_model_cls.objects.filter(id__in=gone).delete()
+
+    if not stats:
+        return found
+
+    now = timezone.now()
+    sample_data = dict(hook_model_cls.objects.filter(id__in=stats.keys()).values_list("id", "sample_data"))
+
+    for hook_id, stat in stats.items():
+        if hook_id not in sample_data:
+            continue
+
+        data = sample_data[hook_id]
+        if not isinstance(data, list):
+            data = []
+
+        data = (data + stat["samples"])[-HOOK_SAMPLE_SIZE:]
+
+        hook_model_cls.objects.filter(id=hook_id).update(
+            total_calls=F("total_calls") + stat["calls"],
+            last_call_at=now,
+            last_response_code=stat["last_response_code"],
+            sample_data=data,
+        )
+        found.add(hook_id)
+
+    return found
+
+
+def is_retryable(result: dict) -> bool:
+    response = result["response"]
+    if response is None:
+        return True
+
+    return response.status_code >= 500 or response.status_code in HOOK_RETRYABLE_STATUS_CODES
+
+
+def get_backoff(attempt: int) -> timedelta:
+    """Exponential backoff, 30s, 1m, 2m, 4m..."""
+
+    return timedelta(seconds=HOOK_BACKOFF * 2 ** (attempt - 1))
+
+
+def schedule_retry(deliveries: list[dict], attempt: int) -> None:
+    from ..tasks import async_deliver_hooks
+
+    eta = timezone.now() + get_backoff(attempt)
+    async_deliver_hooks.apply_async(args=(deliveries,), eta=eta)
+
+
+def dead_letter(result: dict) -> None:
+    """Record a delivery that ran out of attempts in the errors of its hook."""
+
+    from breathecode.notify.models import HookError
+
+    from .hook_manager import HookManager
+
+    hook_model_cls = HookManager.get_hook_model()
+    hook = hook_model_cls.objects.filter(id=result.get("hook_id")).first()
+    if hook is None:
+        return
+
+    if result["response"] is not None:
+        message = (
+            f"Hook delivery failed after {result['attempt']} attempts with status code {result['response'].status_code}"
+        )
+    else:
+        message = f"Hook delivery failed after {result['attempt']} attempts: {result['error']}"
+
+    error, _ = HookError.objects.get_or_create(message=message[:255], event=hook.event)
+    if error.hooks.filter(id=hook.id).exists() is False:
+        error.hooks.add(hook)
@@ -3,14 +3,17 @@ from datetime import timedelta
 
 from django.apps import apps as django_apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 
 from breathecode.notify.models import HookError
 
-from ..tasks import async_deliver_hook
+from ..tasks import async_deliver_hooks
 
 logger = logging.getLogger(__name__)
 
+HOOK_INDEX_TIMEOUT = 60 * 5
+
 
 class HookManagerClass(object):
     _HOOK_EVENT_ACTIONS_CONFIG = None
@@ -101,31 +104,21 @@ class HookManagerClass(object):
         """
         Look up Hooks that apply
         """
-        try:
-            from django.contrib.auth import get_user_model
-
-            user_cls = get_user_model()
-        except ImportError:
-            from django.contrib.auth.models import User as user_cls  # noqa: N813
 
         if event_name not in self.HOOK_EVENTS.keys():
             raise Exception('"{}" does not exist in `settings.HOOK_EVENTS`.'.format(event_name))
 
-        filters = {"event": event_name}
-
         # only process hooks from instances from the same academy
         if academy_override is not None:
-            superadmins = user_cls.objects.filter(is_superuser=True).values_list("username", flat=True)
-            filters["user__username__in"] = [academy_override.slug] + list(superadmins)
+            hooks = self.get_hooks(event_name, academy_override.slug)
         elif hasattr(instance, "academy") and instance.academy is not None:
-            superadmins = user_cls.objects.filter(is_superuser=True).values_list("username", flat=True)
-            filters["user__username__in"] = [instance.academy.slug] + list(superadmins)
+            hooks = self.get_hooks(event_name, instance.academy.slug)
         else:
             logger.debug(
                 f"Only admin will receive hook notification for {event_name} because entity has not academy property"
             )
             # Only the admin can retrieve events from objects that don't belong to any academy
-            filters["user__is_superuser"] = True
+            hooks = self.get_hooks(event_name)
 
         # Ignore the user if the user_override is False
         # if user_override is not False:
@@ -138,10 +131,56 @@ class HookManagerClass(object):
         #     else:
         #         raise Exception('{} has no `user` property. REST Hooks needs this.'.format(repr(instance)))
 
-        hook_model_cls = self.get_hook_model()
-        hooks = hook_model_cls.objects.filter(**filters)
+        deliveries = []
         for hook in hooks:
-            self.deliver_hook(hook, instance, payload_override=payload_override, academy_override=academy_override)
+            delivery = self.build_delivery(hook, instance, payload_override=payload_override)
+            if delivery:
+                deliveries.append(delivery)
+
+        if deliveries:
+            async_deliver_hooks.delay(deliveries)
+
+    def get_hook_index_key(self, event_name):
+        return f"hook-index:{event_name}"
+
+    def get_hook_index(self, event_name):
+        """
+        Get the subscriptions of an event, grouped by the username of their owner, the hooks of the superadmins
+        are kept apart because they receive the events of every academy.
+        """
+
+        key = self.get_hook_index_key(event_name)
+        index = cache.get(key)
+        if index is not None:
+            return index
+
+        index = {"superadmins": [], "users": {}}
+
+        hook_model_cls = self.get_hook_model()
+        for hook in hook_model_cls.objects.filter(event=event_name).select_related("user"):
+            if hook.user.is_superuser:
+                index["superadmins"].append(hook)
+
+            index["users"].setdefault(hook.user.username, []).append(hook)
+
+        cache.set(key, index, timeout=HOOK_INDEX_TIMEOUT)
+        return index
+
+    def clear_hook_index(self):
+        cache.delete_many([self.get_hook_index_key(event_name) for event_name in self.HOOK_EVENTS.keys()])
+
+    def get_hooks(self, event_name, academy_slug=None):
+        """Get the hooks subscribed to an event, without an academy only the superadmins receive it."""
+
+        index = self.get_hook_index(event_name)
+        if academy_slug is None:
+            return index["superadmins"]
+
+        hooks = {hook.id: hook for hook in index["users"].get(academy_slug, [])}
+        for hook in index["superadmins"]:
+            hooks.setdefault(hook.id, hook)
+
+        return list(hooks.values())
 
     def process_model_event(
         self,
@@ -225,10 +264,9 @@ class HookManagerClass(object):
 
         return payload
 
-    def deliver_hook(self, hook, instance, payload_override=None, academy_override=None):
+    def build_delivery(self, hook, instance, payload_override=None):
         """
-        Deliver the payload to the target URL.
-        By default it serializes to JSON and POSTs.
+        Build the delivery of a hook, it returns None if the payload could not be built.
         Args:
             instance: instance that triggered event.
             payload_override: JSON-serializable object or callable that will
@@ -244,18 +282,26 @@ class HookManagerClass(object):
             if callable(payload):
                 payload = payload(hook, instance)
 
-            logger.debug(f"Calling delayed task deliver_hook for hook {hook.id}")
-
             self.serialize(payload)
 
-            async_deliver_hook.delay(hook.target, payload, hook_id=hook.id)
+            return {"hook_id": hook.id, "target": hook.target, "payload": payload, "attempt": 1}
 
-            return None
         except Exception as e:
             instance, _ = HookError.objects.get_or_create(message=str(e), event=hook.event)
 
             if instance.hooks.filter(id=hook.id).exists() is False:
                 instance.hooks.add(hook)
 
+    def deliver_hook(self, hook, instance, payload_override=None, academy_override=None):
+        """
+        Deliver the payload to the target URL.
+        By default it serializes to JSON and POSTs.
+        """
+
+        delivery = self.build_delivery(hook, instance, payload_override=payload_override)
+        if delivery:
+            logger.debug(f"Calling delayed task deliver_hook for hook {hook.id}")
+            async_deliver_hooks.delay([delivery])
+
 
 HookManager = HookManagerClass()
@@ -10,7 +10,7 @@ from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
 @pytest.fixture(autouse=True)
 def mocks(db, monkeypatch):
     m1 = MagicMock()
-    monkeypatch.setattr(tasks.async_deliver_hook, "delay", m1)
+    monkeypatch.setattr(tasks.async_deliver_hooks, "delay", m1)
     yield m1
 
 
@@ -78,6 +78,24 @@ def test_nothing_happens(bc: Breathecode, enable_signals, enable_hook_manager, m
     assert bc.database.list_of("payments.subscription") == bc.format.to_dict(model.subscription)
 
     assert mock.call_args_list == [
-        call(base.hook.target, serializer(model.subscription[0], user=model.user, academy=model.academy), hook_id=1),
-        call(base.hook.target, serializer(model.subscription[1], user=model.user, academy=model.academy), hook_id=1),
+        call(
+            [
+                {
+                    "hook_id": 1,
+                    "target": base.hook.target,
+                    "payload": serializer(model.subscription[0], user=model.user, academy=model.academy),
+                    "attempt": 1,
+                },
+            ]
+        ),
+        call(
+            [
+                {
+                    "hook_id": 1,
+                    "target": base.hook.target,
+                    "payload": serializer(model.subscription[1], user=model.user, academy=model.academy),
+                    "attempt": 1,
+                },
+            ]
+        ),
     ]
@@ -5,14 +5,21 @@ import logging
 import os
 import pathlib
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from urllib.parse import urlencode
 
 import requests
-from django.db.models import Q
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Greatest
 from django.template.loader import get_template
 from django.utils import timezone
 from github import Github
+from slugify import slugify
 
 from breathecode.assessment.actions import create_from_asset
 from breathecode.authenticate.models import CredentialsGithub
@@ -20,7 +27,16 @@ from breathecode.media.models import Media, MediaResolution
 from breathecode.services.google_cloud.storage import Storage
 from breathecode.utils.views import set_query_parameter
 
-from .models import ASSET_STATUS, Asset, AssetErrorLog, AssetImage, AssetTechnology, ContentVariable, OriginalityScan
+from .models import (
+    ASSET_STATUS,
+    Asset,
+    AssetAlias,
+    AssetErrorLog,
+    AssetImage,
+    AssetTechnology,
+    ContentVariable,
+    OriginalityScan,
+)
 from .serializers import AssetBigSerializer
 from .utils import (
     ArticleValidator,
@@ -36,6 +52,9 @@ logger = logging.getLogger(__name__)
 
 ASSET_STATUS_DICT = [x for x, y in ASSET_STATUS]
 
+# the assets are written in many languages, so the words are not stemmed
+ASSET_SEARCH_CONFIG = "simple"
+
 
 # remove markdown elemnts from text and return the clean text output only
 def unmark(text):
@@ -1032,17 +1051,22 @@ def scan_asset_originality(asset: Asset):
     scan.save()
 
 
-def upload_image_to_bucket(img: AssetImage, asset=None):
-
-    from ..services.google_cloud import Storage
-
-    link = img.original_url
+def get_image_download_link(link: str) -> str:
     if "github.com" in link and not "raw=true" in link:
         if "?" in link:
             link = link + "&raw=true"
         else:
             link = link + "?raw=true"
 
+    return link
+
+
+def upload_image_to_bucket(img: AssetImage, asset=None):
+
+    from ..services.google_cloud import Storage
+
+    link = get_image_download_link(img.original_url)
+
     r = requests.get(link, stream=True, timeout=2)
     if r.status_code != 200:
         raise Exception(f"Error downloading image from asset image {img.name}: {link}")
@@ -1074,6 +1098,202 @@ def upload_image_to_bucket(img: AssetImage, asset=None):
     return img
 
 
+IMAGE_DOWNLOAD_TIMEOUT = 5
+IMAGE_MAX_WORKERS = 8
+
+image_context = threading.local()
+image_session_lock = threading.Lock()
+image_session: Optional[requests.Session] = None
+
+
+def get_image_session() -> requests.Session:
+    """Get the session used to download the readme images, it keeps a pool of connections per host."""
+
+    global image_session
+
+    if image_session is None:
+        with image_session_lock:
+            if image_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=IMAGE_MAX_WORKERS, pool_maxsize=IMAGE_MAX_WORKERS
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                image_session = session
+
+    return image_session
+
+
+def get_image_storage() -> Storage:
+    """Get the storage client of the current thread, the clients must not be shared between threads."""
+
+    if not hasattr(image_context, "storage"):
+        image_context.storage = Storage()
+
+    return image_context.storage
+
+
+def download_readme_image(link: str) -> dict:
+    """Download an image of a readme, it returns its content, hash and mime."""
+
+    response = get_image_session().get(get_image_download_link(link), timeout=IMAGE_DOWNLOAD_TIMEOUT)
+    if response.status_code != 200:
+        raise Exception(f"Error downloading image from {link}")
+
+    content_type = response.headers.get("content-type")
+    found_mime = [mime for mime in allowed_mimes() if content_type and content_type in mime]
+    if len(found_mime) == 0:
+        raise Exception(f"Skipping image download for {link}, invalid mime {content_type}")
+
+    return {
+        "content": response.content,
+        "hash": hashlib.sha256(response.content).hexdigest(),
+        "mime": found_mime[0],
+    }
+
+
+def upload_readme_image(name: str, hash: str, content: bytes) -> str:
+    """Upload an image to the bucket unless it already exists, it returns its url."""
+
+    extension = pathlib.Path(name).suffix
+    cloud_file = get_image_storage().file(asset_images_bucket(), hash + extension)
+    if not cloud_file.exists():
+        cloud_file.upload(content)
+
+    return cloud_file.url()
+
+
+def mirror_readme_images(asset: Asset, links: list[str]) -> dict[str, AssetImage]:
+    """
+    Mirror the images of a readme into the bucket and replace their links.
+
+    The images are downloaded and uploaded concurrently, an image whose content was already mirrored is not
+    uploaded again, the images are saved in bulk and the images that the asset does not use anymore are released.
+    """
+
+    now = timezone.now()
+    images = {}
+    for img in AssetImage.objects.filter(Q(original_url__in=links) | Q(bucket_url__in=links)):
+        images[img.original_url] = img
+        images[img.bucket_url] = img
+
+    pending = [x for x in links if x not in images or images[x].download_status != "OK"]
+    for link in pending:
+        if link not in images:
+            images[link] = AssetImage(name=link.split("/")[-1].split("?")[0], original_url=link)
+
+        images[link].last_download_at = now
+        images[link].download_status = "PENDING"
+        images[link].download_details = f"Downloading {link}"
+
+    def download(link):
+        try:
+            return link, download_readme_image(link)
+        except Exception as e:
+            return link, e
+
+    with ThreadPoolExecutor(max_workers=IMAGE_MAX_WORKERS) as executor:
+        downloads = dict(executor.map(download, pending))
+
+    for link, result in downloads.items():
+        if isinstance(result, Exception):
+            images[link].download_status = "ERROR"
+            images[link].download_details = str(result)
+
+    # the content of an image could be mirrored already from another url
+    downloaded = {link: x for link, x in downloads.items() if not isinstance(x, Exception)}
+    bucket_urls = dict(
+        AssetImage.objects.filter(hash__in={x["hash"] for x in downloaded.values()}, download_status="OK")
+        .exclude(bucket_url="")
+        .values_list("hash", "bucket_url")
+    )
+
+    uploads = {}
+    for link, result in downloaded.items():
+        if result["hash"] not in bucket_urls:
+            uploads.setdefault(result["hash"], (images[link].name, result["content"]))
+
+    def upload(hash):
+        name, content = uploads[hash]
+        try:
+            return hash, upload_readme_image(name, hash, content)
+        except Exception as e:
+            return hash, e
+
+    with ThreadPoolExecutor(max_workers=IMAGE_MAX_WORKERS) as executor:
+        bucket_urls.update(executor.map(upload, uploads))
+
+    for link, result in downloaded.items():
+        img = images[link]
+        img.hash = result["hash"]
+        img.mime = result["mime"]
+
+        if isinstance(bucket_urls[result["hash"]], Exception):
+            img.download_status = "ERROR"
+            img.download_details = str(bucket_urls[result["hash"]])
+
+        else:
+            img.bucket_url = bucket_urls[result["hash"]]
+            img.download_status = "OK"
+
+    pending_images = list({id(images[x]): images[x] for x in pending}.values())
+    AssetImage.objects.bulk_create([x for x in pending_images if x.id is None])
+    AssetImage.objects.bulk_update(
+        [x for x in pending_images if x.id is not None],
+        ["hash", "mime", "bucket_url", "last_download_at", "download_status", "download_details"],
+    )
+
+    mirrored = {x: images[x] for x in links if images[x].download_status == "OK"}
+    asset.images.add(*{x.id for x in mirrored.values()})
+
+    readme = asset.get_readme()["decoded"]
+    new_readme = readme
+    for link, img in mirrored.items():
+        new_readme = new_readme.replace(link, img.bucket_url)
+
+    if new_readme != readme:
+        asset.set_readme(new_readme)
+        asset.save()
+
+    # the images no longer used by the asset are removed from the cloud if no other asset uses them
+    used = {images[x].id for x in links if images[x].id is not None}
+    no_longer_used = list(asset.images.exclude(id__in=used).values_list("id", flat=True))
+    logger.debug(f"Found {len(no_longer_used)} images no longer used on asset {asset.slug}")
+
+    if no_longer_used:
+        asset.images.remove(*no_longer_used)
+
+        from .tasks import async_remove_img_from_cloud
+
+        orphans = list(AssetImage.objects.filter(id__in=no_longer_used, assets__isnull=True))
+
+        # the images with the same content share a blob, it is removed only when no asset uses any of them
+        in_use = set(
+            AssetImage.objects.filter(
+                bucket_url__in={x.bucket_url for x in orphans if x.bucket_url}, assets__isnull=False
+            ).values_list("bucket_url", flat=True)
+        )
+
+        # the blob is named after the image that uploaded it
+        orphans.sort(key=lambda x: not x.bucket_url.endswith(x.hash + pathlib.Path(x.name).suffix))
+
+        released = set()
+        rows = []
+        for img in orphans:
+            if img.bucket_url and (img.bucket_url in in_use or img.bucket_url in released):
+                rows.append(img.id)
+                continue
+
+            released.add(img.bucket_url)
+            async_remove_img_from_cloud.delay(img.id)
+
+        if rows:
+            AssetImage.objects.filter(id__in=rows).delete()
+
+    return mirrored
+
+
 def add_syllabus_translations(_json: dict):
     if not isinstance(_json, dict) or "days" not in _json or not isinstance(_json["days"], list):
         return _json
@@ -1109,3 +1329,59 @@ def add_syllabus_translations(_json: dict):
                         }
 
     return _json
+
+
+def is_full_text_search_available() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def get_asset_search_vector() -> SearchVector:
+    aliases = (
+        AssetAlias.objects.filter(asset=OuterRef("pk"))
+        .values("asset")
+        .annotate(slugs=StringAgg("slug", delimiter=" "))
+        .values("slugs")
+    )
+
+    return (
+        SearchVector("title", weight="A", config=ASSET_SEARCH_CONFIG)
+        + SearchVector("slug", weight="A", config=ASSET_SEARCH_CONFIG)
+        + SearchVector(Subquery(aliases), weight="B", config=ASSET_SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=ASSET_SEARCH_CONFIG)
+    )
+
+
+def update_asset_search_vector(*asset_ids: int) -> None:
+    """Refresh the search vector of the assets, it only exists in postgres."""
+
+    if not is_full_text_search_available():
+        return
+
+    Asset.objects.filter(id__in=asset_ids).update(search_vector=get_asset_search_vector())
+
+
+def search_assets(items: QuerySet[Asset], search: str) -> QuerySet[Asset]:
+    """
+    Filter the assets that match the search, annotated with its `search_rank`.
+
+    In postgres every word is matched as a prefix over the search vector and the typos are matched by trigram
+    similarity of the title and the slug, both are backed by GIN indexes. Other databases fall back to `icontains`.
+    """
+
+    if not is_full_text_search_available():
+        return items.filter(
+            Q(slug__icontains=slugify(search))
+            | Q(title__icontains=search)
+            | Q(assetalias__slug__icontains=slugify(search))
+        )
+
+    words = re.findall(r"\w+", search)
+    if not words:
+        return items.none()
+
+    query = SearchQuery(" & ".join(f"{x}:*" for x in words), search_type="raw", config=ASSET_SEARCH_CONFIG)
+    similarity = Greatest(TrigramSimilarity("title", search), TrigramSimilarity("slug", search))
+
+    return items.filter(
+        Q(search_vector=query) | Q(title__trigram_similar=search) | Q(slug__trigram_similar=search)
+    ).annotate(search_rank=SearchRank(F("search_vector"), query) + similarity)
@@ -0,0 +1,65 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_SEARCH_INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS registry_asset_search_vector_idx ON registry_asset USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS registry_asset_title_trgm_idx ON registry_asset USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS registry_asset_slug_trgm_idx ON registry_asset USING gin (slug gin_trgm_ops)",
+    """
+    UPDATE registry_asset a SET search_vector =
+        setweight(to_tsvector('simple', coalesce(a.title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(a.slug, '')), 'A')
+        || setweight(
+            to_tsvector(
+                'simple',
+                coalesce((SELECT string_agg(b.slug, ' ') FROM registry_assetalias b WHERE b.asset_id = a.id), '')
+            ),
+            'B'
+        )
+        || setweight(to_tsvector('simple', coalesce(a.description, '')), 'C')
+    """,
+]
+
+DROP_SEARCH_INDEXES = [
+    "DROP INDEX IF EXISTS registry_asset_search_vector_idx",
+    "DROP INDEX IF EXISTS registry_asset_title_trgm_idx",
+    "DROP INDEX IF EXISTS registry_asset_slug_trgm_idx",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for sql in CREATE_SEARCH_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for sql in DROP_SEARCH_INDEXES:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("registry", "0043_asset_superseded_by"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                default=None,
+                editable=False,
+                help_text="Title, slug, aliases and description of the asset, it is used by the full text search",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
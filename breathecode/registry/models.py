@@ -1,13 +1,17 @@
 import base64
+import copy
 import hashlib
 import logging
 import pathlib
 import re
+import threading
 from urllib.parse import urlparse
 
 import frontmatter
 import markdown
 from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
 from django.template.loader import get_template
@@ -36,6 +40,34 @@ SORT_PRIORITY = (
     (3, 3),
 )
 
+README_CACHE_TIMEOUT = 60 * 60 * 24
+renderers = threading.local()
+
+
+def get_markdown_renderer() -> markdown.Markdown:
+    """Get the markdown renderer of the current thread, building it loads every extension."""
+
+    if not hasattr(renderers, "markdown"):
+        renderers.markdown = markdown.Markdown(extensions=["markdown.extensions.fenced_code"])
+
+    return renderers.markdown.reset()
+
+
+def get_notebook_exporter():
+    """Get the notebook exporter of the current thread, building it loads its templates."""
+
+    if not hasattr(renderers, "notebook"):
+        from nbconvert import HTMLExporter
+
+        # We use the `basic` template for now; you can use `classic` to get a full html document
+        renderers.notebook = HTMLExporter(template_name="basic")
+
+    return renderers.notebook
+
+
+def get_parsed_readme_cache_key(readme: str, format: str) -> str:
+    return f"registry:readme:{format}:{hashlib.sha256(readme.encode('utf-8')).hexdigest()}"
+
 
 class SyllabusVersionProxy(SyllabusVersion):
 
@@ -491,6 +523,14 @@ class Asset(models.Model):
         help_text="Related assets used to get prepared before going through this asset.",
     )
 
+    # its GIN index and the trigram indexes of title and slug are created by the migration, only in postgres
+    search_vector = SearchVectorField(
+        null=True,
+        default=None,
+        editable=False,
+        help_text="Title, slug, aliases and description of the asset, it is used by the full text search",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True, editable=False)
 
@@ -620,26 +660,34 @@ class Asset(models.Model):
         return readme
 
     def parse(self, readme, format="markdown", remove_frontmatter=False):
+        # the parsed readme only depends on its content, it is shared by every asset with the same readme
+        key = get_parsed_readme_cache_key(readme["clean"] or "", format)
+        if (parsed := cache.get(key)) is None:
+            parsed = self._parse(readme["decoded"], format=format)
+            cache.set(key, parsed, README_CACHE_TIMEOUT)
+
+        # the frontmatter is copied because the callers edit it
+        readme.update(copy.deepcopy(parsed))
+        return readme
+
+    def _parse(self, decoded, format="markdown"):
+        parsed = {}
         if format == "markdown":
-            _data = frontmatter.loads(readme["decoded"])
-            readme["frontmatter"] = _data.metadata
-            readme["frontmatter"]["format"] = format
-            readme["decoded"] = _data.content
-            readme["html"] = markdown.markdown(_data.content, extensions=["markdown.extensions.fenced_code"])
+            _data = frontmatter.loads(decoded)
+            parsed["frontmatter"] = _data.metadata
+            parsed["frontmatter"]["format"] = format
+            parsed["decoded"] = _data.content
+            parsed["html"] = get_markdown_renderer().convert(_data.content)
         if format == "notebook":
             import nbformat
-            from nbconvert import HTMLExporter
 
-            notebook = nbformat.reads(readme["decoded"], as_version=4)
-            # Instantiate the exporter. We use the `classic` template for now; we'll get into more details
-            # later about how to customize the exporter further. You can use 'basic'
-            html_exporter = HTMLExporter(template_name="basic")
+            notebook = nbformat.reads(decoded, as_version=4)
             # Process the notebook we loaded earlier
-            body, resources = html_exporter.from_notebook_node(notebook)
-            readme["frontmatter"] = resources
-            readme["frontmatter"]["format"] = format
-            readme["html"] = body
-        return readme
+            body, resources = get_notebook_exporter().from_notebook_node(notebook)
+            parsed["frontmatter"] = dict(resources)
+            parsed["frontmatter"]["format"] = format
+            parsed["html"] = body
+        return parsed
 
     def get_thumbnail_name(self):
 
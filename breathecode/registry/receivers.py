@@ -12,6 +12,7 @@ from breathecode.assignments.signals import assignment_created
 from breathecode.monitoring.models import RepositoryWebhook
 from breathecode.monitoring.signals import github_webhook
 
+from .actions import update_asset_search_vector
 from .models import Asset, AssetAlias, AssetImage
 from .signals import asset_readme_modified, asset_slug_modified, asset_title_modified
 from .tasks import (
@@ -86,6 +87,17 @@ def post_asset_deleted(sender, instance: Asset, **kwargs):
     async_delete_asset_images.delay(instance.slug)
 
 
+@receiver(post_save, sender=Asset)
+def post_asset_saved(sender, instance: Asset, **kwargs):
+    update_asset_search_vector(instance.id)
+
+
+@receiver(post_save, sender=AssetAlias)
+@receiver(post_delete, sender=AssetAlias)
+def post_asset_alias_changed(sender, instance: AssetAlias, **kwargs):
+    update_asset_search_vector(instance.asset_id)
+
+
 @receiver(post_delete, sender=AssetImage)
 def post_assetimage_deleted(sender, instance: Asset, **kwargs):
     logger.debug("AssetImage deleted, removing image from buckets")
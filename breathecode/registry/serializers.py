@@ -519,7 +519,7 @@ class PostAssetSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Asset
-        exclude = ("academy",)
+        exclude = ("academy", "search_vector")
 
     def validate(self, data):
 
@@ -783,7 +783,7 @@ class AssetPUTSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Asset
-        exclude = ("academy",)
+        exclude = ("academy", "search_vector")
         list_serializer_class = AssetListSerializer
 
     def validate(self, data):
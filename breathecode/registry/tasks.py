@@ -30,6 +30,7 @@ from .actions import (
     asset_images_bucket,
     clean_asset_readme,
     generate_screenshot,
+    mirror_readme_images,
     pull_from_github,
     screenshots_bucket,
     test_asset,
@@ -247,13 +248,6 @@ def async_download_readme_images(asset_slug):
 
     images = BeautifulSoup(readme["html"], features="html.parser").find_all("img", attrs={"srcset": True})
 
-    # check if old images are stil in the new markdown file
-    old_images = asset.images.all()
-    no_longer_used = {}
-    for img in old_images:
-        # we will assume they are not by default
-        no_longer_used[img.original_url] = img
-
     image_links = []
     for image in images:
         image_links.append(image["src"])
@@ -273,26 +267,11 @@ def async_download_readme_images(asset_slug):
     image_links = list(dict.fromkeys(filter(lambda x: is_remote_image(x), image_links)))
     logger.debug(f"Found {len(image_links)} images on asset {asset_slug}")
 
-    # create subfolder with the page name
-    if len(image_links) == 0:
-        print("No images found")
-        return False
-
-    for link in image_links:
-        if link in no_longer_used:
-            del no_longer_used[link]
-        async_download_single_readme_image.delay(asset_slug, link)
+    # the images are mirrored in one batch, it also releases the images that are not used anymore
+    mirrored = mirror_readme_images(asset, image_links)
+    logger.debug(f"{len(mirrored)} of {len(image_links)} images were mirrored on asset {asset_slug}")
 
-    # delete asset from this image
-    logger.debug(f"Found {len(no_longer_used)} images no longer used on asset {asset_slug}")
-    for old_img in no_longer_used:
-        no_longer_used[old_img].assets.remove(asset)
-
-        # if its not being sed on any other asset, we delete it from cloud
-        if no_longer_used[old_img].assets.count() == 0:
-            async_remove_img_from_cloud(no_longer_used[old_img].id)
-
-    return True
+    return len(image_links) > 0
 
 
 @task(priority=TaskPriority.ACADEMY.value)
@@ -0,0 +1,157 @@
+"""
+Test mirror_readme_images
+"""
+
+import hashlib
+import json
+from unittest.mock import MagicMock, PropertyMock, call
+
+import pytest
+from django.utils import timezone
+
+from breathecode.registry import tasks
+from breathecode.registry.actions import mirror_readme_images
+from breathecode.registry.models import Asset
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+from breathecode.tests.mocks import apply_requests_get_mock
+
+UTC_NOW = timezone.now()
+BUCKET_URL = "https://storage.googleapis.com/bucket/hardcoded_url"
+PNG = {"content-type": "image/png"}
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    from breathecode.services.google_cloud import File, Storage
+
+    monkeypatch.setattr("django.utils.timezone.now", MagicMock(return_value=UTC_NOW))
+    monkeypatch.setattr(tasks.async_remove_img_from_cloud, "delay", MagicMock())
+    monkeypatch.setattr(Storage, "__init__", MagicMock(return_value=None))
+    monkeypatch.setattr(Storage, "client", PropertyMock(), raising=False)
+    monkeypatch.setattr(File, "__init__", MagicMock(return_value=None))
+    monkeypatch.setattr(File, "exists", MagicMock(return_value=False))
+    monkeypatch.setattr(File, "upload", MagicMock())
+    monkeypatch.setattr(File, "url", MagicMock(return_value=BUCKET_URL))
+    yield
+
+
+def sha256(data):
+    return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+
+def test_images_are_mirrored_in_one_batch(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    from breathecode.services.google_cloud import File
+
+    kenny = "https://kenny.io/kenny.png"
+    kyle = "https://kyle.io/kyle.png"
+    stan = "https://stan.io/stan.png"
+    readme = f"![kenny]({kenny}) ![kyle]({kyle}) ![stan]({stan})"
+
+    endpoints = [(200, kenny, {"kenny": 1}, PNG), (200, kyle, {"kenny": 1}, PNG), (404, stan, {}, PNG)]
+    monkeypatch.setattr("requests.Session.get", apply_requests_get_mock(endpoints))
+
+    model = bc.database.create(asset={"slug": "randy", "readme": Asset.encode(readme)})
+
+    mirrored = mirror_readme_images(model.asset, [kenny, kyle, stan])
+
+    # kenny and kyle have the same content, it is uploaded once
+    assert len(File.upload.call_args_list) == 1
+    assert sorted(mirrored) == [kenny, kyle]
+    assert bc.database.list_of("registry.AssetImage") == [
+        {
+            "id": 1,
+            "name": "kenny.png",
+            "mime": "image/png",
+            "bucket_url": BUCKET_URL,
+            "original_url": kenny,
+            "hash": sha256({"kenny": 1}),
+            "last_download_at": UTC_NOW,
+            "download_details": f"Downloading {kenny}",
+            "download_status": "OK",
+            "created_at": UTC_NOW,
+            "updated_at": UTC_NOW,
+        },
+        {
+            "id": 2,
+            "name": "kyle.png",
+            "mime": "image/png",
+            "bucket_url": BUCKET_URL,
+            "original_url": kyle,
+            "hash": sha256({"kenny": 1}),
+            "last_download_at": UTC_NOW,
+            "download_details": f"Downloading {kyle}",
+            "download_status": "OK",
+            "created_at": UTC_NOW,
+            "updated_at": UTC_NOW,
+        },
+        {
+            "id": 3,
+            "name": "stan.png",
+            "mime": "",
+            "bucket_url": "",
+            "original_url": stan,
+            "hash": "",
+            "last_download_at": UTC_NOW,
+            "download_details": f"Error downloading image from {stan}",
+            "download_status": "ERROR",
+            "created_at": UTC_NOW,
+            "updated_at": UTC_NOW,
+        },
+    ]
+
+    asset = Asset.objects.get(id=1)
+    assert asset.get_readme()["decoded"] == f"![kenny]({BUCKET_URL}) ![kyle]({BUCKET_URL}) ![stan]({stan})"
+    assert sorted(asset.images.values_list("id", flat=True)) == [1, 2]
+
+
+def test_images_no_longer_used_are_released(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    from breathecode.services.google_cloud import File
+
+    monkeypatch.setattr("requests.Session.get", apply_requests_get_mock([]))
+
+    kenny = "https://kenny.io/kenny.png"
+    asset_images = [
+        {"original_url": kenny, "bucket_url": BUCKET_URL, "download_status": "OK"},
+        {"original_url": "https://kyle.io/kyle.png", "download_status": "OK"},
+        {"original_url": "https://stan.io/stan.png", "download_status": "OK"},
+    ]
+    model = bc.database.create(asset=[{"readme": Asset.encode(f"![kenny]({kenny})")}, {}], asset_image=asset_images)
+    model.asset_image[0].assets.set([1])
+    model.asset_image[1].assets.set([1])
+    model.asset_image[2].assets.set([1, 2])
+
+    mirrored = mirror_readme_images(model.asset[0], [kenny])
+
+    assert mirrored == {kenny: model.asset_image[0]}
+    assert File.upload.call_args_list == []
+    assert list(model.asset[0].images.values_list("id", flat=True)) == [1]
+    assert sorted(model.asset[1].images.values_list("id", flat=True)) == [3]
+
+    # only the images that no other asset uses are removed from the cloud
+    assert tasks.async_remove_img_from_cloud.delay.call_args_list == [call(2)]
+
+
+def test_images_that_share_a_blob_are_released_with_the_last_one(bc: Breathecode, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("requests.Session.get", apply_requests_get_mock([]))
+
+    kenny = "https://kenny.io/kenny.png"
+    kyle = "https://kyle.io/kyle.jpg"
+    hash = sha256({"kenny": 1})
+    bucket_url = f"https://storage.googleapis.com/bucket/{hash}.png"
+    asset_images = [
+        {"name": "kenny.png", "original_url": kenny, "bucket_url": bucket_url, "hash": hash, "download_status": "OK"},
+        {"name": "kyle.jpg", "original_url": kyle, "bucket_url": bucket_url, "hash": hash, "download_status": "OK"},
+    ]
+    readme = f"![kenny]({bucket_url}) ![kyle]({bucket_url})"
+    model = bc.database.create(asset={"readme": Asset.encode(readme)}, asset_image=asset_images)
+    model.asset.images.set([1, 2])
+
+    mirror_readme_images(model.asset, [kenny])
+
+    # kenny still uses the blob, only the row of kyle is deleted
+    assert tasks.async_remove_img_from_cloud.delay.call_args_list == []
+    assert [x["id"] for x in bc.database.list_of("registry.AssetImage")] == [1]
+
+    mirror_readme_images(model.asset, [])
+
+    assert tasks.async_remove_img_from_cloud.delay.call_args_list == [call(1)]
@@ -0,0 +1,62 @@
+"""
+Test Asset.get_readme
+"""
+
+from unittest.mock import MagicMock
+
+import frontmatter
+import pytest
+from django.core.cache import cache
+
+from breathecode.registry.models import Asset
+from breathecode.tests.mixins.breathecode_mixin.breathecode import Breathecode
+
+README = "---\ntitle: Kenny\n---\n# They killed Kenny\n\n```js\nconsole.log('Kenny')\n```\n"
+
+
+@pytest.fixture(autouse=True)
+def setup(db, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("frontmatter.loads", MagicMock(wraps=frontmatter.loads))
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_markdown_is_parsed(bc: Breathecode):
+    model = bc.database.create(asset={"readme": Asset.encode(README), "readme_url": "https://potato.io/README.md"})
+
+    readme = model.asset.get_readme(parse=True)
+
+    assert readme["frontmatter"] == {"title": "Kenny", "format": "markdown"}
+    assert readme["decoded"] == "# They killed Kenny\n\n```js\nconsole.log('Kenny')\n```"
+    assert readme["html"] == (
+        '<h1>They killed Kenny</h1>\n<pre><code class="language-js">console.log(\'Kenny\')\n</code></pre>'
+    )
+
+
+def test_parsed_readme_is_shared_by_content(bc: Breathecode):
+    model = bc.database.create(
+        asset=[
+            {"readme": Asset.encode(README), "readme_url": "https://potato.io/README.md"},
+            {"readme": Asset.encode(README), "readme_url": "https://potato.io/README.md"},
+        ]
+    )
+
+    readme1 = model.asset[0].get_readme(parse=True)
+    readme1["frontmatter"]["title"] = "Kyle"
+    readme2 = model.asset[1].get_readme(parse=True)
+
+    assert readme2["frontmatter"] == {"title": "Kenny", "format": "markdown"}
+    assert readme2["html"] == readme1["html"]
+    assert frontmatter.loads.call_count == 1
+
+
+def test_readme_changed(bc: Breathecode):
+    model = bc.database.create(asset={"readme": Asset.encode(README), "readme_url": "https://potato.io/README.md"})
+
+    model.asset.get_readme(parse=True)
+    model.asset.set_readme("# They killed Kyle")
+    readme = model.asset.get_readme(parse=True)
+
+    assert readme["html"] == "<h1>They killed Kyle</h1>"
+    assert frontmatter.loads.call_count == 2
@@ -72,6 +72,7 @@ def database_item(academy, category, data={}):
         "is_auto_subscribed": True,
         "superseded_by_id": None,
         "enable_table_of_content": True,
+        "search_vector": None,
         **data,
     }
 
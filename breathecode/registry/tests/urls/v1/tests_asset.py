@@ -315,6 +315,43 @@ def test_assets_with_category(bc: Breathecode, client):
     assert bc.database.list_of("registry.Asset") == bc.format.to_dict(model.asset)
 
 
+def test_assets_with_search(bc: Breathecode, client):
+
+    assets = [
+        {
+            "slug": "randy",
+            "title": "They killed Kenny",
+            "status": "PUBLISHED",
+        },
+        {
+            "slug": "jackson",
+            "status": "PUBLISHED",
+        },
+        {
+            "slug": "stan",
+            "status": "PUBLISHED",
+        },
+    ]
+    model = bc.database.create(asset=assets, asset_alias={"slug": "marsh", "asset_id": 3})
+
+    url = reverse_lazy("registry:asset") + "?search=kenny"
+    response = client.get(url)
+    json = response.json()
+
+    expected = [get_serializer(model.asset[0])]
+
+    assert json == expected
+
+    url = reverse_lazy("registry:asset") + "?search=marsh"
+    response = client.get(url)
+    json = response.json()
+
+    expected = [get_serializer(model.asset[2])]
+
+    assert json == expected
+    assert bc.database.list_of("registry.Asset") == bc.format.to_dict(model.asset)
+
+
 @patch(
     "breathecode.utils.api_view_extensions.extensions.lookup_extension.compile_lookup",
     MagicMock(wraps=lookup_extension.compile_lookup),
@@ -35,6 +35,7 @@ from .actions import (
     pull_from_github,
     push_to_github,
     scan_asset_originality,
+    search_assets,
     test_asset,
 )
 from .caches import AssetCache, AssetCommentCache, CategoryCache, ContentVariableCache, KeywordCache, TechnologyCache
@@ -642,6 +643,9 @@ class AssetView(APIView, GenerateLookupsMixin):
                     | Q(assetalias__slug__icontains=slugify(like))
                 )
 
+        if search := request.GET.get("search"):
+            items = search_assets(items, search)
+
         if "slug" in self.request.GET:
             asset_type = self.request.GET.get("asset_type", None)
             param = self.request.GET.get("slug")
@@ -962,6 +966,9 @@ class AcademyAssetView(APIView, GenerateLookupsMixin):
                     | Q(assetalias__slug__icontains=slugify(like))
                 )
 
+        if search := request.GET.get("search"):
+            items = search_assets(items, search)
+
         if "asset_type" in self.request.GET:
             param = self.request.GET.get("asset_type")
             lookup["asset_type__iexact"] = param
@@ -1,6 +1,10 @@
 # flake8: noqa: N802
 
+import os
+
 import graphene
+from graphene.validation import depth_limit_validator
+
 from breathecode.admissions.schema import Admissions
 
 
@@ -13,3 +17,6 @@ class Query(graphene.ObjectType):
 
 
 schema = graphene.Schema(query=Query)
+
+# the depth of the nested relations is bounded, the number of queries per request depends on it
+validation_rules = [depth_limit_validator(max_depth=int(os.getenv("GRAPHQL_MAX_DEPTH", "10")))]
@@ -3,12 +3,18 @@ from io import BufferedReader, BytesIO, StringIO, TextIOWrapper
 from typing import Optional, overload
 
 from circuitbreaker import circuit
-from google.cloud.storage import Blob, Bucket
+from google.cloud.storage import Blob, Bucket, transfer_manager
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["File"]
 
+RESUMABLE_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+RESUMABLE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+PARALLEL_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+PARALLEL_UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+PARALLEL_UPLOAD_MAX_WORKERS = 8
+
 
 class File:
     """Google Cloud Storage"""
@@ -41,9 +47,27 @@ class File:
         if content_type is None:
             content_type = "application/octet-stream"
 
+        size = getattr(content, "size", None) or 0
+
         if isinstance(content, str) or isinstance(content, bytes):
             self.blob.upload_from_string(content, content_type=content_type)
+
+        # big files stored on disk are uploaded in parts concurrently, GCS composes them in one object
+        elif size > PARALLEL_UPLOAD_THRESHOLD and hasattr(content, "temporary_file_path"):
+            transfer_manager.upload_chunks_concurrently(
+                content.temporary_file_path(),
+                self.blob,
+                content_type=content_type,
+                chunk_size=PARALLEL_UPLOAD_CHUNK_SIZE,
+                worker_type=transfer_manager.THREAD,
+                max_workers=PARALLEL_UPLOAD_MAX_WORKERS,
+            )
+
         else:
+            # a resumable upload keeps only one chunk in memory
+            if size > RESUMABLE_UPLOAD_THRESHOLD:
+                self.blob.chunk_size = RESUMABLE_UPLOAD_CHUNK_SIZE
+
             content.seek(0)
             self.blob.upload_from_file(content, content_type=content_type)
 
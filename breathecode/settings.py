@@ -456,6 +456,13 @@ if IS_TEST_ENV:
                 "valid_until": timeout,
             }
 
+        def add(self, key, value, *args, timeout=None, **kwargs):
+            if key in self._cache.keys():
+                return False
+
+            self.set(key, value, timeout=timeout)
+            return True
+
         def get(self, key, *args, **kwargs):
             if key not in self._cache.keys():
                 return None
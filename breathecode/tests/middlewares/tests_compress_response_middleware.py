@@ -0,0 +1,122 @@
+import gzip
+import zlib
+
+import brotli
+import pytest
+import zstandard
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+import breathecode.middlewares as middlewares
+from breathecode.middlewares import CompressResponseMiddleware
+
+CONTENT = b'{"slug": "they-killed-kenny"}' * 1000
+
+
+@pytest.fixture(autouse=True)
+def setup(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(middlewares, "IS_TEST", False)
+    monkeypatch.setattr(middlewares, "IS_DEV", True)
+    middlewares.min_compression_size.cache_clear()
+
+    yield
+
+    middlewares.min_compression_size.cache_clear()
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    if encoding == "deflate":
+        return zlib.decompress(data)
+
+    if encoding == "gzip":
+        return gzip.decompress(data)
+
+    return brotli.decompress(data)
+
+
+def build_request(encoding: str):
+    factory = RequestFactory()
+    return factory.get("/v1/kenny", HTTP_ACCEPT_ENCODING=encoding, HTTP_USER_AGENT="PostmanRuntime/7.0")
+
+
+def build_middleware():
+    return CompressResponseMiddleware(lambda request: None)
+
+
+def stream():
+    for _ in range(1000):
+        yield b'{"slug": "they-killed-kenny"}'
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "deflate", "gzip", "br"])
+def test_compress_content(encoding):
+    request = build_request(encoding)
+    response = build_middleware().process_response(request, HttpResponse(CONTENT))
+
+    assert response["Content-Encoding"] == encoding
+    assert response["Vary"] == "Accept-Encoding"
+    assert decompress(response.content, encoding) == CONTENT
+
+
+@pytest.mark.parametrize("encoding", ["zstd", "deflate", "gzip", "br"])
+def test_compress_streaming_content(encoding):
+    request = build_request(encoding)
+    response = build_middleware().process_response(request, StreamingHttpResponse(stream()))
+
+    assert response["Content-Encoding"] == encoding
+    assert "Content-Length" not in response
+    assert decompress(b"".join(response.streaming_content), encoding) == CONTENT
+
+
+def test_small_content_is_not_compressed():
+    request = build_request("gzip")
+    response = build_middleware().process_response(request, HttpResponse(b"[]"))
+
+    assert "Content-Encoding" not in response
+    assert response.content == b"[]"
+
+
+def test_size_is_based_on_the_content_length(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("MIN_COMPRESSION_SIZE", "1")
+
+    request = build_request("gzip")
+    response = build_middleware().process_response(request, HttpResponse(b"a" * 1000))
+
+    assert "Content-Encoding" not in response
+
+    response = build_middleware().process_response(request, HttpResponse(b"a" * 1100))
+
+    assert response["Content-Encoding"] == "gzip"
+
+
+def test_partial_streaming_content_is_not_compressed():
+    request = build_request("gzip")
+    response = StreamingHttpResponse(stream(), status=206, content_type="application/json")
+    response["Content-Range"] = f"bytes 0-{len(CONTENT) - 1}/{len(CONTENT) * 2}"
+    response["Content-Length"] = str(len(CONTENT))
+
+    response = build_middleware().process_response(request, response)
+
+    assert "Content-Encoding" not in response
+    assert response["Content-Length"] == str(len(CONTENT))
+    assert b"".join(response.streaming_content) == CONTENT
+
+
+@pytest.mark.parametrize("content_type", ["image/png", "video/mp4", "audio/mpeg", "application/zip"])
+def test_incompressible_content_type(content_type):
+    request = build_request("gzip")
+    response = build_middleware().process_response(request, StreamingHttpResponse(stream(), content_type=content_type))
+
+    assert "Content-Encoding" not in response
+    assert b"".join(response.streaming_content) == CONTENT
+
+
+def test_svg_is_compressed():
+    request = build_request("gzip")
+    response = build_middleware().process_response(request, HttpResponse(CONTENT, content_type="image/svg+xml"))
+
+    assert response["Content-Encoding"] == "gzip"
+    assert decompress(response.content, "gzip") == CONTENT
@@ -10,6 +10,7 @@ class ResponseMock:
     content = None
     raw = None
     url = None
+    encoding = "utf-8"
     headers = {
         "Content-Type": "application/json",
         "content-type": "application/json",
@@ -42,3 +43,13 @@ class ResponseMock:
     def json(self) -> dict:
         """Convert Response to JSON."""
         return self.data
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        """Iterate over the content of the Response."""
+        content = self.content or b""
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
+    def close(self):
+        """Release the connection of the Response."""
+        pass
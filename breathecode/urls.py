@@ -24,6 +24,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import TemplateView
 from graphene_django.views import GraphQLView
 
+from breathecode.schema import validation_rules
 from breathecode.utils.urls import mount_app_openapi
 from breathecode.utils.views import get_root_schema_view
 
@@ -93,7 +94,7 @@ urlpatterns_docs = [
 urlpatterns_django = [
     path("admin/", admin.site.urls),
     path("explorer/", include("explorer.urls")),
-    path("graphql", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("graphql", csrf_exempt(GraphQLView.as_view(graphiql=True, validation_rules=validation_rules))),
 ]
 
 urlpatterns_static = static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -19,9 +19,11 @@ from .ndb import *  # noqa: F401
 from .num_to_roman import *  # noqa: F401
 from .object import *  # noqa: F401
 from .permissions import *  # noqa: F401
+from .relation_loader import *  # noqa: F401
 from .response_207 import *  # noqa: F401
 from .script_notification import *  # noqa: F401
 from .serpy import *  # noqa: F401
 from .serpy_extensions import *  # noqa: F401
 from .shorteners import *  # noqa: F401
+from .streaming_response import *  # noqa: F401
 from .validate_conversion_info import *  # noqa: F401
@@ -9,6 +9,7 @@ from breathecode.utils.generate_lookups_mixin import GenerateLookupsMixin
 __all__ = ["SortExtension"]
 
 REQUIREMENTS = ["cache"]
+RANK_ANNOTATION = "search_rank"
 
 
 class SortExtension(ExtensionBase, GenerateLookupsMixin):
@@ -23,6 +24,11 @@ class SortExtension(ExtensionBase, GenerateLookupsMixin):
         sort_in = lookups["sort__in"] if "sort__in" in lookups else ""
         if len(sort_in) != 0:
             queryset = queryset.order_by(*sort_in or self._sort)
+
+        # the results of a search are sorted by relevance unless other sort was requested
+        elif "sort" not in self._request.GET and RANK_ANNOTATION in queryset.query.annotations:
+            queryset = queryset.order_by(f"-{RANK_ANNOTATION}", self._sort)
+
         else:
             queryset = queryset.order_by(self._request.GET.get("sort") or self._sort)
         return queryset
@@ -265,15 +265,20 @@ class Cache(metaclass=CacheMeta):
         timeout: int = -1,
         encoding: Optional[str] = None,
         params: Optional[dict] = None,
+        headers: Optional[dict] = None,
     ) -> str:
         """Set a key value pair on the cache in bytes, it reminds the format and compress the data if needed."""
 
         if params is None:
             params = {}
 
+        if headers is None:
+            headers = {}
+
         key = cls._generate_key(**params)
         res = {
             "headers": {
+                **headers,
                 "Content-Type": format,
             },
             "content": None,
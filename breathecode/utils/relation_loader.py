@@ -0,0 +1,100 @@
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from django.db.models import Model
+
+__all__ = ["RelationLoader"]
+
+
+class RelationLoader:
+    """
+    Per request loader of the relations of the django models, it works like a dataloader keyed by the parent id.
+
+    Every instance loaded is registered, when a relation is requested for the first time it is fetched with one
+    query for all the registered instances of the same model, so the number of queries does not depend on the
+    number of instances.
+    """
+
+    _instances: dict[type[Model], dict[Any, Model]]
+    _cache: dict[tuple[type[Model], str], dict[Any, Any]]
+
+    def __init__(self) -> None:
+        self._instances = defaultdict(dict)
+        self._cache = defaultdict(dict)
+
+    def register(self, instances: Iterable[Model]) -> None:
+        """Register instances whose relations would be batched."""
+
+        for instance in instances:
+            self._instances[instance._meta.concrete_model][instance.pk] = instance
+
+    def load(self, instance: Model, name: str) -> Any:
+        """
+        Get a relation of an instance.
+
+        `name` is the name of a foreign key, that returns an instance or None, or the accessor name of a reverse
+        foreign key, like `cohort_set`, that returns a list.
+        """
+
+        model = instance._meta.concrete_model
+        field = self._get_field(model, name)
+
+        if field.many_to_one or (field.one_to_one and field.concrete):
+            return self._load_forward(model, name, field, instance)
+
+        if field.one_to_many:
+            return self._load_reverse(model, name, field, instance)
+
+        raise ValueError(f"{model.__name__}.{name} is not a foreign key or a reverse foreign key")
+
+    def _get_field(self, model: type[Model], name: str):
+        for rel in model._meta.related_objects:
+            if rel.get_accessor_name() == name:
+                return rel
+
+        return model._meta.get_field(name)
+
+    def _pending_keys(self, model: type[Model], key: Any, attr: str, cache: dict[Any, Any]) -> set[Any]:
+        keys = {getattr(x, attr) for x in self._instances[model].values()}
+        keys.add(key)
+        return {x for x in keys if x is not None and x not in cache}
+
+    def _load_forward(self, model: type[Model], name: str, field, instance: Model) -> Optional[Model]:
+        key = getattr(instance, field.attname)
+        if key is None:
+            return None
+
+        cache = self._cache[(model, name)]
+        if key not in cache:
+            to_field = field.target_field.attname
+            keys = self._pending_keys(model, key, field.attname, cache)
+
+            objs = list(field.related_model.objects.filter(**{f"{to_field}__in": keys}))
+            self.register(objs)
+
+            for k in keys:
+                cache[k] = None
+
+            for obj in objs:
+                cache[getattr(obj, to_field)] = obj
+
+        return cache[key]
+
+    def _load_reverse(self, model: type[Model], name: str, field, instance: Model) -> list[Model]:
+        remote = field.remote_field
+        key = getattr(instance, remote.target_field.attname)
+
+        cache = self._cache[(model, name)]
+        if key not in cache:
+            keys = self._pending_keys(model, key, remote.target_field.attname, cache)
+
+            objs = list(field.related_model.objects.filter(**{f"{remote.attname}__in": keys}))
+            self.register(objs)
+
+            for k in keys:
+                cache[k] = []
+
+            for obj in objs:
+                cache[getattr(obj, remote.attname)].append(obj)
+
+        return cache[key]
@@ -0,0 +1,123 @@
+import csv
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_csv.misc import Echo
+from rest_framework_csv.renderers import CSVRenderer
+
+__all__ = ["StreamingListResponse", "get_streaming_format"]
+
+DEFAULT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "csv": "text/csv",
+}
+
+ENABLE_LIST_OPTIONS = ["true", "1", "yes", "y"]
+
+
+def get_streaming_format(request) -> Optional[str]:
+    """
+    Get the streaming format requested by the client, if any.
+
+    A client can opt-in with `?stream=ndjson|json|csv`, with `?stream=true` plus the `Accept` header, or just
+    sending `Accept: application/x-ndjson`.
+    """
+
+    stream = request.GET.get("stream", "").lower()
+    if stream in CONTENT_TYPES:
+        return stream
+
+    accept = request.META.get("HTTP_ACCEPT", "")
+    if "application/x-ndjson" in accept:
+        return "ndjson"
+
+    if stream in ENABLE_LIST_OPTIONS:
+        if "text/csv" in accept or request.GET.get("format") == "csv":
+            return "csv"
+
+        return "json"
+
+    return None
+
+
+class StreamingListResponse(StreamingHttpResponse):
+    """
+    Stream a list of rows as NDJSON, a JSON array or CSV.
+
+    The queryset is consumed with `.iterator(chunk_size=...)` and each row is serialized and emitted one by
+    one, so the memory used does not depend on the size of the list.
+    """
+
+    def __init__(
+        self,
+        items: QuerySet | Iterable[Any],
+        format: str = "json",
+        serializer: Optional[Callable[[Any], Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        filename: Optional[str] = None,
+        **kwargs,
+    ):
+        if format not in CONTENT_TYPES:
+            raise ValueError(f"Invalid streaming format {format}")
+
+        if isinstance(items, QuerySet):
+            items = items.iterator(chunk_size=chunk_size)
+
+        rows = self._serialize(items, serializer)
+
+        if format == "ndjson":
+            content = self._ndjson(rows)
+
+        elif format == "csv":
+            content = self._csv(rows)
+
+        else:
+            content = self._json(rows)
+
+        kwargs.setdefault("content_type", CONTENT_TYPES[format])
+        super().__init__(content, **kwargs)
+
+        if filename:
+            self["Content-Disposition"] = f'attachment; filename="{filename}.{format}"'
+
+    def _serialize(self, items: Iterable[Any], serializer: Optional[Callable[[Any], Any]]) -> Iterator[Any]:
+        if serializer is None:
+            yield from items
+            return
+
+        for item in items:
+            yield serializer(item).data
+
+    def _dumps(self, row: Any) -> str:
+        return json.dumps(row, cls=JSONEncoder, ensure_ascii=False)
+
+    def _ndjson(self, rows: Iterator[Any]) -> Iterator[bytes]:
+        for row in rows:
+            yield (self._dumps(row) + "\n").encode("utf-8")
+
+    def _json(self, rows: Iterator[Any]) -> Iterator[bytes]:
+        separator = "["
+        for row in rows:
+            yield (separator + self._dumps(row)).encode("utf-8")
+            separator = ","
+
+        yield b"[]" if separator == "[" else b"]"
+
+    def _csv(self, rows: Iterator[Any]) -> Iterator[bytes]:
+        renderer = CSVRenderer()
+        writer = csv.writer(Echo())
+        header = None
+
+        for row in renderer.flatten_data(rows):
+            # the header is taken from the first row to avoid materializing the whole list
+            if header is None:
+                header = sorted(row.keys())
+                yield writer.writerow(header).encode("utf-8")
+
+            yield writer.writerow([row.get(key, None) for key in header]).encode("utf-8")